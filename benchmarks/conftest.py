@@ -0,0 +1,52 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from cookiecutter_obsidian_plugin.cli import get_template_dir
+from cookiecutter_obsidian_plugin.generator import ProjectTemplate, load_config
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_home():
+    """Keep the template cache and replay files of benchmark runs out of the user's home."""
+    with tempfile.TemporaryDirectory() as temp_dir, pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(Path(temp_dir) / "cache"))
+        yield Path(temp_dir)
+
+
+@pytest.fixture(scope="session")
+def config_file(isolated_home) -> Path:
+    """A cookiecutter config file writing replay data into the isolated home."""
+    path = isolated_home / "cookiecutter.yml"
+    path.write_text(
+        f"cookiecutters_dir: {isolated_home / 'cookiecutters'}\nreplay_dir: {isolated_home / 'replay'}\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.fixture(scope="session")
+def config(config_file):
+    return load_config(str(config_file))
+
+
+@pytest.fixture(scope="session")
+def template() -> ProjectTemplate:
+    """The bundled template with a warm compiled-template cache."""
+    template = ProjectTemplate(get_template_dir())
+    ProjectTemplate(get_template_dir())  # the second load reads the cache written by the first
+    return template
+
+
+@pytest.fixture
+def fresh_dir(tmp_path):
+    """Return a factory of empty output directories, one per benchmark round."""
+    counter = iter(range(1_000_000))
+
+    def make() -> str:
+        path = tmp_path / f"round-{next(counter)}"
+        path.mkdir()
+        return str(path)
+
+    return make
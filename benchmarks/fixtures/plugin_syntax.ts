@@ -0,0 +1,118 @@
+// Plugin-shaped code for the ES target benchmark: settings with defaults,
+// optional chaining over metadata, class fields and async helpers, the syntax
+// that es2018 builds have to down-level. It does not import obsidian so the
+// bundle can be evaluated under plain node.
+
+interface NoteMeta {
+	path: string;
+	frontmatter?: { tags?: string[]; aliases?: string[]; created?: string } | null;
+	headings?: { level: number; heading: string }[];
+	links?: { link: string; displayText?: string }[];
+}
+
+interface PluginSettings {
+	tagPrefix: string;
+	maxResults: number;
+	caseSensitive: boolean;
+	folders: string[];
+	labels: Record<string, string>;
+}
+
+const DEFAULT_SETTINGS: PluginSettings = {
+	tagPrefix: "#",
+	maxResults: 50,
+	caseSensitive: false,
+	folders: [],
+	labels: {},
+};
+
+class Cache<K, V> {
+	#entries = new Map<K, { value: V; hits: number }>();
+	#limit: number;
+	misses = 0;
+
+	constructor(limit = 128) {
+		this.#limit = limit;
+	}
+
+	get(key: K, load: () => V): V {
+		const entry = this.#entries.get(key);
+		if (entry) {
+			entry.hits++;
+			return entry.value;
+		}
+		this.misses++;
+		const value = load();
+		if (this.#entries.size >= this.#limit) {
+			const oldest = this.#entries.keys().next().value;
+			if (oldest !== undefined) this.#entries.delete(oldest);
+		}
+		this.#entries.set(key, { value, hits: 0 });
+		return value;
+	}
+}
+
+class TagIndex {
+	settings: PluginSettings = { ...DEFAULT_SETTINGS };
+	byTag = new Map<string, Set<string>>();
+	cache = new Cache<string, string[]>();
+	static instances = 0;
+
+	constructor(overrides?: Partial<PluginSettings> | null) {
+		this.settings = { ...DEFAULT_SETTINGS, ...overrides, labels: { ...DEFAULT_SETTINGS.labels, ...overrides?.labels } };
+		TagIndex.instances++;
+	}
+
+	normalize(tag: string): string {
+		const trimmed = tag.startsWith(this.settings.tagPrefix) ? tag.slice(this.settings.tagPrefix.length) : tag;
+		return this.settings.caseSensitive ? trimmed : trimmed.toLowerCase();
+	}
+
+	add(note: NoteMeta): void {
+		const tags = note.frontmatter?.tags ?? [];
+		for (const tag of tags) {
+			const key = this.normalize(tag);
+			let paths = this.byTag.get(key);
+			paths ??= new Set();
+			paths.add(note.path);
+			this.byTag.set(key, paths);
+		}
+	}
+
+	title(note: NoteMeta): string {
+		return note.headings?.find((heading) => heading.level === 1)?.heading ?? note.frontmatter?.aliases?.[0] ?? note.path;
+	}
+
+	linksOf(note: NoteMeta): string[] {
+		return note.links?.map((link) => link.displayText ?? link.link) ?? [];
+	}
+
+	search(tag: string): string[] {
+		return this.cache.get(tag, () => [...(this.byTag.get(this.normalize(tag)) ?? [])].slice(0, this.settings.maxResults));
+	}
+
+	async rebuild(notes: NoteMeta[]): Promise<number> {
+		this.byTag.clear();
+		for (const note of notes) {
+			this.add(note);
+			await Promise.resolve();
+		}
+		return this.byTag.size;
+	}
+}
+
+const notes: NoteMeta[] = Array.from({ length: 200 }, (_, index) => ({
+	path: `notes/${index}.md`,
+	frontmatter: index % 7 === 0 ? null : { tags: [`#topic-${index % 13}`, `#Project-${index % 5}`], aliases: [`Note ${index}`] },
+	headings: index % 3 === 0 ? [{ level: 1, heading: `Heading ${index}` }] : undefined,
+	links: index % 2 === 0 ? [{ link: `notes/${index + 1}.md`, displayText: index % 4 === 0 ? undefined : "next" }] : undefined,
+}));
+
+const index = new TagIndex({ maxResults: 10, labels: { draft: "Draft" } });
+for (const note of notes) {
+	index.add(note);
+	index.title(note);
+	index.linksOf(note);
+}
+export const result = { tags: index.byTag.size, hits: index.search("topic-1").length, instances: TagIndex.instances };
+void index.rebuild(notes);
@@ -0,0 +1,91 @@
+"""Size and evaluation time of a plugin bundle for each ES target of the template.
+
+The generated ``esbuild.config.mjs`` targets the newest syntax that every
+runtime of ``min_obsidian_version`` understands (the ``es_target`` variable).
+These benchmarks bundle ``fixtures/plugin_syntax.ts`` for each target the
+template can pick and record ``bytes`` and ``gzip_bytes`` of the minified
+bundle in ``extra_info``; the timed part compiles and runs the bundle in a
+node ``vm`` context, reported as ``eval_us`` per evaluation.
+
+esbuild is not a Python dependency: the benchmarks run when ``$ESBUILD`` or
+``esbuild`` on ``PATH`` points at an esbuild binary (e.g. after
+``npm install -g esbuild``) and are skipped otherwise.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import subprocess  # noqa: S404
+from pathlib import Path
+
+import pytest
+
+FIXTURE = Path(__file__).parent / "fixtures" / "plugin_syntax.ts"
+TARGETS = ("es2018", "es2020", "es2022")
+EVALUATIONS = 200
+
+ESBUILD = os.environ.get("ESBUILD") or shutil.which("esbuild")
+NODE = shutil.which("node")
+
+# Compiles and runs the bundle in a fresh vm context ``EVALUATIONS`` times and
+# prints the mean time per evaluation in microseconds.
+HARNESS = """\
+const fs = require("fs");
+const vm = require("vm");
+const code = fs.readFileSync(process.argv[2], "utf8");
+const runs = Number(process.argv[3]);
+const start = process.hrtime.bigint();
+for (let i = 0; i < runs; i++) {
+	const module = { exports: {} };
+	new vm.Script(code).runInNewContext({ module, exports: module.exports });
+}
+console.log(Number(process.hrtime.bigint() - start) / 1000 / runs);
+"""
+
+pytestmark = pytest.mark.skipif(ESBUILD is None or NODE is None, reason="needs node and an esbuild binary")
+
+
+@pytest.fixture(scope="module")
+def bundles(tmp_path_factory) -> dict[str, Path]:
+    """Bundle the fixture once per target, the way the generated production build does."""
+    out_dir = tmp_path_factory.mktemp("es-target")
+    paths = {}
+    for target in TARGETS:
+        paths[target] = out_dir / f"{target}.js"
+        subprocess.run(  # noqa: S603
+            [ESBUILD, str(FIXTURE), "--bundle", "--minify", "--format=cjs", f"--target={target}"]
+            + [f"--outfile={paths[target]}", "--log-level=warning"],
+            check=True,
+        )
+    (out_dir / "harness.cjs").write_text(HARNESS, encoding="utf-8")
+    return paths
+
+
+class TestEsTargetBenchmarks:
+    """One result per target, so ``pytest-benchmark compare`` lines them up."""
+
+    @pytest.mark.benchmark(group="es-target")
+    @pytest.mark.parametrize("target", TARGETS)
+    def test_bundle(self, benchmark, bundles, target):
+        bundle = bundles[target]
+        code = bundle.read_bytes()
+        benchmark.extra_info["bytes"] = len(code)
+        benchmark.extra_info["gzip_bytes"] = len(gzip.compress(code, compresslevel=9))
+
+        def evaluate() -> float:
+            result = subprocess.run(  # noqa: S603
+                [NODE, str(bundle.parent / "harness.cjs"), str(bundle), str(EVALUATIONS)],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            return float(result.stdout)
+
+        eval_us = benchmark.pedantic(evaluate, rounds=5, warmup_rounds=1)
+        benchmark.extra_info["eval_us"] = round(eval_us, 1)
+
+    def test_newer_targets_are_not_bigger(self, bundles):
+        sizes = [bundles[target].stat().st_size for target in TARGETS]
+
+        assert sizes == sorted(sizes, reverse=True), json.dumps(dict(zip(TARGETS, sizes)))
@@ -0,0 +1,128 @@
+"""Generation benchmarks.
+
+Run with ``make bench`` (or ``pytest benchmarks --benchmark-autosave``); every run
+is saved as JSON under ``.benchmarks/`` and ``make bench-compare`` compares the
+current tree against the last saved run.
+"""
+
+import itertools
+import json
+import subprocess  # noqa: S404
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from cookiecutter_obsidian_plugin.cli import get_template_dir, main
+from cookiecutter_obsidian_plugin.generator import ProjectTemplate
+from cookiecutter_obsidian_plugin.pruning import prune_project
+from cookiecutter_obsidian_plugin.validation import validate_context
+
+CHOICES = json.loads((Path(get_template_dir()) / "cookiecutter.json").read_text(encoding="utf-8"))
+
+FEATURE_COMBINATIONS = [
+    {"enable_vitest": vitest, "enable_i18n": i18n, "license": license_name}
+    for vitest, i18n, license_name in itertools.product(
+        CHOICES["enable_vitest"], CHOICES["enable_i18n"], CHOICES["license"]
+    )
+]
+
+
+def combination_id(values: dict) -> str:
+    return f"vitest={values['enable_vitest']}-i18n={values['enable_i18n']}-license={values['license']}"
+
+
+def record_throughput(benchmark, files: int) -> None:
+    """Store the file count and, unless benchmarking is disabled, files per second."""
+    benchmark.extra_info["files"] = files
+    if benchmark.stats is not None:
+        benchmark.extra_info["files_per_second"] = round(files / benchmark.stats.stats.mean, 1)
+
+
+class TestCliBenchmarks:
+    """End-to-end wall time of ``cookiecutter-obsidian-plugin --no-input``."""
+
+    @pytest.mark.benchmark(group="cli")
+    def test_main_in_process(self, benchmark, config_file, fresh_dir):
+        runner = CliRunner()
+
+        def run(output_dir):
+            result = runner.invoke(main, ["--no-input", "--output-dir", output_dir, "--config-file", str(config_file)])
+            assert result.exit_code == 0, result.output
+
+        benchmark.pedantic(run, setup=lambda: ((fresh_dir(),), {}), rounds=20, warmup_rounds=1)
+
+    @pytest.mark.benchmark(group="cli")
+    def test_main_new_process(self, benchmark, config_file, fresh_dir):
+        """Includes interpreter start-up and imports, as seen from a shell."""
+
+        def run(output_dir):
+            subprocess.run(  # noqa: S603
+                [
+                    sys.executable,
+                    "-c",
+                    "from cookiecutter_obsidian_plugin.cli import main; main()",
+                    "--no-input",
+                    "--output-dir",
+                    output_dir,
+                    "--config-file",
+                    str(config_file),
+                ],
+                check=True,
+                capture_output=True,
+            )
+
+        benchmark.pedantic(run, setup=lambda: ((fresh_dir(),), {}), rounds=5, warmup_rounds=1)
+
+
+class TestPhaseBenchmarks:
+    """Cost of each generation phase on the default context."""
+
+    @pytest.fixture
+    def context(self, template, config, tmp_path):
+        return template.resolve_context(config, no_input=True, output_dir=str(tmp_path))
+
+    @pytest.mark.benchmark(group="phases")
+    def test_load_template(self, benchmark, template):
+        benchmark(ProjectTemplate, str(template.template_dir))
+
+    @pytest.mark.benchmark(group="phases")
+    def test_resolve_context(self, benchmark, template, config, tmp_path):
+        benchmark(template.resolve_context, config, no_input=True, output_dir=str(tmp_path))
+
+    @pytest.mark.benchmark(group="phases")
+    def test_pre_hook(self, benchmark, context):
+        errors = benchmark(validate_context, context["cookiecutter"])
+
+        assert errors == []
+
+    @pytest.mark.benchmark(group="phases")
+    def test_render(self, benchmark, template, context):
+        files = benchmark(lambda: list(template.iter_files(context)))
+
+        record_throughput(benchmark, len(files))
+
+    @pytest.mark.benchmark(group="phases")
+    def test_render_and_write(self, benchmark, template, context, fresh_dir):
+        benchmark.pedantic(template.generate, setup=lambda: ((context, fresh_dir()), {}), rounds=50)
+
+    @pytest.mark.benchmark(group="phases")
+    def test_post_hook(self, benchmark, template, context, tmp_path):
+        project_dir = template.generate(context, output_dir=str(tmp_path))
+
+        benchmark(prune_project, project_dir, context["cookiecutter"])
+
+
+class TestFeatureBenchmarks:
+    """Files per second for every vitest/i18n/license combination."""
+
+    @pytest.mark.benchmark(group="features")
+    @pytest.mark.parametrize("values", FEATURE_COMBINATIONS, ids=combination_id)
+    def test_generate(self, benchmark, template, config, fresh_dir, values):
+        context = template.resolve_context(config, extra_context=values, no_input=True)
+        files = sum(1 for _ in template.iter_files(context))
+
+        benchmark.pedantic(template.generate, setup=lambda: ((context, fresh_dir()), {}), rounds=20)
+
+        record_throughput(benchmark, files)
@@ -0,0 +1,123 @@
+"""Size and startup time of a generated plugin for each ``i18n_engine``.
+
+Each engine's project is bundled like a production build, with only
+``obsidian`` left external. ``bytes`` and ``gzip_bytes`` of the minified
+``main.js`` go into ``extra_info``. The timed part runs the bundle in a fresh
+node ``vm`` context with a stub of the Obsidian API and awaits ``onload()``,
+which is where the translations are initialised; it is reported as
+``init_us`` per start.
+
+esbuild and i18next are not Python dependencies: the benchmarks run when
+``$ESBUILD`` or ``esbuild`` on ``PATH`` points at an esbuild binary, and are
+skipped otherwise. The i18next engine is also skipped unless node can resolve
+``i18next`` (e.g. through ``NODE_PATH`` after ``npm install -g esbuild i18next``).
+"""
+
+import gzip
+import os
+import shutil
+import subprocess  # noqa: S404
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from cookiecutter_obsidian_plugin.generator import render_project
+
+ENGINES = ("i18next", "minimal")
+STARTS = 200
+
+ESBUILD = os.environ.get("ESBUILD") or shutil.which("esbuild")
+NODE = shutil.which("node")
+
+
+def resolve_i18next() -> Optional[str]:
+    """Return the directory holding the i18next package, as node resolves it."""
+    if NODE is None:
+        return None
+    result = subprocess.run(  # noqa: S603
+        [NODE, "-p", "require.resolve('i18next/package.json')"],
+        capture_output=True,
+        text=True,
+    )
+    return str(Path(result.stdout.strip()).parent.parent) if result.returncode == 0 else None
+
+
+I18NEXT = resolve_i18next()
+
+# Runs the bundle ``STARTS`` times, each in a fresh vm context, and prints the
+# mean time per start in microseconds, ``onload()`` included.
+HARNESS = """\
+const fs = require("fs");
+const vm = require("vm");
+const code = fs.readFileSync(process.argv[2], "utf8");
+const runs = Number(process.argv[3]);
+const obsidian = { Plugin: class {}, moment: { locale: () => "en" } };
+const sandbox = { console: { log() {} }, Intl, require: () => obsidian };
+(async () => {
+	const start = process.hrtime.bigint();
+	for (let i = 0; i < runs; i++) {
+		const module = { exports: {} };
+		new vm.Script(code).runInNewContext({ ...sandbox, module, exports: module.exports });
+		await new module.exports.default().onload();
+	}
+	console.log(Number(process.hrtime.bigint() - start) / 1000 / runs);
+})();
+"""
+
+pytestmark = pytest.mark.skipif(ESBUILD is None or NODE is None, reason="needs node and an esbuild binary")
+requires_i18next = pytest.mark.skipif(I18NEXT is None, reason="needs a resolvable i18next")
+
+
+@pytest.fixture(scope="module")
+def bundles(tmp_path_factory) -> dict[str, Path]:
+    """Generate and bundle one project per engine that can be bundled here."""
+    out_dir = tmp_path_factory.mktemp("i18n-engine")
+    paths = {}
+    for engine in ENGINES:
+        if engine == "i18next" and I18NEXT is None:
+            continue
+        project = out_dir / engine
+        for name, content in render_project({"enable_i18n": "yes", "i18n_engine": engine}).items():
+            (project / name).parent.mkdir(parents=True, exist_ok=True)
+            (project / name).write_bytes(content)
+        paths[engine] = project / "main.js"
+        subprocess.run(  # noqa: S603
+            [ESBUILD, "src/main.ts", "--bundle", "--minify", "--format=cjs", "--target=es2022"]
+            + ["--external:obsidian", "--outfile=main.js", "--log-level=warning"],
+            cwd=project,
+            env={**os.environ, "NODE_PATH": I18NEXT or ""},
+            check=True,
+        )
+    (out_dir / "harness.cjs").write_text(HARNESS, encoding="utf-8")
+    return paths
+
+
+class TestI18nEngineBenchmarks:
+    """One result per engine, so ``pytest-benchmark compare`` lines them up."""
+
+    @pytest.mark.benchmark(group="i18n-engine")
+    @pytest.mark.parametrize("engine", [pytest.param("i18next", marks=requires_i18next), "minimal"])
+    def test_plugin(self, benchmark, bundles, engine):
+        bundle = bundles[engine]
+        code = bundle.read_bytes()
+        benchmark.extra_info["bytes"] = len(code)
+        benchmark.extra_info["gzip_bytes"] = len(gzip.compress(code, compresslevel=9))
+
+        def start() -> float:
+            result = subprocess.run(  # noqa: S603
+                [NODE, str(bundle.parents[1] / "harness.cjs"), str(bundle), str(STARTS)],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            return float(result.stdout)
+
+        init_us = benchmark.pedantic(start, rounds=5, warmup_rounds=1)
+        benchmark.extra_info["init_us"] = round(init_us, 1)
+
+    @requires_i18next
+    def test_minimal_engine_is_smaller(self, bundles):
+        sizes = {engine: bundles[engine].stat().st_size for engine in ENGINES}
+
+        assert sizes["minimal"] < sizes["i18next"] / 4, sizes
@@ -0,0 +1,70 @@
+"""Streaming of rendered projects into tar.gz or zip archives.
+
+Files are rendered and written to the archive one at a time, so memory use
+is bounded by the largest single file rather than the whole project, and
+the output may be a non-seekable stream such as stdout.
+"""
+
+import io
+import tarfile
+import time
+import zipfile
+from collections.abc import Iterable
+from typing import Any, BinaryIO, Optional
+
+from cookiecutter_obsidian_plugin.generator import PROJECT_DIR_TEMPLATE, RenderedFile, prepare_project
+
+ARCHIVE_FORMATS = ("tar.gz", "zip")
+
+
+def write_archive(files: Iterable[RenderedFile], root: str, archive_format: str, fileobj: BinaryIO) -> int:
+    """Write ``files`` under the ``root`` directory into an archive and return the file count."""
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unsupported archive format: {archive_format}")
+
+    mtime = time.time()
+    count = 0
+    if archive_format == "tar.gz":
+        # "w|gz" writes a plain stream and never seeks back.
+        with tarfile.open(fileobj=fileobj, mode="w|gz") as archive:
+            for rendered_file in files:
+                info = tarfile.TarInfo(f"{root}/{rendered_file.path}")
+                info.size = len(rendered_file.content)
+                info.mode = rendered_file.mode
+                info.mtime = int(mtime)
+                archive.addfile(info, io.BytesIO(rendered_file.content))
+                count += 1
+    else:
+        date_time = time.localtime(mtime)[:6]
+        with zipfile.ZipFile(fileobj, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for rendered_file in files:
+                info = zipfile.ZipInfo(f"{root}/{rendered_file.path}", date_time=date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = (0o100000 | rendered_file.mode) << 16
+                archive.writestr(info, rendered_file.content)
+                count += 1
+    return count
+
+
+def archive_project(
+    template_dir: str,
+    fileobj: BinaryIO,
+    archive_format: str,
+    no_input: bool = False,
+    replay: bool = False,
+    config_file: Optional[str] = None,
+    extra_context: Optional[dict[str, Any]] = None,
+    use_cache: bool = True,
+) -> str:
+    """Render a project straight into an archive and return its root directory name."""
+    template, context = prepare_project(
+        template_dir,
+        no_input=no_input,
+        replay=replay,
+        config_file=config_file,
+        extra_context=extra_context,
+        use_cache=use_cache,
+    )
+    root = template.render_path(PROJECT_DIR_TEMPLATE, context)
+    write_archive(template.iter_files(context), root, archive_format, fileobj)
+    return root
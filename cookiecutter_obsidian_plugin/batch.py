@@ -0,0 +1,177 @@
+"""Batch generation of many projects in a single run."""
+
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+from cookiecutter_obsidian_plugin.generator import ProjectTemplate, UpdateReport
+from cookiecutter_obsidian_plugin.validation import validate_context
+
+
+@dataclass
+class BatchResult:
+    """Outcome of generating one project of a batch."""
+
+    index: int
+    plugin_id: str
+    elapsed: float
+    project_path: Optional[str] = None
+    error: Optional[str] = None
+    report: Optional[UpdateReport] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def load_batch_file(path: Path) -> list[dict[str, Any]]:
+    """Read a list of template contexts from a JSON or YAML file."""
+    text = path.read_text(encoding="utf-8")
+    contexts = yaml.safe_load(text) if path.suffix.lower() in (".yml", ".yaml") else json.loads(text)
+
+    if not isinstance(contexts, list):
+        raise ValueError(f"{path} must contain a list of contexts")
+    for index, context in enumerate(contexts):
+        if not isinstance(context, dict):
+            raise ValueError(f"Entry #{index} in {path} must be a mapping of template variables")
+    return [{key: _to_text(value) for key, value in context.items()} for context in contexts]
+
+
+def _to_text(value: Any) -> str:
+    # YAML reads unquoted yes/no as booleans, while the template expects the choice strings.
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    return str(value)
+
+
+def resolve_batch(
+    template: ProjectTemplate,
+    config: dict[str, Any],
+    entries: list[dict[str, Any]],
+    output_dir: str,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Resolve and validate every batch entry before anything is generated.
+
+    Returns the resolved contexts together with all errors found, each
+    prefixed with the entry it belongs to.
+    """
+    contexts = []
+    errors = []
+    seen_ids: dict[str, int] = {}
+    for index, extra_context in enumerate(entries):
+        try:
+            context = template.resolve_context(
+                config, extra_context=extra_context, no_input=True, output_dir=output_dir
+            )
+        except ValueError as e:
+            errors.append(f"Entry #{index}: {e}")
+            continue
+
+        plugin_id = context["cookiecutter"]["plugin_id"]
+        errors.extend(f"Entry #{index} ({plugin_id}): {error}" for error in validate_context(context["cookiecutter"]))
+        if plugin_id in seen_ids:
+            errors.append(f"Entry #{index} ({plugin_id}): plugin id is already used by entry #{seen_ids[plugin_id]}")
+        seen_ids.setdefault(plugin_id, index)
+        contexts.append(context)
+    return contexts, errors
+
+
+def generate_one(
+    template: ProjectTemplate,
+    index: int,
+    context: dict[str, Any],
+    output_dir: str,
+    overwrite_if_exists: bool = False,
+    skip_if_file_exists: bool = False,
+    update: bool = False,
+) -> BatchResult:
+    """Generate (or with ``update``, regenerate in place) one resolved batch entry.
+
+    Any failure is captured in the result instead of being raised.
+    """
+    plugin_id = context["cookiecutter"]["plugin_id"]
+    start = time.perf_counter()
+    report = None
+    try:
+        if update:
+            report = template.update(context, output_dir=output_dir)
+            project_path = report.project_path
+        else:
+            project_path = template.generate(
+                context,
+                output_dir=output_dir,
+                overwrite_if_exists=overwrite_if_exists,
+                skip_if_file_exists=skip_if_file_exists,
+            )
+    except Exception as e:
+        return BatchResult(index, plugin_id, time.perf_counter() - start, error=str(e) or type(e).__name__)
+    return BatchResult(index, plugin_id, time.perf_counter() - start, project_path=project_path, report=report)
+
+
+# Template of a worker process, set up once by ``_init_worker``.
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(template_dir: str, use_cache: bool) -> None:
+    _worker_state["template"] = ProjectTemplate(template_dir, use_cache=use_cache)
+
+
+def _generate_in_worker(
+    index: int,
+    context: dict[str, Any],
+    output_dir: str,
+    overwrite_if_exists: bool,
+    skip_if_file_exists: bool,
+    update: bool,
+) -> BatchResult:
+    return generate_one(
+        _worker_state["template"], index, context, output_dir, overwrite_if_exists, skip_if_file_exists, update
+    )
+
+
+def run_batch(
+    template: ProjectTemplate,
+    contexts: list[dict[str, Any]],
+    output_dir: str,
+    overwrite_if_exists: bool = False,
+    skip_if_file_exists: bool = False,
+    jobs: int = 1,
+    update: bool = False,
+) -> list[BatchResult]:
+    """Generate every resolved context from the same template, continuing past failures.
+
+    With ``jobs`` greater than one the contexts are shared across a pool of
+    worker processes, each holding its own parsed copy of the template.
+    Results are returned in the order of ``contexts`` either way.
+    """
+    if jobs <= 1 or len(contexts) <= 1:
+        return [
+            generate_one(template, index, context, output_dir, overwrite_if_exists, skip_if_file_exists, update)
+            for index, context in enumerate(contexts)
+        ]
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(contexts)),
+        initializer=_init_worker,
+        initargs=(str(template.template_dir), template.use_cache),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _generate_in_worker, index, context, output_dir, overwrite_if_exists, skip_if_file_exists, update
+            )
+            for index, context in enumerate(contexts)
+        ]
+        for index, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # The worker itself died (e.g. BrokenProcessPool); report it against this entry.
+                plugin_id = contexts[index]["cookiecutter"]["plugin_id"]
+                results.append(BatchResult(index, plugin_id, 0.0, error=str(e) or type(e).__name__))
+    return results
@@ -1,11 +1,23 @@
 """CLI interface for cookiecutter-obsidian-plugin."""
 
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, BinaryIO, Optional
 
 import click
-from cookiecutter.main import cookiecutter
+
+from cookiecutter_obsidian_plugin import __version__
+from cookiecutter_obsidian_plugin.validation import ContextValidationError
+
+if TYPE_CHECKING:
+    from cookiecutter_obsidian_plugin.profiling import Profiler
+
+# Generation pulls in cookiecutter, Jinja2 and friends, so those modules are
+# imported inside the commands that need them. ``--help`` and ``--version``
+# only pay for click.
+
+DEFAULT_PROFILE_OUTPUT = "profile.json"
 
 
 def get_template_dir() -> str:
@@ -48,7 +60,59 @@ def get_template_dir() -> str:
     type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
     help="User configuration file",
 )
-@click.version_option()
+@click.option(
+    "--batch",
+    "batch_file",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    help="JSON or YAML file with a list of contexts; generates one project per entry without prompting",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes used to generate --batch projects",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not read or write the compiled template cache",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["dir", "tar.gz", "zip"]),
+    default="dir",
+    show_default=True,
+    help="Write the project as a directory or stream it into an archive",
+)
+@click.option(
+    "--output-file",
+    type=click.File("wb", lazy=True),
+    help="Archive file to write with --format tar.gz/zip (default: stdout)",
+)
+@click.option(
+    "--update",
+    is_flag=True,
+    help="Regenerate an existing project in place, rewriting only files that changed",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Time every generation phase and file, print a summary and write a Chrome trace",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help=f"Chrome trace file written by --profile (default: {DEFAULT_PROFILE_OUTPUT})",
+)
+@click.option(
+    "--npm-mirror",
+    metavar="URL_OR_DIR",
+    help="npm registry mirror URL or directory of package tarballs to install from, written to .npmrc and the lockfile",
+)
+@click.version_option(version=__version__)
 def main(
     output_dir: Path,
     no_input: bool,
@@ -56,12 +120,101 @@ def main(
     overwrite_if_exists: bool,
     skip_if_file_exists: bool,
     config_file: Optional[Path],
+    batch_file: Optional[Path],
+    jobs: int,
+    no_cache: bool,
+    output_format: str,
+    output_file: Optional[BinaryIO],
+    update: bool,
+    profile: bool,
+    profile_output: Optional[Path],
+    npm_mirror: Optional[str],
 ) -> None:
     template_dir = get_template_dir()
 
+    extra_context = None
+    if npm_mirror is not None:
+        if replay:
+            raise click.UsageError("--npm-mirror cannot be combined with --replay")
+        if not npm_mirror.startswith(("http://", "https://")):
+            # The lockfile refers to the tarballs by absolute path.
+            npm_mirror = str(Path(npm_mirror).absolute())
+        extra_context = {"_npm_mirror": npm_mirror}
+
+    if profile_output is not None and not profile:
+        raise click.UsageError("--profile-output requires --profile")
+    if profile and (batch_file is not None or output_format != "dir"):
+        raise click.UsageError("--profile cannot be combined with --batch or --format")
+    profiler = None
+    if profile:
+        from cookiecutter_obsidian_plugin.profiling import Profiler
+
+        profiler = Profiler()
+        # Make the cost of the lazily imported generation stack visible too.
+        with profiler.span("setup", "import generator"):
+            import cookiecutter_obsidian_plugin.generator  # noqa: F401
+
+    if update and (overwrite_if_exists or skip_if_file_exists or output_format != "dir"):
+        raise click.UsageError(
+            "--update cannot be combined with --overwrite-if-exists, --skip-if-file-exists or --format"
+        )
+    if output_file is not None and output_format == "dir":
+        raise click.UsageError("--output-file requires --format tar.gz or zip")
+    if output_format != "dir":
+        if batch_file is not None:
+            raise click.UsageError("--format cannot be combined with --batch")
+        if output_file is None and not (no_input or replay):
+            raise click.UsageError("Streaming an archive to stdout requires --no-input or --replay")
+        run_archive_command(
+            template_dir,
+            output_format,
+            output_file,
+            no_input,
+            replay,
+            config_file,
+            use_cache=not no_cache,
+            extra_context=extra_context,
+        )
+        return
+
+    if batch_file is not None:
+        if replay:
+            raise click.UsageError("--batch cannot be combined with --replay")
+        run_batch_command(
+            template_dir,
+            batch_file,
+            output_dir,
+            overwrite_if_exists,
+            skip_if_file_exists,
+            config_file,
+            jobs,
+            use_cache=not no_cache,
+            update=update,
+            extra_context=extra_context,
+        )
+        return
+    if jobs > 1:
+        raise click.UsageError("--jobs can only be used with --batch")
+    if update:
+        run_update_command(
+            template_dir,
+            output_dir,
+            no_input,
+            replay,
+            config_file,
+            use_cache=not no_cache,
+            profiler=profiler,
+            extra_context=extra_context,
+        )
+        if profiler is not None:
+            report_profile(profiler, profile_output or Path(DEFAULT_PROFILE_OUTPUT))
+        return
+
     try:
+        from cookiecutter_obsidian_plugin.generator import generate_project
+
         click.echo("Creating new Obsidian plugin...")
-        project_path = cookiecutter(
+        project_path = generate_project(
             template_dir,
             output_dir=str(output_dir),
             no_input=no_input,
@@ -69,6 +222,9 @@ def main(
             overwrite_if_exists=overwrite_if_exists,
             skip_if_file_exists=skip_if_file_exists,
             config_file=str(config_file) if config_file else None,
+            extra_context=extra_context,
+            use_cache=not no_cache,
+            profiler=profiler,
         )
 
         click.echo(f"Project successfully created at: {project_path}")
@@ -78,10 +234,154 @@ def main(
         click.echo("   make build")
         click.echo("\nFor detailed setup instructions, see the README.md file")
 
+    except ContextValidationError as e:
+        report_errors("Invalid template variables:", e.errors)
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"Error creating project: {e}", err=True)
+        sys.exit(1)
+
+    if profiler is not None:
+        report_profile(profiler, profile_output or Path(DEFAULT_PROFILE_OUTPUT))
+
+
+def report_errors(title: str, errors: list[str]) -> None:
+    click.echo(title, err=True)
+    for error in errors:
+        click.echo(f"  - {error}", err=True)
+
+
+def report_profile(profiler: "Profiler", trace_file: Path) -> None:
+    click.echo("\nProfile:")
+    click.echo(profiler.summary())
+    profiler.write_trace(trace_file)
+    click.echo(f"\nChrome trace written to {trace_file} (open it in chrome://tracing or ui.perfetto.dev)")
+
+
+def run_update_command(
+    template_dir: str,
+    output_dir: Path,
+    no_input: bool,
+    replay: bool,
+    config_file: Optional[Path],
+    use_cache: bool = True,
+    profiler: Optional["Profiler"] = None,
+    extra_context: Optional[dict[str, Any]] = None,
+) -> None:
+    try:
+        from cookiecutter_obsidian_plugin.generator import update_project
+
+        click.echo("Updating Obsidian plugin...")
+        report = update_project(
+            template_dir,
+            output_dir=str(output_dir),
+            no_input=no_input,
+            replay=replay,
+            config_file=str(config_file) if config_file else None,
+            extra_context=extra_context,
+            use_cache=use_cache,
+            profiler=profiler,
+        )
+    except ContextValidationError as e:
+        report_errors("Invalid template variables:", e.errors)
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"Error updating project: {e}", err=True)
+        sys.exit(1)
+
+    for label, paths in (("added", report.added), ("changed", report.changed), ("removed", report.removed)):
+        for path in paths:
+            click.echo(f"  {label:<8} {path}")
+    click.echo(f"Project updated at: {report.project_path} ({report.summary()})")
+
+
+def run_archive_command(
+    template_dir: str,
+    output_format: str,
+    output_file: Optional[BinaryIO],
+    no_input: bool,
+    replay: bool,
+    config_file: Optional[Path],
+    use_cache: bool = True,
+    extra_context: Optional[dict[str, Any]] = None,
+) -> None:
+    # The archive may be going to stdout, so every message goes to stderr.
+    try:
+        from cookiecutter_obsidian_plugin.archive import archive_project
+
+        fileobj = output_file if output_file is not None else click.get_binary_stream("stdout")
+        root = archive_project(
+            template_dir,
+            fileobj,
+            output_format,
+            no_input=no_input,
+            replay=replay,
+            config_file=str(config_file) if config_file else None,
+            extra_context=extra_context,
+            use_cache=use_cache,
+        )
+        fileobj.flush()
+    except ContextValidationError as e:
+        report_errors("Invalid template variables:", e.errors)
+        sys.exit(1)
     except Exception as e:
         click.echo(f"Error creating project: {e}", err=True)
         sys.exit(1)
 
+    destination = output_file.name if output_file is not None else "stdout"
+    click.echo(f"Project {root} written to {destination} as {output_format}", err=True)
+
+
+def run_batch_command(
+    template_dir: str,
+    batch_file: Path,
+    output_dir: Path,
+    overwrite_if_exists: bool,
+    skip_if_file_exists: bool,
+    config_file: Optional[Path],
+    jobs: int = 1,
+    use_cache: bool = True,
+    update: bool = False,
+    extra_context: Optional[dict[str, Any]] = None,
+) -> None:
+    from cookiecutter_obsidian_plugin.batch import load_batch_file, resolve_batch, run_batch
+    from cookiecutter_obsidian_plugin.generator import ProjectTemplate, load_config
+
+    try:
+        # Values given on the command line apply to every entry that does not set them itself.
+        entries = [{**(extra_context or {}), **entry} for entry in load_batch_file(batch_file)]
+        config = load_config(str(config_file) if config_file else None)
+        template = ProjectTemplate(template_dir, use_cache=use_cache)
+        # Every entry is checked before the first project is written.
+        contexts, errors = resolve_batch(template, config, entries, str(output_dir))
+    except Exception as e:
+        click.echo(f"Error reading batch file: {e}", err=True)
+        sys.exit(1)
+    if errors:
+        report_errors(f"Invalid entries in {batch_file}:", errors)
+        sys.exit(1)
+
+    click.echo(f"{'Updating' if update else 'Creating'} {len(contexts)} Obsidian plugins...")
+    start = time.perf_counter()
+    results = run_batch(
+        template, contexts, str(output_dir), overwrite_if_exists, skip_if_file_exists, jobs=jobs, update=update
+    )
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if result.ok:
+            details = f" ({result.report.summary()})" if result.report else ""
+            click.echo(f"  ok      {result.plugin_id} ({result.elapsed:.2f}s) -> {result.project_path}{details}")
+        else:
+            click.echo(f"  failed  {result.plugin_id} ({result.elapsed:.2f}s): {result.error}", err=True)
+
+    failed = sum(not result.ok for result in results)
+    click.echo(
+        f"\n{len(results) - failed} of {len(results)} projects {'updated' if update else 'created'} in {elapsed:.2f}s"
+    )
+    if failed:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
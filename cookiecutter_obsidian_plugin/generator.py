@@ -0,0 +1,577 @@
+"""Project generation from the bundled cookiecutter template.
+
+The template tree is read and its Jinja environment is built once per
+:class:`ProjectTemplate`, so any number of projects can be rendered from it
+without walking the template directory or re-parsing the files again.
+Compiled templates are also kept in an on-disk cache shared between runs.
+
+Projects can be written to disk with :func:`generate_project` or rendered in
+memory with :func:`render_project` and :func:`iter_project`; both go through
+:meth:`ProjectTemplate.iter_files`.
+"""
+
+import contextlib
+import functools
+import hashlib
+import io
+import os
+import shutil
+import stat
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from binaryornot.check import is_binary
+from cookiecutter.config import get_user_config
+from cookiecutter.exceptions import InvalidModeException, OutputDirExistsException, UndefinedVariableInTemplate
+from cookiecutter.generate import generate_context
+from cookiecutter.prompt import prompt_for_config, render_variable
+from cookiecutter.replay import dump, load
+from cookiecutter.utils import create_env_with_context, rmtree
+from jinja2 import DictLoader, FileSystemBytecodeCache, Template
+from jinja2.bccache import Bucket
+from jinja2.exceptions import UndefinedError
+
+from cookiecutter_obsidian_plugin import __version__
+from cookiecutter_obsidian_plugin.lockfile import LOCKFILE_NAME, build_lockfile, load_fragment
+from cookiecutter_obsidian_plugin.profiling import NULL_PROFILER, NullProfiler, Profiler
+from cookiecutter_obsidian_plugin.pruning import excluded_paths, is_excluded, is_generated, prune_project, remove_path
+from cookiecutter_obsidian_plugin.structure import InvalidFileError, check_content
+from cookiecutter_obsidian_plugin.validation import ContextValidationError, validate_context
+
+PROJECT_DIR_TEMPLATE = "{{cookiecutter.plugin_id}}"
+
+
+@dataclass(frozen=True)
+class TemplateFile:
+    """A single file of the template tree, read once from disk."""
+
+    path: str
+    source: bytes
+    mode: int
+    binary: bool
+    newline: Optional[str]
+
+
+@dataclass(frozen=True)
+class RenderedFile:
+    """A rendered project file, with its path relative to the project root."""
+
+    path: str
+    content: bytes
+    mode: int
+
+
+@dataclass
+class UpdateReport:
+    """Files touched by :meth:`ProjectTemplate.update`, relative to the project root."""
+
+    project_path: str
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.changed)} changed, "
+            f"{len(self.removed)} removed, {self.unchanged} unchanged"
+        )
+
+
+def _detect_newline(source: bytes) -> Optional[str]:
+    """Return the newline of the source the same way cookiecutter detects it."""
+    reader = io.TextIOWrapper(io.BytesIO(source), encoding="utf-8")
+    reader.readline()
+    return reader.newlines[0] if isinstance(reader.newlines, tuple) else reader.newlines
+
+
+def _encode(text: str, newline: Optional[str]) -> bytes:
+    """Encode rendered text the way a text-mode write with ``newline`` would."""
+    if newline is None:
+        newline = os.linesep
+    if newline not in ("", "\n"):
+        text = text.replace("\n", newline)
+    return text.encode("utf-8")
+
+
+# Caches of other versions and template trees are removed after this long without use.
+STALE_CACHE_SECONDS = 30 * 24 * 60 * 60
+
+
+def get_cache_root() -> Path:
+    """Return the user cache directory for compiled templates."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "cookiecutter-obsidian-plugin"
+
+
+class TolerantBytecodeCache(FileSystemBytecodeCache):
+    """A bytecode cache whose file errors only cost speed.
+
+    Its directory may be removed by another process while templates are being
+    compiled, so reading and writing fall back to compiling without the cache.
+    """
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().load_bytecode(bucket)
+        except OSError:
+            bucket.reset()
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        with contextlib.suppress(OSError):
+            super().dump_bytecode(bucket)
+
+
+class ProjectTemplate:
+    """Template tree parsed once and rendered for any number of contexts.
+
+    With ``use_cache`` the compiled templates are stored under
+    :func:`get_cache_root`, in a directory keyed by the package version and a
+    hash of the template tree, so a change to any template file starts a new
+    cache instead of reusing stale bytecode.
+
+    A :class:`~cookiecutter_obsidian_plugin.profiling.Profiler` passed as
+    ``profiler`` records the time spent loading the template and on every
+    rendered and written file.
+    """
+
+    def __init__(self, template_dir: str, use_cache: bool = True, profiler: Optional[Profiler] = None) -> None:
+        self.template_dir = Path(template_dir)
+        self.name = self.template_dir.resolve().name
+        self.context_file = self.template_dir / "cookiecutter.json"
+        self.use_cache = use_cache
+        self.profiler: Union[Profiler, NullProfiler] = profiler or NULL_PROFILER
+        self.dirs: list[str] = []
+        self.files: list[TemplateFile] = []
+        with self.profiler.span("setup", "load template"):
+            self._load_tree(self.template_dir / PROJECT_DIR_TEMPLATE)
+            self.tree_hash = self._hash_tree()
+
+            self.env = create_env_with_context(generate_context(context_file=str(self.context_file)))
+            self.env.loader = DictLoader({f.path: f.source.decode("utf-8") for f in self.files if not f.binary})
+            if use_cache:
+                self.env.bytecode_cache = self._open_cache()
+        self._path_templates: dict[str, Template] = {}
+
+    @property
+    def cache_dir(self) -> Path:
+        return get_cache_root() / f"{__version__}-{self.tree_hash[:16]}"
+
+    def _hash_tree(self) -> str:
+        digest = hashlib.sha256(self.context_file.read_bytes())
+        for template_file in self.files:
+            digest.update(template_file.path.encode("utf-8") + b"\0")
+            digest.update(template_file.source + b"\0")
+        return digest.hexdigest()
+
+    def _open_cache(self) -> Optional[FileSystemBytecodeCache]:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # The modification time tells _remove_stale_caches when the cache was last used.
+            os.utime(self.cache_dir)
+            self._remove_stale_caches()
+        except OSError:
+            # An unwritable cache only costs speed, never a failed generation.
+            return None
+        return TolerantBytecodeCache(str(self.cache_dir))
+
+    def _remove_stale_caches(self) -> None:
+        """Remove the caches of other package versions and template trees unused for a while.
+
+        Another process may still be using one of them, e.g. an older
+        installed version; it then only loses its cache, see
+        :class:`TolerantBytecodeCache`.
+        """
+        cutoff = time.time() - STALE_CACHE_SECONDS
+        for path in self.cache_dir.parent.iterdir():
+            if path != self.cache_dir and path.is_dir() and path.stat().st_mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _load_tree(self, root: Path) -> None:
+        for current, dirs, files in os.walk(root):
+            dirs.sort()
+            rel_root = Path(current).relative_to(root)
+            self.dirs.extend((rel_root / d).as_posix() for d in dirs)
+            for name in sorted(files):
+                full_path = Path(current, name)
+                source = full_path.read_bytes()
+                binary = is_binary(str(full_path))
+                self.files.append(
+                    TemplateFile(
+                        path=(rel_root / name).as_posix(),
+                        source=source,
+                        mode=stat.S_IMODE(full_path.stat().st_mode),
+                        binary=binary,
+                        newline=None if binary else _detect_newline(source),
+                    )
+                )
+
+    def render_path(self, path: str, context: dict[str, Any]) -> str:
+        """Render a file or directory name from the template tree."""
+        if "{" not in path:
+            return path
+        template = self._path_templates.get(path)
+        if template is None:
+            template = self._path_templates[path] = self.env.from_string(path)
+        return template.render(**context)
+
+    def resolve_context(
+        self,
+        config: dict[str, Any],
+        extra_context: Optional[dict[str, Any]] = None,
+        no_input: bool = False,
+        replay: bool = False,
+        output_dir: str = ".",
+    ) -> dict[str, Any]:
+        """Build the full cookiecutter context, prompting when needed."""
+        if replay and (no_input or extra_context is not None):
+            raise InvalidModeException("You can not use both replay and no_input or extra_context at the same time.")
+
+        context = generate_context(
+            context_file=str(self.context_file),
+            default_context=config["default_context"],
+            extra_context=None if replay else extra_context,
+        )
+        context_for_prompting = context
+        if replay:
+            replayed = load(config["replay_dir"], self.name)
+            # Variables added to the template after the replay file was saved
+            # are still asked for; defaults derived from other variables are
+            # computed from the replayed values.
+            env = create_env_with_context(context)
+            context_for_prompting = {
+                "cookiecutter": {
+                    k: render_variable(env, v, replayed["cookiecutter"]) if isinstance(v, str) and k[0] != "_" else v
+                    for k, v in context["cookiecutter"].items()
+                    if k not in replayed["cookiecutter"]
+                }
+            }
+            context = replayed
+
+        context["_cookiecutter"] = {k: v for k, v in context["cookiecutter"].items() if not k.startswith("_")}
+        if context_for_prompting["cookiecutter"]:
+            context["cookiecutter"].update(prompt_for_config(context_for_prompting, no_input))
+
+        context["cookiecutter"]["_template"] = str(self.template_dir)
+        context["cookiecutter"]["_output_dir"] = str(Path(output_dir).absolute())
+        context["cookiecutter"]["_repo_dir"] = str(self.template_dir)
+        context["cookiecutter"]["_checkout"] = None
+
+        return context
+
+    def save_replay(self, config: dict[str, Any], context: dict[str, Any]) -> None:
+        """Store the context so a later ``--replay`` run can reuse it."""
+        dump(config["replay_dir"], self.name, context)
+
+    def generate(
+        self,
+        context: dict[str, Any],
+        output_dir: str = ".",
+        overwrite_if_exists: bool = False,
+        skip_if_file_exists: bool = False,
+    ) -> str:
+        """Render the template into ``output_dir`` and return the project path.
+
+        ``context`` must already be validated, as :func:`prepare_project` and
+        :func:`~cookiecutter_obsidian_plugin.batch.resolve_batch` do; that
+        stands in for ``hooks/pre_gen_project.py``. The clean-up of
+        ``hooks/post_gen_project.py`` runs in-process here rather than as a
+        rendered hook script.
+        """
+        project_dir = self._project_dir(context, output_dir)
+        if project_dir.exists():
+            if not overwrite_if_exists:
+                raise OutputDirExistsException(f'Error: "{project_dir}" directory already exists')
+            delete_on_failure = False
+        else:
+            project_dir.mkdir(parents=True)
+            delete_on_failure = True
+
+        try:
+            self._write_tree(project_dir, context, skip_if_file_exists)
+        except (UndefinedVariableInTemplate, InvalidFileError):
+            if delete_on_failure:
+                rmtree(project_dir)
+            raise
+
+        # Disabled features are never written, but an existing project being
+        # overwritten may still hold them from an earlier generation.
+        with self.profiler.span("hook", "post_gen_project"):
+            prune_project(project_dir, context["cookiecutter"], self.profiler)
+        return str(project_dir)
+
+    def update(self, context: dict[str, Any], output_dir: str = ".") -> UpdateReport:
+        """Bring a previously generated project in line with the template.
+
+        Files are rendered in memory and only those whose content or mode
+        differs from the disk are written, so unchanged files keep their
+        mtimes. Files of features that are now disabled are removed; files
+        that an older template wrote and this one no longer produces are not
+        known here and stay in place. ``context`` must already be validated,
+        as for :meth:`generate`.
+        """
+        project_dir = self._project_dir(context, output_dir)
+        report = UpdateReport(str(project_dir))
+        # Render everything first so a template error leaves the project untouched.
+        rendered_files = list(self.iter_files(context))
+
+        for path in self.iter_dirs(context):
+            (project_dir / path).mkdir(parents=True, exist_ok=True)
+
+        for rendered_file in rendered_files:
+            outfile = project_dir / rendered_file.path
+            if not outfile.is_file():
+                report.added.append(rendered_file.path)
+                with self.profiler.span("write", rendered_file.path):
+                    outfile.parent.mkdir(parents=True, exist_ok=True)
+                    outfile.write_bytes(rendered_file.content)
+                    outfile.chmod(rendered_file.mode)
+                continue
+
+            file_stat = outfile.stat()
+            same_content = (
+                file_stat.st_size == len(rendered_file.content) and outfile.read_bytes() == rendered_file.content
+            )
+            same_mode = stat.S_IMODE(file_stat.st_mode) == rendered_file.mode
+            if same_content and same_mode:
+                report.unchanged += 1
+                continue
+            report.changed.append(rendered_file.path)
+            with self.profiler.span("write", rendered_file.path):
+                if not same_content:
+                    outfile.write_bytes(rendered_file.content)
+                outfile.chmod(rendered_file.mode)
+
+        for path in excluded_paths(context["cookiecutter"]):
+            if not is_generated(project_dir, path):
+                continue
+            target = project_dir / path
+            if target.is_dir():
+                report.removed.extend(
+                    sorted(p.relative_to(project_dir).as_posix() for p in target.rglob("*") if not p.is_dir())
+                )
+            elif target.exists():
+                report.removed.append(path)
+            with self.profiler.span("prune", path):
+                remove_path(target)
+        return report
+
+    def _project_dir(self, context: dict[str, Any], output_dir: str) -> Path:
+        """Return the absolute project directory the context renders to."""
+        try:
+            return Path(output_dir, self.render_path(PROJECT_DIR_TEMPLATE, context)).absolute()
+        except UndefinedError as err:
+            raise UndefinedVariableInTemplate(
+                f"Unable to create project directory '{PROJECT_DIR_TEMPLATE}'", err, context
+            ) from err
+
+    def iter_dirs(self, context: dict[str, Any]) -> Iterator[str]:
+        """Yield the project directories, leaving out disabled features."""
+        excluded = excluded_paths(context["cookiecutter"])
+        for template_path in self.dirs:
+            try:
+                path = self.render_path(template_path, context)
+            except UndefinedError as err:
+                raise UndefinedVariableInTemplate(
+                    f"Unable to create directory '{template_path}'", err, context
+                ) from err
+            if not is_excluded(path, excluded):
+                yield path
+
+    def iter_files(
+        self, context: dict[str, Any], skip: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[RenderedFile]:
+        """Render the project one file at a time, leaving out disabled features.
+
+        Rendered JSON and YAML files are parsed before they are yielded, so a
+        broken file raises :class:`InvalidFileError` instead of reaching npm.
+        ``package-lock.json`` comes last when a lock fragment is stored for the
+        enabled features.
+        ``skip`` is called with each project-relative path before the file is
+        rendered; returning ``True`` leaves that file out. The lockfile is built
+        from the rendered ``package.json``, so skipping ``package.json`` skips
+        it too.
+        """
+        excluded = excluded_paths(context["cookiecutter"])
+        package_json = None
+        for template_file in self.files:
+            try:
+                path = self.render_path(template_file.path, context)
+                if is_excluded(path, excluded) or (skip is not None and skip(path)):
+                    continue
+                content = self._render_file(template_file, path, context)
+            except UndefinedError as err:
+                raise UndefinedVariableInTemplate(
+                    f"Unable to create file '{template_file.path}'", err, context
+                ) from err
+            if path == "package.json":
+                package_json = content
+            yield RenderedFile(path, content, template_file.mode)
+
+        fragment = load_fragment(context["cookiecutter"])
+        if fragment is not None and package_json is not None and not (skip is not None and skip(LOCKFILE_NAME)):
+            yield self._render_lockfile(context, fragment, package_json)
+
+    def _render_file(self, template_file: TemplateFile, path: str, context: dict[str, Any]) -> bytes:
+        if template_file.binary:
+            return template_file.source
+        with self.profiler.span("render", path):
+            rendered = self.env.get_template(template_file.path).render(**context)
+            content = _encode(rendered, template_file.newline)
+        with self.profiler.span("check", path):
+            check_content(path, content)
+        return content
+
+    def _render_lockfile(self, context: dict[str, Any], fragment: dict[str, Any], package_json: bytes) -> RenderedFile:
+        """Build ``package-lock.json`` from the rendered ``package.json`` and a stored lock fragment."""
+        template_file = next(f for f in self.files if f.path == "package.json")
+        with self.profiler.span("render", LOCKFILE_NAME):
+            content = build_lockfile(package_json, fragment, context["cookiecutter"].get("_npm_mirror", ""))
+        return RenderedFile(LOCKFILE_NAME, content, template_file.mode)
+
+    def _write_tree(self, project_dir: Path, context: dict[str, Any], skip_if_file_exists: bool) -> None:
+        for path in self.iter_dirs(context):
+            (project_dir / path).mkdir(parents=True, exist_ok=True)
+
+        def skip(path: str) -> bool:
+            outfile = project_dir / path
+            return outfile.is_dir() or (skip_if_file_exists and outfile.exists())
+
+        for rendered_file in self.iter_files(context, skip=skip):
+            outfile = project_dir / rendered_file.path
+            with self.profiler.span("write", rendered_file.path):
+                outfile.write_bytes(rendered_file.content)
+                outfile.chmod(rendered_file.mode)
+
+
+def load_config(config_file: Optional[str] = None) -> dict[str, Any]:
+    """Load the cookiecutter user configuration."""
+    return get_user_config(config_file=config_file)
+
+
+def prepare_project(
+    template_dir: str,
+    output_dir: str = ".",
+    no_input: bool = False,
+    replay: bool = False,
+    config_file: Optional[str] = None,
+    extra_context: Optional[dict[str, Any]] = None,
+    use_cache: bool = True,
+    profiler: Optional[Profiler] = None,
+) -> tuple[ProjectTemplate, dict[str, Any]]:
+    """Load the template and resolve a validated context, prompting unless told not to.
+
+    The context is validated before anything is written, including the replay
+    file; :class:`ContextValidationError` lists every invalid value.
+    """
+    template = ProjectTemplate(template_dir, use_cache=use_cache, profiler=profiler)
+    with template.profiler.span("context", "resolve context"):
+        config = load_config(config_file)
+        context = template.resolve_context(
+            config,
+            extra_context=extra_context,
+            no_input=no_input,
+            replay=replay,
+            output_dir=output_dir,
+        )
+    with template.profiler.span("hook", "pre_gen_project"):
+        errors = validate_context(context["cookiecutter"])
+    if errors:
+        raise ContextValidationError(errors)
+
+    with template.profiler.span("context", "save replay"):
+        template.save_replay(config, context)
+    return template, context
+
+
+def generate_project(
+    template_dir: str,
+    output_dir: str = ".",
+    no_input: bool = False,
+    replay: bool = False,
+    overwrite_if_exists: bool = False,
+    skip_if_file_exists: bool = False,
+    config_file: Optional[str] = None,
+    extra_context: Optional[dict[str, Any]] = None,
+    use_cache: bool = True,
+    profiler: Optional[Profiler] = None,
+) -> str:
+    """Generate a single project on disk and return its path."""
+    template, context = prepare_project(
+        template_dir,
+        output_dir=output_dir,
+        no_input=no_input,
+        replay=replay,
+        config_file=config_file,
+        extra_context=extra_context,
+        use_cache=use_cache,
+        profiler=profiler,
+    )
+    return template.generate(
+        context,
+        output_dir=output_dir,
+        overwrite_if_exists=overwrite_if_exists,
+        skip_if_file_exists=skip_if_file_exists,
+    )
+
+
+def update_project(
+    template_dir: str,
+    output_dir: str = ".",
+    no_input: bool = False,
+    replay: bool = False,
+    config_file: Optional[str] = None,
+    extra_context: Optional[dict[str, Any]] = None,
+    use_cache: bool = True,
+    profiler: Optional[Profiler] = None,
+) -> UpdateReport:
+    """Regenerate a project in place, writing only the files that changed."""
+    template, context = prepare_project(
+        template_dir,
+        output_dir=output_dir,
+        no_input=no_input,
+        replay=replay,
+        config_file=config_file,
+        extra_context=extra_context,
+        use_cache=use_cache,
+        profiler=profiler,
+    )
+    return template.update(context, output_dir=output_dir)
+
+
+@functools.cache
+def get_default_template() -> ProjectTemplate:
+    """Return the bundled template, loaded once per process."""
+    return ProjectTemplate(str(Path(__file__).parent.parent))
+
+
+def resolve_values(template: ProjectTemplate, values: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+    """Resolve template variables against the defaults without prompting or user config."""
+    context = template.resolve_context(get_user_config(default_config=True), extra_context=values, no_input=True)
+    errors = validate_context(context["cookiecutter"])
+    if errors:
+        raise ContextValidationError(errors)
+    return context
+
+
+def iter_project(
+    values: Optional[dict[str, Any]] = None, template: Optional[ProjectTemplate] = None
+) -> Iterator[RenderedFile]:
+    """Render a project in memory, yielding one file at a time.
+
+    ``values`` overrides the defaults from ``cookiecutter.json``, like
+    ``extra_context`` does for cookiecutter. Only the file being yielded is
+    held in memory.
+    """
+    template = template or get_default_template()
+    return template.iter_files(resolve_values(template, values))
+
+
+def render_project(
+    values: Optional[dict[str, Any]] = None, template: Optional[ProjectTemplate] = None
+) -> dict[str, bytes]:
+    """Render a project in memory and return its files keyed by project-relative path."""
+    return {rendered_file.path: rendered_file.content for rendered_file in iter_project(values, template)}
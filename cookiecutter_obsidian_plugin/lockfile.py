@@ -0,0 +1,150 @@
+"""Pre-resolved ``package-lock.json`` files for generated projects.
+
+The npm dependencies of a project only depend on ``enable_vitest`` and on
+whether i18n uses i18next, so the resolved packages of each combination are
+stored as a lock fragment under :data:`LOCKFILE_DIR`: an npm v3 lockfile without its
+root entry. At generation time the root entry is built from the rendered
+``package.json`` and joined with the fragment, so the project can run
+``npm ci`` and the CI npm cache has a lockfile to key on.
+
+Fragments are produced with npm by ``scripts/update_lockfiles.py``. A
+combination without a fragment simply gets no lockfile.
+
+Fragments resolve packages from the public registry. A project generated with
+an npm mirror (the private ``_npm_mirror`` variable) gets ``resolved`` URLs
+pointing at that registry instead, or, when the mirror is a directory of
+``npm pack`` tarballs, ``file:`` entries into it, so ``npm ci`` never has to
+reach registry.npmjs.org.
+"""
+
+import functools
+import json
+import pathlib
+import posixpath
+from typing import Any, Optional, Union
+
+LOCKFILE_NAME = "package-lock.json"
+LOCKFILE_VERSION = 3
+LOCKFILE_DIR = pathlib.Path(__file__).parent / "lockfiles"
+
+# Fields of package.json that npm copies into the root entry of the lockfile.
+ROOT_FIELDS = (
+    "name",
+    "version",
+    "license",
+    "dependencies",
+    "devDependencies",
+    "optionalDependencies",
+    "peerDependencies",
+    "engines",
+    "bin",
+)
+DEPENDENCY_FIELDS = ("dependencies", "devDependencies", "optionalDependencies")
+PUBLIC_REGISTRY = "https://registry.npmjs.org/"
+
+
+def is_registry_url(mirror: str) -> bool:
+    """Return whether an npm mirror is a registry URL rather than a tarball directory."""
+    return mirror.startswith(("http://", "https://"))
+
+
+def tarball_name(resolved: str) -> str:
+    """Return the ``npm pack`` file name of a tarball URL from the public registry.
+
+    ``.../@scope/name/-/name-1.0.0.tgz`` is packed as ``scope-name-1.0.0.tgz``.
+    """
+    package_path, _, file_name = resolved[len(PUBLIC_REGISTRY) :].partition("/-/")
+    if package_path.startswith("@"):
+        return f"{posixpath.dirname(package_path)[1:]}-{file_name}"
+    return file_name
+
+
+def mirror_resolved(resolved: str, mirror: str) -> str:
+    """Point a ``resolved`` URL from the public registry at ``mirror``; other URLs are kept."""
+    if not mirror or not resolved.startswith(PUBLIC_REGISTRY):
+        return resolved
+    if is_registry_url(mirror):
+        return mirror.rstrip("/") + "/" + resolved[len(PUBLIC_REGISTRY) :]
+    return "file:" + (pathlib.Path(mirror) / tarball_name(resolved)).as_posix()
+
+
+def fragment_name(values: dict[str, Any]) -> str:
+    """Return the file name of the lock fragment for the features in ``values``.
+
+    Only i18next adds a dependency, so i18n with the ``minimal`` engine shares
+    the fragment of projects without i18n.
+    """
+    i18next = str(values["enable_i18n"]).lower() == "yes" and str(values.get("i18n_engine", "i18next")) == "i18next"
+    return f"vitest-{values['enable_vitest']}-i18n-{'yes' if i18next else 'no'}.json".lower()
+
+
+@functools.cache
+def _read_fragment(path: pathlib.Path, mtime_ns: int) -> dict[str, Any]:  # noqa: ARG001
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_fragment(values: dict[str, Any], fragment_dir: Optional[pathlib.Path] = None) -> Optional[dict[str, Any]]:
+    """Return the stored lock fragment for ``values``, or ``None`` if there is none.
+
+    Fragments are parsed once per process, keyed on their modification time.
+    """
+    path = (fragment_dir or LOCKFILE_DIR) / fragment_name(values)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read_fragment(path, mtime_ns)
+
+
+def build_lockfile(package_json: bytes, fragment: dict[str, Any], mirror: str = "") -> bytes:
+    """Join the root entry of a rendered ``package.json`` with a lock fragment.
+
+    With a ``mirror`` the ``resolved`` entries are rewritten by
+    :func:`mirror_resolved`; integrity hashes stay as they are.
+
+    :raises ValueError: if the fragment does not resolve the exact versions
+        pinned in ``package.json``, e.g. after a dependency bump without
+        regenerating the fragments.
+    """
+    if fragment.get("lockfileVersion") != LOCKFILE_VERSION:
+        raise ValueError(f"Lock fragment has lockfileVersion {fragment.get('lockfileVersion')}, expected 3")
+
+    package = json.loads(package_json)
+    packages = fragment["packages"]
+    for field in DEPENDENCY_FIELDS:
+        for name, spec in package.get(field, {}).items():
+            resolved = packages.get(f"node_modules/{name}", {}).get("version")
+            if resolved != spec:
+                raise ValueError(f"Lock fragment resolves {name} to {resolved}, but package.json pins {spec}")
+    if mirror:
+        packages = {
+            key: {**entry, "resolved": mirror_resolved(entry["resolved"], mirror)} if "resolved" in entry else entry
+            for key, entry in packages.items()
+        }
+
+    lockfile = {
+        "name": package["name"],
+        "version": package["version"],
+        "lockfileVersion": LOCKFILE_VERSION,
+        "requires": True,
+        "packages": {"": {key: package[key] for key in ROOT_FIELDS if key in package}, **packages},
+    }
+    return (json.dumps(lockfile, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def write_lockfile(
+    project_dir: Union[str, pathlib.Path],
+    values: dict[str, Any],
+    fragment_dir: Optional[pathlib.Path] = None,
+) -> bool:
+    """Write ``package-lock.json`` next to a generated ``package.json``.
+
+    Returns whether a lockfile was written.
+    """
+    fragment = load_fragment(values, fragment_dir)
+    if fragment is None:
+        return False
+    project = pathlib.Path(project_dir)
+    package_json = (project / "package.json").read_bytes()
+    (project / LOCKFILE_NAME).write_bytes(build_lockfile(package_json, fragment, values.get("_npm_mirror", "")))
+    return True
@@ -0,0 +1,110 @@
+"""Timing of generation phases for ``--profile``.
+
+Code that generates projects wraps each phase in ``profiler.span(category,
+name)``. By default it is handed :data:`NULL_PROFILER`, whose spans are a
+shared no-op context manager, so nothing is timed or stored unless a
+:class:`Profiler` is passed in.
+"""
+
+import contextlib
+import json
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Union
+
+# Display order of the categories in the summary table.
+CATEGORIES = ("setup", "context", "hook", "render", "check", "write", "prune")
+
+
+@dataclass(frozen=True)
+class Span:
+    """One timed phase, in seconds since the profiler was created."""
+
+    category: str
+    name: str
+    start: float
+    duration: float
+
+
+class Profiler:
+    """Record the time spent in each phase and each file of a generation run."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, category: str, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.spans.append(Span(category, name, start - self._origin, end - start))
+
+    def totals(self) -> dict[str, tuple[int, float, float]]:
+        """Return ``(count, total, max)`` seconds per category, in display order."""
+        totals: dict[str, tuple[int, float, float]] = {}
+        for span in self.spans:
+            count, total, longest = totals.get(span.category, (0, 0.0, 0.0))
+            totals[span.category] = (count + 1, total + span.duration, max(longest, span.duration))
+        order = {category: index for index, category in enumerate(CATEGORIES)}
+        return dict(sorted(totals.items(), key=lambda item: order.get(item[0], len(order))))
+
+    def summary(self, slowest: int = 5) -> str:
+        """Format the per-category totals and the slowest files as a table."""
+        lines = [f"{'Phase':<10} {'Count':>6} {'Total ms':>10} {'Mean ms':>10} {'Max ms':>10}"]
+        for category, (count, total, longest) in self.totals().items():
+            lines.append(
+                f"{category:<10} {count:>6} {total * 1000:>10.2f} {total / count * 1000:>10.2f} {longest * 1000:>10.2f}"
+            )
+        if self.spans:
+            wall = max(span.start + span.duration for span in self.spans)
+            lines.append(f"{'wall time':<10} {'':>6} {wall * 1000:>10.2f}")
+
+        per_file = [span for span in self.spans if span.category in ("render", "write")]
+        if per_file:
+            lines.append("")
+            lines.append("Slowest files:")
+            for span in sorted(per_file, key=lambda span: span.duration, reverse=True)[:slowest]:
+                lines.append(f"  {span.category:<7} {span.duration * 1000:>8.2f} ms  {span.name}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Return the spans in the Chrome trace event format (``chrome://tracing``, Perfetto)."""
+        pid = os.getpid()
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round(span.start * 1_000_000, 3),
+                    "dur": round(span.duration * 1_000_000, 3),
+                    "pid": pid,
+                    "tid": 0,
+                }
+                for span in self.spans
+            ],
+        }
+
+    def write_trace(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps(self.chrome_trace(), indent=2) + "\n", encoding="utf-8")
+
+
+class NullProfiler:
+    """Profiler that records nothing; the default for all generation code."""
+
+    spans: tuple[Span, ...] = ()
+
+    def span(self, category: str, name: str) -> contextlib.AbstractContextManager[None]:  # noqa: ARG002
+        return _NO_SPAN
+
+
+_NO_SPAN = contextlib.nullcontext()
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,83 @@
+"""Files that belong to optional template features.
+
+The CLI skips these paths while rendering, and ``hooks/post_gen_project.py``
+removes them after plain ``cookiecutter`` runs of the template.
+"""
+
+import pathlib
+import shutil
+from collections.abc import Iterable
+from typing import Any, Union
+
+from cookiecutter_obsidian_plugin.profiling import NULL_PROFILER, NullProfiler, Profiler
+
+# Paths of the generated project, relative to its root, that are left out
+# when a template variable has the given value.
+FEATURE_PATHS: dict[tuple[str, str], tuple[str, ...]] = {
+    ("enable_vitest", "no"): ("vitest.config.ts", "tests"),
+    ("enable_i18n", "no"): ("src/i18n", "locales", "tests/i18n.test.ts", "compile-locales.mjs"),
+    ("deferred_startup", "no"): ("src/startup.ts", "tests/startup.test.ts"),
+    ("enable_perf", "no"): ("src/perf.ts", "tests/perf.test.ts"),
+    ("license", "none"): ("LICENSE",),
+    ("_npm_mirror", ""): (".npmrc",),
+}
+
+# Excluded files that projects commonly hold for their own reasons. They are
+# only removed while they start with the line the template writes first.
+GENERATED_HEADERS: dict[str, bytes] = {
+    ".npmrc": b"# Generated for installs without access to registry.npmjs.org.\n",
+}
+
+
+def remove_path(path: Union[str, pathlib.Path]) -> None:
+    if pathlib.Path(path).is_dir():
+        shutil.rmtree(path)
+    elif pathlib.Path(path).is_file():
+        pathlib.Path(path).unlink()
+
+
+def is_generated(project_dir: Union[str, pathlib.Path], path: str) -> bool:
+    """Return whether the excluded ``path`` may be removed from the project.
+
+    Files listed in :data:`GENERATED_HEADERS` must start with their header;
+    anything else the user wrote there is kept.
+    """
+    header = GENERATED_HEADERS.get(path)
+    if header is None:
+        return True
+    try:
+        with pathlib.Path(project_dir, path).open("rb") as file:
+            return file.read(len(header)) == header
+    except OSError:
+        return False
+
+
+def excluded_paths(values: dict[str, Any]) -> list[str]:
+    """Return the project paths of the features disabled in ``values``.
+
+    Variables missing from ``values``, e.g. in replay files written before the
+    variable was added, count as empty.
+    """
+    return [
+        path
+        for (key, disabled_value), paths in FEATURE_PATHS.items()
+        if str(values.get(key, "")).lower() == disabled_value
+        for path in paths
+    ]
+
+
+def is_excluded(path: str, excluded: Iterable[str]) -> bool:
+    """Return whether ``path`` is, or is inside, one of the ``excluded`` paths."""
+    return any(path == prefix or path.startswith(f"{prefix}/") for prefix in excluded)
+
+
+def prune_project(
+    project_dir: Union[str, pathlib.Path],
+    values: dict[str, Any],
+    profiler: Union[Profiler, NullProfiler] = NULL_PROFILER,
+) -> None:
+    """Remove the files of features disabled in ``values`` from a generated project."""
+    for path in excluded_paths(values):
+        with profiler.span("prune", path):
+            if is_generated(project_dir, path):
+                remove_path(pathlib.Path(project_dir, path))
@@ -0,0 +1,67 @@
+"""Structural checks of rendered JSON and YAML files.
+
+Parts of ``package.json`` and ``tsconfig.json`` are joined with Jinja
+conditionals around commas, so a template mistake would otherwise only show
+up when npm or GitHub Actions reads the file. The CLI checks every file as it
+is rendered, and ``hooks/post_gen_project.py`` checks the project after plain
+``cookiecutter`` runs of the template.
+"""
+
+import json
+import pathlib
+from typing import Union
+
+import yaml
+
+try:
+    # libyaml is much faster when it is available.
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+JSON_SUFFIXES = (".json",)
+YAML_SUFFIXES = (".yml", ".yaml")
+
+
+class InvalidFileError(ValueError):
+    """Raised when a rendered file does not parse, with the position of the problem."""
+
+    def __init__(self, path: str, line: int, column: int, problem: str) -> None:
+        super().__init__(f"{path}:{line}:{column}: {problem}")
+        self.path = path
+        self.line = line
+        self.column = column
+        self.problem = problem
+
+
+def check_content(path: str, content: bytes) -> None:
+    """Parse a rendered JSON or YAML file; other files are not checked.
+
+    :raises InvalidFileError: with the 1-based line and column of the first error.
+    """
+    suffix = pathlib.PurePosixPath(path).suffix.lower()
+    if suffix in JSON_SUFFIXES:
+        try:
+            json.loads(content.decode("utf-8"))
+        except json.JSONDecodeError as e:
+            raise InvalidFileError(path, e.lineno, e.colno, f"invalid JSON: {e.msg}") from e
+    elif suffix in YAML_SUFFIXES:
+        try:
+            yaml.load(content, Loader=SafeLoader)
+        except yaml.MarkedYAMLError as e:
+            mark = e.problem_mark or e.context_mark
+            line, column = (mark.line + 1, mark.column + 1) if mark else (1, 1)
+            raise InvalidFileError(path, line, column, f"invalid YAML: {e.problem or e.context}") from e
+
+
+def check_project(project_dir: Union[str, pathlib.Path]) -> list[str]:
+    """Check every JSON and YAML file of a generated project and return all errors."""
+    root = pathlib.Path(project_dir)
+    errors = []
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and path.suffix.lower() in JSON_SUFFIXES + YAML_SUFFIXES:
+            try:
+                check_content(path.relative_to(root).as_posix(), path.read_bytes())
+            except InvalidFileError as e:
+                errors.append(str(e))
+    return errors
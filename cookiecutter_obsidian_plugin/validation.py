@@ -0,0 +1,163 @@
+"""Validation of template variables.
+
+Used in-process by the CLI and by ``hooks/pre_gen_project.py`` when the
+template is run with plain ``cookiecutter``.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Callable
+
+from cookiecutter_obsidian_plugin.lockfile import fragment_name, is_registry_url, load_fragment
+
+
+class ContextValidationError(ValueError):
+    """Raised when one or more template variables are invalid."""
+
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+def validate_plugin_id(plugin_id: str) -> tuple[bool, str]:
+    """Validate plugin id for folder name and manifest id."""
+    if not plugin_id or not plugin_id.strip():
+        return False, "Plugin id cannot be empty"
+
+    if not re.match(r"^[a-z][a-z0-9-]*$", plugin_id.strip()):
+        return (
+            False,
+            "Plugin id must start with a letter and contain only lowercase letters, numbers, and hyphens",
+        )
+
+    return True, ""
+
+
+def validate_plugin_name(name: str) -> tuple[bool, str]:
+    """Validate plugin display name."""
+    if not name or not name.strip():
+        return False, "Plugin name cannot be empty"
+
+    if not re.match(r"^[a-zA-Z][a-zA-Z0-9\s\-_]*$", name.strip()):
+        return (
+            False,
+            "Plugin name must start with a letter and contain only letters, numbers, spaces, hyphens, and underscores",
+        )
+
+    return True, ""
+
+
+def validate_min_obsidian_version(version: str) -> tuple[bool, str]:
+    """Validate min Obsidian version string."""
+    if not version or not version.strip():
+        return False, "Minimum Obsidian version cannot be empty"
+
+    if not re.match(r"^\d+\.\d+\.\d+$", version.strip()):
+        return False, "Minimum Obsidian version must be in the format X.Y.Z"
+
+    return True, ""
+
+
+def validate_repo_url(url: str) -> tuple[bool, str]:
+    """Validate repository URL."""
+    if not url or not url.strip():
+        return False, "Repository URL cannot be empty"
+
+    if not re.match(r"^https://github\.com/", url.strip()):
+        return False, "Repository URL must be a GitHub HTTPS URL (https://github.com/...)"
+
+    return True, ""
+
+
+def validate_node_version(version: str) -> tuple[bool, str]:
+    """Validate Node.js version."""
+    if not version or not version.strip():
+        return False, "Node.js version cannot be empty"
+
+    if not re.match(r"^\d+$", version.strip()):
+        return False, "Node.js version must be a major version number (e.g., 20)"
+
+    return True, ""
+
+
+def validate_es_target(target: str) -> tuple[bool, str]:
+    """Validate the esbuild target of the generated build."""
+    if not re.match(r"^es20(1[5-9]|2[0-4])$", target.strip()):
+        return False, "ES target must be an esbuild target between es2015 and es2024 (e.g., es2022)"
+
+    return True, ""
+
+
+def _validate_kb(value: str, label: str) -> tuple[bool, str]:
+    if not re.match(r"^\d+$", value.strip()):
+        return False, f"{label} must be a whole number of KB (0 for no limit)"
+
+    return True, ""
+
+
+def validate_max_bundle_kb(value: str) -> tuple[bool, str]:
+    """Validate the main.js size budget."""
+    return _validate_kb(value, "Maximum main.js size")
+
+
+def validate_max_bundle_gzip_kb(value: str) -> tuple[bool, str]:
+    """Validate the gzipped main.js size budget."""
+    return _validate_kb(value, "Maximum gzipped main.js size")
+
+
+def validate_npm_mirror(mirror: str) -> tuple[bool, str]:
+    """Validate the optional npm registry mirror or tarball directory."""
+    if not mirror:
+        return True, ""
+
+    if re.match(r"^https?://", mirror):
+        return True, ""
+
+    if not Path(mirror).is_absolute() or not Path(mirror).is_dir():
+        return False, "npm mirror must be a registry URL (http:// or https://) or an existing absolute directory"
+
+    return True, ""
+
+
+def validate_mirror_lockfile(values: dict[str, Any]) -> tuple[bool, str]:
+    """Validate that a tarball directory mirror comes with a lockfile.
+
+    npm cannot resolve packages from a directory; only the ``file:`` entries
+    of the generated ``package-lock.json`` lead to the tarballs, and a
+    project only gets one from a stored lock fragment.
+    """
+    mirror = str(values.get("_npm_mirror", ""))
+    if not mirror or is_registry_url(mirror) or load_fragment(values) is not None:
+        return True, ""
+
+    return False, (
+        f"npm mirror directories need a stored lock fragment ({fragment_name(values)}), "
+        "which this template does not have; use a registry mirror URL instead"
+    )
+
+
+VALIDATORS: dict[str, Callable[[str], tuple[bool, str]]] = {
+    "plugin_id": validate_plugin_id,
+    "plugin_name": validate_plugin_name,
+    "min_obsidian_version": validate_min_obsidian_version,
+    "repo_url": validate_repo_url,
+    "node_version": validate_node_version,
+    "es_target": validate_es_target,
+    "max_bundle_kb": validate_max_bundle_kb,
+    "max_bundle_gzip_kb": validate_max_bundle_gzip_kb,
+    "_npm_mirror": validate_npm_mirror,
+}
+
+
+def validate_context(values: dict[str, Any]) -> list[str]:
+    """Validate template variables and return every error message found."""
+    errors = []
+    for key, validator in VALIDATORS.items():
+        is_valid, error_msg = validator(str(values.get(key, "")))
+        if not is_valid:
+            errors.append(error_msg)
+    if not errors:
+        is_valid, error_msg = validate_mirror_lockfile(values)
+        if not is_valid:
+            errors.append(error_msg)
+    return errors
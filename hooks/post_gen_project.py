@@ -1,29 +1,32 @@
-import pathlib
-import shutil
+import sys
 
+# The pruning, lockfile and checking logic lives in the package so the CLI can
+# run it in-process; this hook only covers plain ``cookiecutter`` runs of the template.
+sys.path.insert(0, r"{{ cookiecutter._repo_dir }}")
 
-def remove_path(path: str) -> None:
-    if pathlib.Path(path).is_dir():
-        shutil.rmtree(path)
-    elif pathlib.Path(path).is_file():
-        pathlib.Path(path).unlink()
+from cookiecutter_obsidian_plugin.lockfile import write_lockfile  # noqa: E402
+from cookiecutter_obsidian_plugin.pruning import prune_project  # noqa: E402
+from cookiecutter_obsidian_plugin.structure import check_project  # noqa: E402
 
 
 def main() -> None:
-    enable_vitest = "{{ cookiecutter.enable_vitest }}".lower() == "yes"
-    enable_i18n = "{{ cookiecutter.enable_i18n }}".lower() == "yes"
-    license_value = "{{ cookiecutter.license }}"
-
-    if not enable_vitest:
-        remove_path("vitest.config.ts")
-        remove_path("tests")
-
-    if not enable_i18n:
-        remove_path("src/i18n")
-        remove_path("locales")
-
-    if license_value == "none":
-        remove_path("LICENSE")
+    values = {
+        "enable_vitest": "{{ cookiecutter.enable_vitest }}",
+        "enable_i18n": "{{ cookiecutter.enable_i18n }}",
+        "i18n_engine": "{{ cookiecutter.i18n_engine }}",
+        "deferred_startup": "{{ cookiecutter.deferred_startup }}",
+        "enable_perf": "{{ cookiecutter.enable_perf }}",
+        "license": "{{ cookiecutter.license }}",
+        "_npm_mirror": r"{{ cookiecutter._npm_mirror }}",
+    }
+    prune_project(".", values)
+    write_lockfile(".", values)
+
+    errors = check_project(".")
+    for error_msg in errors:
+        sys.stderr.write(f"ERROR: {error_msg}\n")
+    if errors:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
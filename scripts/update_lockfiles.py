@@ -0,0 +1,61 @@
+"""Regenerate the lock fragments of the template with npm.
+
+Run after changing a dependency in ``{{cookiecutter.plugin_id}}/package.json``::
+
+    make lockfiles
+
+For every vitest/i18n combination the rendered ``package.json`` is resolved
+with ``npm install --package-lock-only`` (no packages are installed and no
+scripts run), and the lockfile without its root entry is stored under
+``cookiecutter_obsidian_plugin/lockfiles/``. npm uses its usual registry
+configuration.
+"""
+
+import itertools
+import json
+import subprocess  # noqa: S404
+import sys
+import tempfile
+from pathlib import Path
+
+from cookiecutter_obsidian_plugin.generator import get_default_template, resolve_values
+from cookiecutter_obsidian_plugin.lockfile import LOCKFILE_DIR, LOCKFILE_NAME, build_lockfile, fragment_name
+
+
+def render_package_json(values: dict) -> bytes:
+    """Render only ``package.json``; the stored fragment may be stale, so no lockfile is built."""
+    template = get_default_template()
+    files = template.iter_files(resolve_values(template, values), skip=lambda path: path != "package.json")
+    return next(files).content
+
+
+def resolve(package_json: bytes) -> dict:
+    """Return the npm lockfile resolved for ``package_json``."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        (Path(temp_dir) / "package.json").write_bytes(package_json)
+        subprocess.run(  # noqa: S603
+            ["npm", "install", "--package-lock-only", "--ignore-scripts", "--no-audit", "--no-fund"],  # noqa: S607
+            cwd=temp_dir,
+            check=True,
+        )
+        return json.loads((Path(temp_dir) / LOCKFILE_NAME).read_text(encoding="utf-8"))
+
+
+def main() -> None:
+    LOCKFILE_DIR.mkdir(exist_ok=True)
+    for vitest, i18n in itertools.product(("no", "yes"), ("no", "yes")):
+        values = {"enable_vitest": vitest, "enable_i18n": i18n}
+        package_json = render_package_json(values)
+        lockfile = resolve(package_json)
+
+        packages = {path: entry for path, entry in lockfile["packages"].items() if path}
+        fragment = {"lockfileVersion": lockfile["lockfileVersion"], "packages": packages}
+        build_lockfile(package_json, fragment)  # fails if npm resolved other versions than the pins
+
+        target = LOCKFILE_DIR / fragment_name(values)
+        target.write_text(json.dumps(fragment, indent=2) + "\n", encoding="utf-8")
+        sys.stdout.write(f"{target.relative_to(Path.cwd())}: {len(packages)} packages\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import pytest
+from helpers import ProjectCache
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cookiecutter_config(tmp_path_factory):
+    """Point cookiecutter at a config of this test session.
+
+    Replay files and the compiled template cache then go to a directory of the
+    session instead of the user's home, so parallel ``pytest -n`` workers never
+    write the same file.
+    """
+    home = tmp_path_factory.mktemp("cookiecutter-home")
+    config_file = home / "config.yml"
+    config_file.write_text(
+        f"cookiecutters_dir: {home / 'cookiecutters'}\nreplay_dir: {home / 'replay'}\n", encoding="utf-8"
+    )
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("COOKIECUTTER_CONFIG", str(config_file))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(home / "cache"))
+        yield config_file
+
+
+@pytest.fixture(scope="session")
+def project_cache(tmp_path_factory):
+    """Projects generated once per session (per worker with pytest-xdist)."""
+    cache = ProjectCache(tmp_path_factory.mktemp("projects"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def generated_project(project_cache):
+    """Return a function mapping a context to a shared, read-only generated project."""
+    return project_cache.get
@@ -1,7 +1,8 @@
 import shutil
+import stat
 import tempfile
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from cookiecutter.main import cookiecutter
 
@@ -92,6 +93,55 @@ def get_default_context() -> Dict[str, Any]:
         "license": "MIT",
         "repo_url": "https://github.com/test/test-plugin",
         "node_version": "20",
+        "es_target": "es2022",
         "enable_vitest": "no",
         "enable_i18n": "no",
+        "i18n_engine": "i18next",
+        "deferred_startup": "no",
+        "enable_perf": "no",
+        "max_bundle_kb": "256",
+        "max_bundle_gzip_kb": "64",
+        "_npm_mirror": "",
     }
+
+
+def freeze_context(extra_context: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    """Return a hashable key for a template context."""
+    return tuple(sorted((key, str(value)) for key, value in extra_context.items()))
+
+
+def set_read_only(path: Path, read_only: bool) -> None:
+    """Add or remove the write permission bits of a tree."""
+    for item in [path, *path.rglob("*")]:
+        mode = stat.S_IMODE(item.stat().st_mode)
+        item.chmod(mode & ~0o222 if read_only else mode | stat.S_IWUSR)
+
+
+class ProjectCache:
+    """
+    Generate each unique context once and share the project between tests.
+
+    Projects are made read-only so a test cannot change what the next one
+    sees; tests that modify the generated files must call
+    ``run_cookiecutter`` with their own output directory instead.
+    """
+
+    def __init__(self, base_dir: Path) -> None:
+        self.base_dir = base_dir
+        self.projects: Dict[Tuple[Tuple[str, str], ...], str] = {}
+
+    def get(self, extra_context: Dict[str, Any]) -> str:
+        """Return the path of the project generated for ``extra_context``."""
+        key = freeze_context(extra_context)
+        if key not in self.projects:
+            output_dir = self.base_dir / f"project-{len(self.projects)}"
+            output_dir.mkdir()
+            project_path = run_cookiecutter(get_template_dir(), dict(extra_context), output_dir=str(output_dir))
+            set_read_only(Path(project_path), True)
+            self.projects[key] = project_path
+        return self.projects[key]
+
+    def close(self) -> None:
+        """Make the shared projects writable again so they can be removed."""
+        for project_path in self.projects.values():
+            set_read_only(Path(project_path), False)
@@ -0,0 +1,102 @@
+import io
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from cookiecutter_obsidian_plugin.archive import write_archive
+from cookiecutter_obsidian_plugin.cli import main
+from cookiecutter_obsidian_plugin.generator import RenderedFile, render_project
+
+
+class _StreamOnly(io.RawIOBase):
+    """Write-only stream that refuses to seek, like a pipe."""
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.buffer.extend(data)
+        return len(data)
+
+
+def read_tar(data: bytes) -> dict:
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+        return {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+
+
+def read_zip(data: bytes) -> dict:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+class TestWriteArchive:
+    """Test writing rendered files into archives."""
+
+    @pytest.mark.parametrize("archive_format,reader", [("tar.gz", read_tar), ("zip", read_zip)])
+    def test_non_seekable_stream(self, archive_format, reader):
+        files = [RenderedFile("a.txt", b"first", 0o644), RenderedFile("src/b.ts", b"second", 0o755)]
+        stream = _StreamOnly()
+
+        count = write_archive(files, "my-plugin", archive_format, stream)
+
+        assert count == 2
+        assert reader(bytes(stream.buffer)) == {"my-plugin/a.txt": b"first", "my-plugin/src/b.ts": b"second"}
+
+    def test_preserves_mode(self):
+        stream = io.BytesIO()
+        write_archive([RenderedFile("run.sh", b"#!/bin/sh\n", 0o755)], "root", "tar.gz", stream)
+
+        with tarfile.open(fileobj=io.BytesIO(stream.getvalue()), mode="r:gz") as archive:
+            assert archive.getmember("root/run.sh").mode == 0o755
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            write_archive([], "root", "rar", io.BytesIO())
+
+
+class TestArchiveCommand:
+    """Test the --format CLI option."""
+
+    def test_tar_gz_to_stdout(self):
+        runner = CliRunner(mix_stderr=False)
+
+        result = runner.invoke(main, ["--no-input", "--format", "tar.gz"])
+
+        assert result.exit_code == 0, result.stderr
+        expected = {f"obsidian-plugin/{path}": content for path, content in render_project().items()}
+        assert read_tar(result.stdout_bytes) == expected
+        assert "written to stdout" in result.stderr
+
+    def test_zip_to_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            archive_path = Path(temp_dir) / "plugin.zip"
+
+            result = CliRunner().invoke(
+                main, ["--no-input", "--format", "zip", "--output-file", str(archive_path), "--output-dir", temp_dir]
+            )
+
+            assert result.exit_code == 0, result.output
+            files = read_zip(archive_path.read_bytes())
+            assert "obsidian-plugin/manifest.json" in files
+            assert "obsidian-plugin/tests/smoke.test.ts" not in files
+            assert sorted(p.name for p in Path(temp_dir).iterdir()) == ["plugin.zip"]
+
+    def test_stdout_requires_no_input(self):
+        result = CliRunner().invoke(main, ["--format", "zip"])
+
+        assert result.exit_code != 0
+        assert "requires --no-input or --replay" in result.output
+
+    def test_output_file_requires_format(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = CliRunner().invoke(main, ["--no-input", "--output-file", str(Path(temp_dir) / "plugin.zip")])
+
+            assert result.exit_code != 0
+            assert "--output-file requires --format" in result.output
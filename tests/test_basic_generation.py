@@ -1,113 +1,170 @@
+import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 from helpers import (
     assert_file_contains,
     assert_file_exists,
+    assert_file_not_contains,
     assert_file_not_exists,
-    cleanup_project,
     get_default_context,
     get_template_dir,
-    run_cookiecutter,
 )
 
+from cookiecutter_obsidian_plugin.generator import ProjectTemplate, load_config, render_project
+from cookiecutter_obsidian_plugin.pruning import excluded_paths
+
 
 class TestBasicGeneration:
-    def test_basic_project_generation(self):
+    def test_basic_project_generation(self, generated_project):
         """Test that a basic project is generated correctly."""
-        template_dir = get_template_dir()
-        context = get_default_context()
+        project_path = generated_project(get_default_context())
+
+        # Check that essential files exist
+        assert_file_exists(project_path, "manifest.json")
+        assert_file_exists(project_path, "package.json")
+        assert_file_exists(project_path, "README.md")
+        assert_file_exists(project_path, "LICENSE")
+        assert_file_exists(project_path, "src/main.ts")
+        assert_file_exists(project_path, "styles.css")
+        assert_file_exists(project_path, "versions.json")
+        assert_file_exists(project_path, "tsconfig.json")
+        assert_file_exists(project_path, "Makefile")
+
+        # Check manifest.json content
+        assert_file_contains(project_path, "manifest.json", '"id": "test-plugin"')
+        assert_file_contains(project_path, "manifest.json", '"name": "Test Plugin"')
+        assert_file_contains(project_path, "manifest.json", '"description": "A test plugin"')
+        assert_file_contains(project_path, "manifest.json", '"minAppVersion": "1.5.0"')
+
+        # Check package.json content
+        assert_file_contains(project_path, "package.json", '"name": "test-plugin"')
+        assert_file_contains(project_path, "package.json", '"description": "A test plugin"')
 
-        project_path = run_cookiecutter(template_dir, context)
-
-        try:
-            # Check that essential files exist
-            assert_file_exists(project_path, "manifest.json")
-            assert_file_exists(project_path, "package.json")
-            assert_file_exists(project_path, "README.md")
-            assert_file_exists(project_path, "LICENSE")
-            assert_file_exists(project_path, "src/main.ts")
-            assert_file_exists(project_path, "styles.css")
-            assert_file_exists(project_path, "versions.json")
-            assert_file_exists(project_path, "tsconfig.json")
-            assert_file_exists(project_path, "Makefile")
-
-            # Check manifest.json content
-            assert_file_contains(project_path, "manifest.json", '"id": "test-plugin"')
-            assert_file_contains(project_path, "manifest.json", '"name": "Test Plugin"')
-            assert_file_contains(project_path, "manifest.json", '"description": "A test plugin"')
-            assert_file_contains(project_path, "manifest.json", '"minAppVersion": "1.5.0"')
-
-            # Check package.json content
-            assert_file_contains(project_path, "package.json", '"name": "test-plugin"')
-            assert_file_contains(project_path, "package.json", '"description": "A test plugin"')
-
-            # Check README.md content
-            assert_file_contains(project_path, "README.md", "# Test Plugin")
-            assert_file_contains(project_path, "README.md", "A test plugin")
-
-            # Check LICENSE content
-            assert_file_contains(project_path, "LICENSE", "MIT License")
-            assert_file_contains(project_path, "LICENSE", "Test Author")
-        finally:
-            cleanup_project(project_path)
-
-    def test_project_with_vitest(self):
+        # Check README.md content
+        assert_file_contains(project_path, "README.md", "# Test Plugin")
+        assert_file_contains(project_path, "README.md", "A test plugin")
+
+        # Check LICENSE content
+        assert_file_contains(project_path, "LICENSE", "MIT License")
+        assert_file_contains(project_path, "LICENSE", "Test Author")
+
+    def test_project_with_vitest(self, generated_project):
         """Test project generation with Vitest enabled."""
-        template_dir = get_template_dir()
-        context = get_default_context()
-        context["enable_vitest"] = "yes"
-        project_path = run_cookiecutter(template_dir, context)
-        try:
-            assert_file_exists(project_path, "vitest.config.ts")
-            assert_file_exists(project_path, "tests/smoke.test.ts")
-            assert_file_contains(project_path, "package.json", '"test": "vitest run"')
-        finally:
-            cleanup_project(project_path)
-
-    def test_project_without_vitest(self):
+        project_path = generated_project({**get_default_context(), "enable_vitest": "yes"})
+
+        assert_file_exists(project_path, "vitest.config.ts")
+        assert_file_exists(project_path, "tests/smoke.test.ts")
+        assert_file_contains(project_path, "package.json", '"test": "vitest run"')
+
+    def test_project_without_vitest(self, generated_project):
         """Test project generation without Vitest."""
-        template_dir = get_template_dir()
-        context = get_default_context()
-        context["enable_vitest"] = "no"
-        project_path = run_cookiecutter(template_dir, context)
-        try:
-            assert_file_not_exists(project_path, "vitest.config.ts")
-            assert_file_not_exists(project_path, "tests")
-        finally:
-            cleanup_project(project_path)
+        project_path = generated_project({**get_default_context(), "enable_vitest": "no"})
+
+        assert_file_not_exists(project_path, "vitest.config.ts")
+        assert_file_not_exists(project_path, "tests")
 
-    def test_project_with_i18n(self):
+    def test_project_with_i18n(self, generated_project):
         """Test project generation with i18n enabled."""
-        template_dir = get_template_dir()
-        context = get_default_context()
-        context["enable_i18n"] = "yes"
-        project_path = run_cookiecutter(template_dir, context)
-        try:
-            assert_file_exists(project_path, "locales/en.json")
-            assert_file_exists(project_path, "src/i18n/index.ts")
-        finally:
-            cleanup_project(project_path)
-
-    def test_project_without_i18n(self):
+        project_path = generated_project({**get_default_context(), "enable_i18n": "yes"})
+
+        assert_file_exists(project_path, "locales/en.json")
+        assert_file_exists(project_path, "src/i18n/index.ts")
+
+    def test_project_without_i18n(self, generated_project):
         """Test project generation without i18n."""
-        template_dir = get_template_dir()
+        project_path = generated_project({**get_default_context(), "enable_i18n": "no"})
+
+        assert_file_not_exists(project_path, "locales")
+        assert_file_not_exists(project_path, "src/i18n")
+
+    def test_plugin_id_generation(self, generated_project):
+        """Test that plugin id is used for folder name."""
+        project_path = generated_project({**get_default_context(), "plugin_id": "my-awesome-plugin"})
+
+        assert Path(project_path).name == "my-awesome-plugin"
+        assert_file_contains(project_path, "manifest.json", '"id": "my-awesome-plugin"')
+
+
+class TestFeaturePruning:
+    """Test that disabled features are skipped instead of written and deleted."""
+
+    def test_excluded_paths(self):
         context = get_default_context()
-        context["enable_i18n"] = "no"
-        project_path = run_cookiecutter(template_dir, context)
-        try:
+        context["license"] = "none"
+
+        assert excluded_paths(context) == [
+            "vitest.config.ts",
+            "tests",
+            "src/i18n",
+            "locales",
+            "tests/i18n.test.ts",
+            "compile-locales.mjs",
+            "src/startup.ts",
+            "tests/startup.test.ts",
+            "src/perf.ts",
+            "tests/perf.test.ts",
+            "LICENSE",
+            ".npmrc",
+        ]
+
+        context.update(
+            enable_vitest="yes",
+            enable_i18n="yes",
+            deferred_startup="yes",
+            enable_perf="yes",
+            license="MIT",
+            _npm_mirror="https://npm.example.com/",
+        )
+        assert excluded_paths(context) == []
+
+    def test_disabled_features_are_never_rendered(self):
+        template = ProjectTemplate(get_template_dir())
+        context = template.resolve_context(load_config(), extra_context={"license": "none"}, no_input=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("cookiecutter_obsidian_plugin.generator.prune_project") as mock_prune:
+                with patch.object(template.env, "get_template", wraps=template.env.get_template) as get_template:
+                    project_path = template.generate(context, output_dir=temp_dir)
+
+            rendered = {call.args[0] for call in get_template.call_args_list}
+            assert "src/main.ts" in rendered
+            assert not rendered & {"vitest.config.ts", "tests/smoke.test.ts", "src/i18n/index.ts", "LICENSE"}
+            mock_prune.assert_called_once()
+            assert_file_not_exists(project_path, "tests")
             assert_file_not_exists(project_path, "locales")
             assert_file_not_exists(project_path, "src/i18n")
-        finally:
-            cleanup_project(project_path)
+            assert_file_not_exists(project_path, "LICENSE")
 
-    def test_plugin_id_generation(self):
-        """Test that plugin id is used for folder name."""
-        template_dir = get_template_dir()
-        context = get_default_context()
-        context["plugin_id"] = "my-awesome-plugin"
-        project_path = run_cookiecutter(template_dir, context)
-        try:
-            assert Path(project_path).name == "my-awesome-plugin"
-            assert_file_contains(project_path, "manifest.json", '"id": "my-awesome-plugin"')
-        finally:
-            cleanup_project(project_path)
+
+class TestDeferredStartup:
+    """Test the onload that defers its work until the workspace is ready."""
+
+    def test_project_with_deferred_startup(self, generated_project):
+        project_path = generated_project({**get_default_context(), "enable_vitest": "yes", "deferred_startup": "yes"})
+
+        assert_file_exists(project_path, "src/startup.ts")
+        assert_file_exists(project_path, "tests/startup.test.ts")
+        assert_file_exists(project_path, "tests/obsidian.ts")
+        assert_file_contains(project_path, "src/main.ts", "  onload() {\n")
+        assert_file_contains(project_path, "src/main.ts", "this.ready = new Startup(this)")
+        assert_file_contains(project_path, "tests/startup.test.ts", "ONLOAD_BUDGET_MS")
+        assert_file_contains(project_path, "vitest.config.ts", 'new URL("./tests/obsidian.ts", import.meta.url)')
+
+    def test_project_without_deferred_startup(self, generated_project):
+        project_path = generated_project({**get_default_context(), "enable_vitest": "yes"})
+
+        assert_file_not_exists(project_path, "src/startup.ts")
+        assert_file_not_exists(project_path, "tests/startup.test.ts")
+        assert_file_contains(project_path, "src/main.ts", "  async onload() {\n")
+        assert_file_not_contains(project_path, "src/main.ts", "Startup")
+
+    def test_i18n_initialization(self):
+        i18next = render_project({"enable_i18n": "yes", "i18n_engine": "i18next", "deferred_startup": "yes"})
+        minimal = render_project({"enable_i18n": "yes", "i18n_engine": "minimal", "deferred_startup": "yes"})
+
+        i18next_main = i18next["src/main.ts"].decode()
+        assert "await initI18n" in i18next_main.split(".afterLayout(async () => {")[1]
+        minimal_main = minimal["src/main.ts"].decode()
+        assert minimal_main.index("initI18n(moment.locale());") < minimal_main.index("new Startup(this)")
+        assert "await" not in minimal_main
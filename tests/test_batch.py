@@ -0,0 +1,203 @@
+import json
+import tempfile
+from pathlib import Path
+
+from click.testing import CliRunner
+from helpers import assert_file_contains, assert_file_exists, assert_file_not_exists
+
+from cookiecutter_obsidian_plugin.batch import load_batch_file
+from cookiecutter_obsidian_plugin.cli import main
+
+
+class TestLoadBatchFile:
+    """Test reading batch files."""
+
+    def test_load_json(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text(json.dumps([{"plugin_id": "first"}, {"plugin_id": "second"}]))
+
+            assert load_batch_file(batch_file) == [{"plugin_id": "first"}, {"plugin_id": "second"}]
+
+    def test_load_yaml_converts_booleans(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.yml"
+            batch_file.write_text("- plugin_id: first\n  enable_vitest: yes\n  enable_i18n: no\n  node_version: 22\n")
+
+            assert load_batch_file(batch_file) == [
+                {"plugin_id": "first", "enable_vitest": "yes", "enable_i18n": "no", "node_version": "22"}
+            ]
+
+    def test_load_rejects_non_list(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text(json.dumps({"plugin_id": "first"}))
+
+            try:
+                load_batch_file(batch_file)
+                raise AssertionError("Expected an error for a batch file without a list")
+            except ValueError as e:
+                assert "must contain a list" in str(e)
+
+
+class TestBatchCommand:
+    """Test the --batch CLI mode."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    def test_batch_generates_every_project(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text(
+                json.dumps(
+                    [
+                        {"plugin_id": "first-plugin", "enable_vitest": "yes"},
+                        {"plugin_id": "second-plugin", "enable_i18n": "yes", "license": "none"},
+                    ]
+                )
+            )
+            output_dir = Path(temp_dir) / "out"
+            output_dir.mkdir()
+
+            result = self.runner.invoke(main, ["--output-dir", str(output_dir), "--batch", str(batch_file)])
+
+            assert result.exit_code == 0, result.output
+            assert "2 of 2 projects created" in result.output
+
+            first = str(output_dir / "first-plugin")
+            assert_file_exists(first, "vitest.config.ts")
+            assert_file_contains(first, "manifest.json", '"id": "first-plugin"')
+
+            second = str(output_dir / "second-plugin")
+            assert_file_exists(second, "src/i18n/index.ts")
+            assert_file_not_exists(second, "LICENSE")
+
+    def test_batch_continues_after_failure(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text(
+                json.dumps(
+                    [
+                        {"plugin_id": "existing-plugin"},
+                        {"plugin_id": "valid-plugin"},
+                    ]
+                )
+            )
+            (Path(temp_dir) / "existing-plugin").mkdir()
+
+            result = self.runner.invoke(main, ["--output-dir", temp_dir, "--batch", str(batch_file)])
+
+            assert result.exit_code == 1
+            assert "failed  existing-plugin" in result.output
+            assert "already exists" in result.output
+            assert "ok      valid-plugin" in result.output
+            assert "1 of 2 projects created" in result.output
+            assert_file_exists(str(Path(temp_dir) / "valid-plugin"), "manifest.json")
+
+    def test_batch_validates_every_entry_before_generating(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text(
+                json.dumps(
+                    [
+                        {"plugin_id": "valid-plugin"},
+                        {"plugin_id": "Invalid_Id", "node_version": "v20"},
+                        {"plugin_id": "other-plugin", "license": "WTFPL"},
+                        {"plugin_id": "valid-plugin"},
+                    ]
+                )
+            )
+
+            result = self.runner.invoke(main, ["--output-dir", temp_dir, "--batch", str(batch_file)])
+
+            assert result.exit_code == 1
+            assert "Entry #1 (Invalid_Id): Plugin id must start with a letter" in result.output
+            assert "Entry #1 (Invalid_Id): Node.js version must be a major version number" in result.output
+            assert "Entry #2: " in result.output
+            assert "Entry #3 (valid-plugin): plugin id is already used by entry #0" in result.output
+            assert "Creating" not in result.output
+            assert sorted(p.name for p in Path(temp_dir).iterdir()) == ["batch.json"]
+
+    def test_batch_rejects_replay(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text("[]")
+
+            result = self.runner.invoke(main, ["--batch", str(batch_file), "--replay"])
+
+            assert result.exit_code != 0
+            assert "--batch cannot be combined with --replay" in result.output
+
+    def test_invalid_batch_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text("not json")
+
+            result = self.runner.invoke(main, ["--batch", str(batch_file)])
+
+            assert result.exit_code == 1
+            assert "Error reading batch file" in result.output
+
+
+def _snapshot(root: Path) -> dict:
+    return {
+        path.relative_to(root).as_posix(): (path.read_bytes(), path.stat().st_mode)
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+class TestParallelBatch:
+    """Test --jobs generation across worker processes."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    def test_parallel_output_matches_serial(self):
+        contexts = [
+            {"plugin_id": "mit-plain", "license": "MIT"},
+            {"plugin_id": "vitest-only", "enable_vitest": "yes", "license": "ISC"},
+            {"plugin_id": "i18n-only", "enable_i18n": "yes", "license": "none"},
+            {"plugin_id": "everything", "enable_vitest": "yes", "enable_i18n": "yes", "license": "GPL-3.0"},
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text(json.dumps(contexts))
+            serial_dir = Path(temp_dir) / "serial"
+            parallel_dir = Path(temp_dir) / "parallel"
+            serial_dir.mkdir()
+            parallel_dir.mkdir()
+
+            serial = self.runner.invoke(main, ["-o", str(serial_dir), "--batch", str(batch_file)])
+            parallel = self.runner.invoke(main, ["-o", str(parallel_dir), "--batch", str(batch_file), "--jobs", "3"])
+
+            assert serial.exit_code == 0, serial.output
+            assert parallel.exit_code == 0, parallel.output
+            assert len(list(parallel_dir.iterdir())) == len(contexts)
+            assert _snapshot(serial_dir) == _snapshot(parallel_dir)
+
+    def test_parallel_reports_errors_per_project(self):
+        contexts = [
+            {"plugin_id": "good-one"},
+            {"plugin_id": "bad-one"},
+            {"plugin_id": "good-two"},
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text(json.dumps(contexts))
+            (Path(temp_dir) / "bad-one").mkdir()
+
+            result = self.runner.invoke(main, ["-o", temp_dir, "--batch", str(batch_file), "-j", "2"])
+
+            assert result.exit_code == 1
+            assert "ok      good-one" in result.output
+            assert "failed  bad-one" in result.output
+            assert "ok      good-two" in result.output
+            assert "2 of 3 projects created" in result.output
+
+    def test_jobs_requires_batch(self):
+        result = self.runner.invoke(main, ["--no-input", "--jobs", "2"])
+
+        assert result.exit_code != 0
+        assert "--jobs can only be used with --batch" in result.output
@@ -0,0 +1,513 @@
+import json
+import os
+import shutil
+import subprocess  # noqa: S404
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+from unittest.mock import patch
+
+import pytest
+from helpers import assert_file_contains, get_default_context, get_template_dir, run_cookiecutter
+
+from cookiecutter_obsidian_plugin.generator import ProjectTemplate, load_config, render_project
+
+# Stands in for the esbuild package, which cannot be installed without network
+# access: records the build options, writes a main.js of random (barely
+# compressible) text and reports the modules given in ``esbuild-stub.json``.
+ESBUILD_STUB = """\
+import crypto from "crypto";
+import fs from "fs";
+
+const stub = JSON.parse(fs.readFileSync("esbuild-stub.json", "utf8"));
+
+export default {
+	async context(options) {
+		fs.writeFileSync("esbuild-options.json", JSON.stringify(options));
+		return {
+			async rebuild() {
+				const output = { bytes: 0, inputs: {} };
+				for (const [path, bytesInOutput] of Object.entries(stub.modules)) {
+					output.inputs[path] = { bytesInOutput };
+					output.bytes += bytesInOutput;
+				}
+				const code = crypto.randomBytes(output.bytes).toString("base64").slice(0, output.bytes);
+				fs.writeFileSync(options.outfile, code);
+				return { metafile: options.metafile ? { inputs: {}, outputs: { "main.js": output } } : undefined };
+			},
+			async watch() {},
+		};
+	},
+};
+"""
+
+requires_node = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+ESBUILD = os.environ.get("ESBUILD") or shutil.which("esbuild")
+requires_esbuild = pytest.mark.skipif(ESBUILD is None, reason="needs an esbuild binary ($ESBUILD or esbuild on PATH)")
+
+
+def stub_esbuild(project_path: str, modules: dict[str, int]) -> None:
+    """Install the esbuild stand-in into a generated project."""
+    package_dir = Path(project_path) / "node_modules" / "esbuild"
+    package_dir.mkdir(parents=True)
+    (package_dir / "package.json").write_text(json.dumps({"name": "esbuild", "type": "module", "main": "index.js"}))
+    (package_dir / "index.js").write_text(ESBUILD_STUB)
+    (Path(project_path) / "esbuild-stub.json").write_text(json.dumps({"modules": modules}))
+
+
+def generate(output_dir: str, **values: str) -> str:
+    return run_cookiecutter(get_template_dir(), {**get_default_context(), **values}, output_dir=output_dir)
+
+
+def run_build(project_path: str, mode: str, env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+    return subprocess.run(  # noqa: S603
+        ["node", "esbuild.config.mjs", mode],  # noqa: S607
+        cwd=project_path,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+class TestBundleAnalysis:
+    """Test the analyze build mode of the generated esbuild.config.mjs."""
+
+    def test_analyze_is_wired_up(self, generated_project):
+        project_path = generated_project(get_default_context())
+
+        assert_file_contains(project_path, "package.json", '"analyze": "node esbuild.config.mjs analyze"')
+        assert_file_contains(project_path, "Makefile", "analyze:\n\tnpm run analyze")
+        assert_file_contains(project_path, ".gitignore", "meta.json")
+        assert_file_contains(project_path, ".prettierignore", "meta.json")
+
+    @requires_node
+    def test_analyze_writes_metafile_and_lists_biggest_modules(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = run_cookiecutter(get_template_dir(), get_default_context(), output_dir=temp_dir)
+            stub_esbuild(project_path, {"src/main.ts": 2048, "node_modules/big/index.js": 30720, "src/util.ts": 100})
+
+            result = run_build(project_path, "analyze")
+
+            assert result.returncode == 0, result.stderr
+            meta = json.loads((Path(project_path) / "meta.json").read_text())
+            assert meta["outputs"]["main.js"]["bytes"] == 32868
+            options = json.loads((Path(project_path) / "esbuild-options.json").read_text())
+            assert options["minify"] is True
+            lines = result.stdout.splitlines()
+            assert "main.js: 32.1 KB from 3 modules" in lines
+            listed = [line.split()[-1] for line in lines if line.endswith((".ts", ".js"))]
+            assert listed == ["node_modules/big/index.js", "src/main.ts", "src/util.ts"]
+
+    @requires_node
+    def test_production_build_writes_no_metafile(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = run_cookiecutter(get_template_dir(), get_default_context(), output_dir=temp_dir)
+            stub_esbuild(project_path, {"src/main.ts": 2048})
+
+            result = run_build(project_path, "production")
+
+            assert result.returncode == 0, result.stderr
+            assert not (Path(project_path) / "meta.json").exists()
+
+
+@requires_node
+class TestBundleBudget:
+    """Test the main.js size budget checked by production builds."""
+
+    def test_within_budget(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, max_bundle_kb="64", max_bundle_gzip_kb="64")
+            stub_esbuild(project_path, {"src/main.ts": 20 * 1024})
+
+            result = run_build(project_path, "production")
+
+            assert result.returncode == 0, result.stderr
+            assert "main.js raw: 20.0 KB (budget: 64 KB) ok" in result.stdout
+
+    def test_raw_budget_exceeded_lists_modules(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, max_bundle_kb="16", max_bundle_gzip_kb="0")
+            stub_esbuild(project_path, {"src/main.ts": 4 * 1024, "node_modules/big/index.js": 16 * 1024})
+
+            result = run_build(project_path, "production")
+
+            assert result.returncode == 1
+            assert "main.js raw: 20.0 KB (budget: 16 KB) OVER BUDGET" in result.stdout
+            assert "main.js gzip:" in result.stdout
+            assert "(budget: no limit) ok" in result.stdout
+            assert result.stdout.index("node_modules/big/index.js") < result.stdout.index("src/main.ts")
+            assert "exceeds its size budget" in result.stderr
+
+    def test_gzip_budget_exceeded(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, max_bundle_kb="0", max_bundle_gzip_kb="8")
+            stub_esbuild(project_path, {"src/main.ts": 20 * 1024})
+
+            result = run_build(project_path, "production")
+
+            assert result.returncode == 1
+            assert "(budget: 8 KB) OVER BUDGET" in result.stdout
+
+    def test_analyze_reports_but_does_not_fail(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, max_bundle_kb="16")
+            stub_esbuild(project_path, {"src/main.ts": 20 * 1024})
+
+            result = run_build(project_path, "analyze")
+
+            assert result.returncode == 0, result.stderr
+            assert "OVER BUDGET" in result.stdout
+
+
+class TestEsTarget:
+    """Test the esbuild target derived from the minimum Obsidian version."""
+
+    @pytest.mark.parametrize(
+        ("min_obsidian_version", "target"),
+        [("0.15.9", "es2018"), ("1.0.0", "es2020"), ("1.4.16", "es2020"), ("1.5.0", "es2022"), ("1.8.7", "es2022")],
+    )
+    def test_target_follows_min_obsidian_version(self, min_obsidian_version, target):
+        files = render_project({"min_obsidian_version": min_obsidian_version})
+
+        assert f'target: "{target}",' in files["esbuild.config.mjs"].decode()
+
+    def test_explicit_target_wins(self):
+        files = render_project({"min_obsidian_version": "1.5.0", "es_target": "es2018"})
+
+        assert 'target: "es2018",' in files["esbuild.config.mjs"].decode()
+
+    def test_replay_without_es_target_derives_it(self):
+        template = ProjectTemplate(get_template_dir())
+        config = load_config()
+        context = template.resolve_context(config, extra_context={"min_obsidian_version": "1.1.0"}, no_input=True)
+        del context["cookiecutter"]["es_target"]
+        template.save_replay(config, context)
+
+        # Accept the suggested default when asked for the missing variable.
+        with patch("cookiecutter.prompt.read_user_variable", lambda _key, default, *_args: default):
+            replayed = template.resolve_context(config, replay=True)
+
+        assert replayed["cookiecutter"]["es_target"] == "es2020"
+
+
+class TestMinimalI18n:
+    """Test the built-in translator that replaces i18next."""
+
+    def test_no_i18next_dependency(self):
+        files = render_project({"enable_i18n": "yes", "i18n_engine": "minimal"})
+
+        assert "dependencies" not in json.loads(files["package.json"])
+        assert 'from "i18next"' not in files["src/i18n/index.ts"].decode()
+        assert "    initI18n(userLocale);\n" in files["src/main.ts"].decode()
+
+    def test_i18next_engine_is_awaited(self):
+        files = render_project({"enable_i18n": "yes", "enable_vitest": "yes", "i18n_engine": "i18next"})
+
+        assert "await initI18n(userLocale);" in files["src/main.ts"].decode()
+        assert 'await initI18n("en");' in files["tests/i18n.test.ts"].decode()
+
+    @requires_node
+    @requires_esbuild
+    def test_translations(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_i18n="yes", i18n_engine="minimal")
+            project = Path(project_path)
+            messages = {
+                "plugin_loaded": "Plugin loaded",
+                "key_0": "en translation 0",
+                "greeting": "Hello, {{ name }}!",
+                "file_zero": "no files",
+                "file_one": "{{count}} file",
+                "file_other": "{{count}} files",
+            }
+            write_locale(project_path, "en", messages)
+            add_locale(project_path, "ru", 1)
+            compile_locales(project_path)
+            (project / "check.ts").write_text(
+                'import { initI18n, setLocale, t } from "./src/i18n";\n'
+                'initI18n("ru");\n'
+                'const out = [t("key_0"), t("greeting", { name: "Ann" }), t("greeting"), t("missing")];\n'
+                'setLocale("en");\n'
+                'for (const count of [0, 1, 2]) out.push(t("file", { count }));\n'
+                "console.log(JSON.stringify(out));\n",
+                encoding="utf-8",
+            )
+            subprocess.run(  # noqa: S603
+                [ESBUILD, "check.ts", "--bundle", "--platform=node", "--outfile=check.js", "--log-level=warning"],
+                cwd=project_path,
+                check=True,
+            )
+            result = subprocess.run(
+                ["node", "check.js"],  # noqa: S607
+                cwd=project_path,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+
+        assert json.loads(result.stdout) == [
+            "ru translation 0",
+            "Hello, Ann!",
+            "Hello, {{name}}!",
+            "missing",
+            "no files",
+            "1 file",
+            "2 files",
+        ]
+
+
+def write_locale(project_path: str, locale: str, messages: dict[str, str]) -> int:
+    """Write a locale file of a generated project; return its minified size."""
+    translations = json.dumps(messages, ensure_ascii=False, separators=(",", ":"))
+    (Path(project_path) / "locales" / f"{locale}.json").write_text(translations, encoding="utf-8")
+    return len(translations.encode())
+
+
+def add_locale(project_path: str, locale: str, keys: int) -> int:
+    """Add a locale translating ``key_0`` and on to a generated project; return its minified size."""
+    return write_locale(project_path, locale, {f"key_{i}": f"{locale} translation {i}" for i in range(keys)})
+
+
+def compile_locales(project_path: str) -> subprocess.CompletedProcess:
+    """Run the generated project's locale compiler."""
+    return subprocess.run(
+        ["node", "compile-locales.mjs"],  # noqa: S607
+        cwd=project_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def bundle(project_path: str, *options: str) -> bytes:
+    """Bundle src/main.ts like a production build, leaving out the runtime dependencies."""
+    subprocess.run(  # noqa: S603
+        [ESBUILD, "src/main.ts", "--bundle", "--minify", "--format=cjs", "--target=es2022"]
+        + ["--external:obsidian", "--external:i18next", "--outfile=main.js", "--log-level=warning", *options],
+        cwd=project_path,
+        check=True,
+    )
+    return (Path(project_path) / "main.js").read_bytes()
+
+
+class TestLazyLocales:
+    """Test that locales other than the fallback are loaded on demand."""
+
+    def test_locale_files_are_not_imported(self, generated_project):
+        project_path = generated_project({**get_default_context(), "enable_i18n": "yes"})
+
+        index = (Path(project_path) / "src" / "i18n" / "index.ts").read_text()
+        assert [line for line in index.splitlines() if line.startswith("import ")] == [
+            'import i18next from "i18next";',
+            'import { FALLBACK_LOCALE, loaders, type MessageKey } from "./messages";',
+        ]
+        assert "addResourceBundle(locale" in index
+
+    def test_i18n_tests_need_vitest_and_i18n(self, generated_project):
+        with_both = generated_project({**get_default_context(), "enable_vitest": "yes", "enable_i18n": "yes"})
+        vitest_only = generated_project({**get_default_context(), "enable_vitest": "yes"})
+
+        assert (Path(with_both) / "tests" / "i18n.test.ts").exists()
+        assert not (Path(vitest_only) / "tests" / "i18n.test.ts").exists()
+
+    @requires_node
+    @requires_esbuild
+    def test_main_js_growth_per_locale(self, record_property):
+        """Each locale adds exactly one loader, returning its translations as an object literal, to main.js."""
+        keys = 50
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_i18n="yes")
+            english = {f"key_{i}": f"en translation {i}" for i in range(keys)}
+            write_locale(project_path, "en", {"plugin_loaded": "Plugin loaded", **english})
+            compile_locales(project_path)
+            sizes = [len(bundle(project_path))]
+            for locale in ("de", "fr", "ja", "ru"):
+                add_locale(project_path, locale, keys)
+                compile_locales(project_path)
+                code = bundle(project_path)
+                sizes.append(len(code))
+                # Built only when the loader is called, and bundled nowhere else.
+                messages = ",".join(f'key_{i}:"{locale} translation {i}"' for i in range(keys))
+                loader = f"{locale}:()=>({{{messages}}})".encode()
+                assert code.count(loader) == 1
+                assert code.count(f"{locale} translation 0".encode()) == 1
+                # The loader and the comma before it are all that main.js gains.
+                assert sizes[-1] - sizes[-2] == len(loader) + 1
+
+        record_property("main_js_bytes", sizes)
+
+
+class TestLocaleCompiler:
+    """Test compile-locales.mjs, which turns locales/*.json into src/i18n/messages.ts."""
+
+    @requires_node
+    @pytest.mark.parametrize("engine", ["i18next", "minimal"])
+    def test_generated_module_is_up_to_date(self, engine):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_i18n="yes", i18n_engine=engine)
+            messages = Path(project_path) / "src" / "i18n" / "messages.ts"
+            generated = messages.read_text()
+
+            result = compile_locales(project_path)
+
+            assert messages.read_text() == generated
+        assert result.stdout == result.stderr == ""
+
+    @requires_node
+    def test_keys_are_found_in_nested_sources(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_i18n="yes")
+            write_locale(project_path, "en", {"plugin_loaded": "Plugin loaded", "title": "Title", "hint": "Hint"})
+            views = Path(project_path, "src", "views", "settings")
+            views.mkdir(parents=True)
+            (views / "tab.ts").write_text('t("title");\n')
+            Path(project_path, "src", "i18n", "extra.ts").write_text('t("hint");\n')
+
+            result = compile_locales(project_path)
+
+        assert result.stderr == "locales: 1 key not used in src/: hint\n"
+
+    @requires_node
+    def test_keys_and_preparsed_messages(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_i18n="yes", i18n_engine="minimal")
+            write_locale(
+                project_path,
+                "en",
+                {
+                    "plugin_loaded": "Plugin loaded",
+                    "greeting": "Hello, {{ name }}!",
+                    "file_one": "{{count}} file",
+                    "file_other": "{{count}} files",
+                    "settings.title": "Settings",
+                },
+            )
+            write_locale(project_path, "ru", {"plugin_loaded": "Плагин загружен", "farewell": "Пока"})
+
+            result = compile_locales(project_path)
+            messages = (Path(project_path) / "src" / "i18n" / "messages.ts").read_text()
+
+        assert "export const Keys = {\n" in messages
+        for key in ("plugin_loaded", "greeting", "file"):
+            assert f'  {key}: "{key}",\n' in messages
+        assert '  "settings.title": "settings.title",\n' in messages
+        assert '    greeting: ["Hello, ", "name", "!"],\n' in messages
+        assert '    file_one: ["", "count", " file"],\n' in messages
+        assert '    plugin_loaded: "Плагин загружен",\n' in messages
+        assert "farewell" not in messages
+        assert result.stderr.splitlines() == [
+            "locales: ru lacks 3 keys, shown in en: greeting, file, settings.title",
+            "locales: ru has 1 key that en lacks: farewell",
+            "locales: 3 keys not used in src/: greeting, file, settings.title",
+        ]
+
+    @requires_node
+    def test_i18next_messages_stay_strings(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_i18n="yes", i18n_engine="i18next")
+            write_locale(project_path, "en", {"plugin_loaded": "Plugin loaded", "greeting": "Hello, {{name}}!"})
+            Path(project_path, "src", "main.ts").write_text('t(Keys.greeting); t("plugin_loaded");\n')
+
+            result = compile_locales(project_path)
+            messages = (Path(project_path) / "src" / "i18n" / "messages.ts").read_text()
+
+        assert '    greeting: "Hello, {{name}}!",\n' in messages
+        assert "export type Message = string;\n" in messages
+        assert result.stderr == ""
+
+    @requires_node
+    def test_build_compiles_the_locales(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_i18n="yes")
+            stub_esbuild(project_path, {"src/main.ts": 1000})
+            add_locale(project_path, "de", 1)
+
+            result = run_build(project_path, "production")
+            messages = (Path(project_path) / "src" / "i18n" / "messages.ts").read_text()
+
+        assert result.returncode == 0, result.stderr
+        assert "  de: () => ({\n  }),\n" in messages
+        assert "locales: de lacks 1 key, shown in en: plugin_loaded" in result.stderr
+
+    @requires_node
+    def test_invalid_locale_stops_the_build(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_i18n="yes")
+            stub_esbuild(project_path, {"src/main.ts": 1000})
+            (Path(project_path) / "locales" / "de.json").write_text('{"plugin_loaded": {"one": "x"}}')
+
+            result = run_build(project_path, "production")
+
+        assert result.returncode != 0
+        assert 'locales/de.json: the value of "plugin_loaded" must be a string' in result.stderr
+        assert not (Path(project_path) / "main.js").exists()
+
+    @requires_node
+    def test_undefined_key_stops_the_build(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_i18n="yes")
+            stub_esbuild(project_path, {"src/main.ts": 1000})
+            views = Path(project_path, "src", "views")
+            views.mkdir()
+            (views / "tab.ts").write_text(
+                't(Keys.plugin_loaded);\nt("plugin_loaded");\nt(`${prefix}_title`);\nt("plugin_lodaed");\n'
+            )
+
+            result = run_build(project_path, "production")
+
+        assert result.returncode != 0
+        assert 'src/views/tab.ts:4: t("plugin_lodaed") is not a key of locales/en.json' in result.stderr
+        assert "prefix" not in result.stderr
+        assert not (Path(project_path) / "main.js").exists()
+
+
+class TestPerf:
+    """Test the load-time instrumentation in src/perf.ts."""
+
+    def test_instrumentation_is_wired_up(self):
+        files = render_project({"enable_vitest": "yes", "enable_i18n": "yes", "enable_perf": "yes"})
+
+        main = files["src/main.ts"].decode()
+        assert 'import { instrumentPlugin, phase } from "./perf";' in main
+        assert 'await phase("i18n", () => initI18n(userLocale));' in main
+        assert main.endswith("if (__PERF__) {\n  instrumentPlugin(PluginMain);\n}\n")
+        assert '__PERF__: JSON.stringify(!prod || process.env.PERF === "1"),' in files["esbuild.config.mjs"].decode()
+        assert '__PERF__: "true"' in files["vitest.config.ts"].decode()
+        assert "tests/perf.test.ts" in files
+
+    def test_no_instrumentation_by_default(self):
+        files = render_project({"enable_vitest": "yes", "enable_i18n": "yes"})
+
+        assert "src/perf.ts" not in files
+        assert "tests/perf.test.ts" not in files
+        for path in ("src/main.ts", "esbuild.config.mjs", "vitest.config.ts"):
+            assert "__PERF__" not in files[path].decode()
+
+    @requires_node
+    @pytest.mark.parametrize(
+        ("mode", "env", "enabled"),
+        [("production", {}, False), ("production", {"PERF": "1"}, True), ("", {}, True)],
+    )
+    def test_build_defines_perf_flag(self, mode, env, enabled):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_perf="yes")
+            stub_esbuild(project_path, {"src/main.ts": 1000})
+
+            result = run_build(project_path, mode, env={"PERF": "", **env})
+            options = json.loads((Path(project_path) / "esbuild-options.json").read_text())
+
+        assert result.returncode == 0, result.stderr
+        assert options["define"] == {"__PERF__": json.dumps(enabled)}
+
+    @requires_esbuild
+    def test_production_bundle_leaves_instrumentation_out(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate(temp_dir, enable_perf="yes")
+            without = bundle(project_path, "--define:__PERF__=false")
+            instrumented = bundle(project_path, "--define:__PERF__=true")
+
+        assert b"show-load-times" not in without
+        assert b"performance.measure" not in without
+        assert b"show-load-times" in instrumented
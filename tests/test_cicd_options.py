@@ -2,63 +2,57 @@ from helpers import (
     assert_file_contains,
     assert_file_exists,
     assert_file_not_contains,
-    cleanup_project,
     get_default_context,
-    get_template_dir,
-    run_cookiecutter,
 )
 
 
 class TestCICDOptions:
     """Test CI/CD workflow generation."""
 
-    def test_ci_files_exist(self):
+    def test_ci_files_exist(self, generated_project):
         """Test GitHub workflow files exist."""
-        template_dir = get_template_dir()
-        context = get_default_context()
+        project_path = generated_project(get_default_context())
 
-        project_path = run_cookiecutter(template_dir, context)
+        # Check that GitHub Actions files exist
+        assert_file_exists(project_path, ".github/workflows/ci.yml")
+        assert_file_exists(project_path, ".github/workflows/release.yml")
+        assert_file_exists(project_path, ".github/dependabot.yml")
 
-        try:
-            # Check that GitHub Actions files exist
-            assert_file_exists(project_path, ".github/workflows/ci.yml")
-            assert_file_exists(project_path, ".github/workflows/release.yml")
-            assert_file_exists(project_path, ".github/dependabot.yml")
-        finally:
-            cleanup_project(project_path)
-
-    def test_ci_uses_node_version(self):
+    def test_ci_uses_node_version(self, generated_project):
         """Test that workflows use configured Node.js version."""
-        template_dir = get_template_dir()
-        context = get_default_context()
-        context["node_version"] = "22"
-        project_path = run_cookiecutter(template_dir, context)
-        try:
-            assert_file_contains(project_path, ".github/workflows/ci.yml", 'node-version: "22"')
-            assert_file_contains(project_path, ".github/workflows/release.yml", 'node-version: "22"')
-        finally:
-            cleanup_project(project_path)
+        project_path = generated_project({**get_default_context(), "node_version": "22"})
 
-    def test_ci_includes_tests_when_enabled(self):
-        """Test that CI includes tests when Vitest is enabled."""
-        template_dir = get_template_dir()
-        context = get_default_context()
-        context["enable_vitest"] = "yes"
+        assert_file_contains(project_path, ".github/workflows/ci.yml", 'node-version: "22"')
+        assert_file_contains(project_path, ".github/workflows/release.yml", 'node-version: "22"')
 
-        project_path = run_cookiecutter(template_dir, context)
+    def test_ci_includes_tests_when_enabled(self, generated_project):
+        """Test that CI includes tests when Vitest is enabled."""
+        project_path = generated_project({**get_default_context(), "enable_vitest": "yes"})
 
-        try:
-            assert_file_contains(project_path, ".github/workflows/ci.yml", "npm run test")
-        finally:
-            cleanup_project(project_path)
+        assert_file_contains(project_path, ".github/workflows/ci.yml", "npm run test")
 
-    def test_ci_skips_tests_when_disabled(self):
+    def test_ci_skips_tests_when_disabled(self, generated_project):
         """Test that CI skips tests when Vitest is disabled."""
-        template_dir = get_template_dir()
-        context = get_default_context()
-        context["enable_vitest"] = "no"
-        project_path = run_cookiecutter(template_dir, context)
-        try:
-            assert_file_not_contains(project_path, ".github/workflows/ci.yml", "npm run test")
-        finally:
-            cleanup_project(project_path)
+        project_path = generated_project({**get_default_context(), "enable_vitest": "no"})
+
+        assert_file_not_contains(project_path, ".github/workflows/ci.yml", "npm run test")
+
+    def test_ci_checks_bundle_size(self, generated_project):
+        """Test that CI fails when main.js exceeds its size budget."""
+        project_path = generated_project({**get_default_context(), "max_bundle_kb": "128"})
+
+        assert_file_contains(
+            project_path,
+            ".github/workflows/ci.yml",
+            "- name: Build and check the main.js size budget\n        run: npm run build",
+        )
+        assert_file_contains(project_path, "esbuild.config.mjs", "const budget = { raw: 128, gzip: 64 };")
+
+    def test_install_works_without_lockfile(self, generated_project):
+        """Test that workflows only use npm ci when the project has a package-lock.json."""
+        project_path = generated_project(get_default_context())
+
+        install = "- run: if [ -f package-lock.json ]; then npm ci; else npm install; fi\n"
+        assert_file_contains(project_path, ".github/workflows/ci.yml", install)
+        assert_file_contains(project_path, ".github/workflows/release.yml", install)
+        assert_file_contains(project_path, "Makefile", install.removeprefix("- run: "))
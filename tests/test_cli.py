@@ -53,11 +53,11 @@ class TestCLIMain:
         assert result.exit_code == 0
         assert "version" in result.output.lower()
 
-    @patch("cookiecutter_obsidian_plugin.cli.cookiecutter")
-    def test_basic_project_creation(self, mock_cookiecutter):
+    @patch("cookiecutter_obsidian_plugin.generator.generate_project")
+    def test_basic_project_creation(self, mock_generate_project):
         """Test basic project creation with default options."""
         with tempfile.TemporaryDirectory() as mock_project_dir:
-            mock_cookiecutter.return_value = mock_project_dir
+            mock_generate_project.return_value = mock_project_dir
 
         with tempfile.TemporaryDirectory() as temp_dir:
             result = self.runner.invoke(main, ["--output-dir", temp_dir, "--no-input"])
@@ -67,9 +67,9 @@ class TestCLIMain:
             assert "Project successfully created at:" in result.output
             assert "Next steps:" in result.output
 
-            # Verify cookiecutter was called with correct arguments
-            mock_cookiecutter.assert_called_once()
-            call_args = mock_cookiecutter.call_args
+            # Verify generate_project was called with correct arguments
+            mock_generate_project.assert_called_once()
+            call_args = mock_generate_project.call_args
 
             assert call_args[1]["output_dir"] == temp_dir
             assert call_args[1]["no_input"] is True
@@ -78,11 +78,11 @@ class TestCLIMain:
             assert call_args[1]["skip_if_file_exists"] is False
             assert call_args[1]["config_file"] is None
 
-    @patch("cookiecutter_obsidian_plugin.cli.cookiecutter")
-    def test_project_creation_with_all_flags(self, mock_cookiecutter):
+    @patch("cookiecutter_obsidian_plugin.generator.generate_project")
+    def test_project_creation_with_all_flags(self, mock_generate_project):
         """Test project creation with all CLI flags enabled."""
         with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as mock_project_dir:
-            mock_cookiecutter.return_value = mock_project_dir
+            mock_generate_project.return_value = mock_project_dir
             config_file = Path(temp_dir) / "config.yaml"
             config_file.write_text("test: config")
 
@@ -102,9 +102,9 @@ class TestCLIMain:
 
             assert result.exit_code == 0
 
-            # Verify cookiecutter was called with correct arguments
-            mock_cookiecutter.assert_called_once()
-            call_args = mock_cookiecutter.call_args
+            # Verify generate_project was called with correct arguments
+            mock_generate_project.assert_called_once()
+            call_args = mock_generate_project.call_args
 
             assert call_args[1]["output_dir"] == temp_dir
             assert call_args[1]["no_input"] is True
@@ -113,11 +113,11 @@ class TestCLIMain:
             assert call_args[1]["skip_if_file_exists"] is True
             assert call_args[1]["config_file"] == str(config_file)
 
-    @patch("cookiecutter_obsidian_plugin.cli.cookiecutter")
-    def test_project_creation_with_short_flags(self, mock_cookiecutter):
+    @patch("cookiecutter_obsidian_plugin.generator.generate_project")
+    def test_project_creation_with_short_flags(self, mock_generate_project):
         """Test project creation with short flags."""
         with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as mock_project_dir:
-            mock_cookiecutter.return_value = mock_project_dir
+            mock_generate_project.return_value = mock_project_dir
             result = self.runner.invoke(
                 main,
                 [
@@ -130,18 +130,18 @@ class TestCLIMain:
 
             assert result.exit_code == 0
 
-            # Verify cookiecutter was called with correct arguments
-            mock_cookiecutter.assert_called_once()
-            call_args = mock_cookiecutter.call_args
+            # Verify generate_project was called with correct arguments
+            mock_generate_project.assert_called_once()
+            call_args = mock_generate_project.call_args
 
             assert call_args[1]["output_dir"] == temp_dir
             assert call_args[1]["overwrite_if_exists"] is True
             assert call_args[1]["skip_if_file_exists"] is True
 
-    @patch("cookiecutter_obsidian_plugin.cli.cookiecutter")
-    def test_cookiecutter_error_handling(self, mock_cookiecutter):
-        """Test that cookiecutter errors are handled properly."""
-        mock_cookiecutter.side_effect = Exception("Test error")
+    @patch("cookiecutter_obsidian_plugin.generator.generate_project")
+    def test_cookiecutter_error_handling(self, mock_generate_project):
+        """Test that generation errors are handled properly."""
+        mock_generate_project.side_effect = Exception("Test error")
 
         with tempfile.TemporaryDirectory() as temp_dir:
             result = self.runner.invoke(main, ["--output-dir", temp_dir, "--no-input"])
@@ -165,36 +165,36 @@ class TestCLIMain:
         assert result.exit_code != 0
         assert "does not exist" in result.output.lower()
 
-    @patch("cookiecutter_obsidian_plugin.cli.cookiecutter")
-    def test_default_output_directory(self, mock_cookiecutter):
+    @patch("cookiecutter_obsidian_plugin.generator.generate_project")
+    def test_default_output_directory(self, mock_generate_project):
         """Test that default output directory is current working directory."""
         with tempfile.TemporaryDirectory() as mock_project_dir:
-            mock_cookiecutter.return_value = mock_project_dir
+            mock_generate_project.return_value = mock_project_dir
 
             result = self.runner.invoke(main, ["--no-input"])
 
             assert result.exit_code == 0
 
-            # Verify cookiecutter was called with current directory
-            mock_cookiecutter.assert_called_once()
-            call_args = mock_cookiecutter.call_args
+            # Verify generate_project was called with current directory
+            mock_generate_project.assert_called_once()
+            call_args = mock_generate_project.call_args
 
             # The output_dir should be the string representation of current directory
             assert Path(call_args[1]["output_dir"]).exists()
 
-    @patch("cookiecutter_obsidian_plugin.cli.cookiecutter")
-    def test_template_directory_is_correct(self, mock_cookiecutter):
-        """Test that the correct template directory is passed to cookiecutter."""
+    @patch("cookiecutter_obsidian_plugin.generator.generate_project")
+    def test_template_directory_is_correct(self, mock_generate_project):
+        """Test that the correct template directory is passed to generate_project."""
         with tempfile.TemporaryDirectory() as mock_project_dir:
-            mock_cookiecutter.return_value = mock_project_dir
+            mock_generate_project.return_value = mock_project_dir
 
             result = self.runner.invoke(main, ["--no-input"])
 
             assert result.exit_code == 0
 
-            # Verify cookiecutter was called with correct template directory
-            mock_cookiecutter.assert_called_once()
-            call_args = mock_cookiecutter.call_args
+            # Verify generate_project was called with correct template directory
+            mock_generate_project.assert_called_once()
+            call_args = mock_generate_project.call_args
 
             template_dir = call_args[0][0]  # First positional argument
             template_path = Path(template_dir)
@@ -203,12 +203,12 @@ class TestCLIMain:
             assert (template_path / "cookiecutter.json").exists()
             assert (template_path / "{{cookiecutter.plugin_id}}").exists()
 
-    @patch("cookiecutter_obsidian_plugin.cli.cookiecutter")
-    def test_output_messages(self, mock_cookiecutter):
+    @patch("cookiecutter_obsidian_plugin.generator.generate_project")
+    def test_output_messages(self, mock_generate_project):
         """Test that correct output messages are displayed."""
         with tempfile.TemporaryDirectory() as temp_dir:
             test_project_path = str(Path(temp_dir) / "my-test-project")
-            mock_cookiecutter.return_value = test_project_path
+            mock_generate_project.return_value = test_project_path
 
             result = self.runner.invoke(main, ["--no-input"])
 
@@ -354,6 +354,26 @@ default_context:
             finally:
                 cleanup_project(project_path)
 
+    def test_invalid_context_reports_all_errors(self):
+        """Test that every invalid value is reported before anything is written."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yml"
+            config_file.write_text("""
+default_context:
+  plugin_id: "Bad_Id"
+  repo_url: "https://gitlab.com/user/repo"
+""")
+
+            result = self.runner.invoke(
+                main, ["--output-dir", temp_dir, "--no-input", "--config-file", str(config_file)]
+            )
+
+            assert result.exit_code == 1
+            assert "Invalid template variables:" in result.output
+            assert "  - Plugin id must start with a letter" in result.output
+            assert "  - Repository URL must be a GitHub HTTPS URL" in result.output
+            assert [p.name for p in Path(temp_dir).iterdir()] == ["config.yml"]
+
     def test_real_project_generation_without_i18n(self):
         """Test real project generation without i18n."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -0,0 +1,89 @@
+import itertools
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from helpers import get_default_context, get_template_dir
+
+from cookiecutter_obsidian_plugin.batch import resolve_batch, run_batch
+from cookiecutter_obsidian_plugin.generator import ProjectTemplate, load_config
+
+JSON_FILES = ("package.json", "manifest.json", "versions.json")
+JINJA_MARKERS = ("{{", "}}", "{%", "%}", "{#", "#}")
+
+
+def feature_matrix() -> list:
+    """Return one context per license × vitest × i18n combination of ``cookiecutter.json``."""
+    choices = json.loads((Path(get_template_dir()) / "cookiecutter.json").read_text(encoding="utf-8"))
+    return [
+        {
+            **get_default_context(),
+            "plugin_id": f"matrix-{re.sub('[^a-z0-9]+', '-', license_name.lower())}-vitest-{vitest}-i18n-{i18n}",
+            "license": license_name,
+            "enable_vitest": vitest,
+            "enable_i18n": i18n,
+        }
+        for license_name, vitest, i18n in itertools.product(
+            choices["license"], choices["enable_vitest"], choices["enable_i18n"]
+        )
+    ]
+
+
+def check_project(project_path: Path) -> list:
+    """Return the problems found in one generated project."""
+    problems = []
+    for name in JSON_FILES:
+        try:
+            json.loads((project_path / name).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            problems.append(f"{name}: {e}")
+
+    for path in sorted(project_path.rglob("*")):
+        if not path.is_file():
+            continue
+        text = path.read_text(encoding="utf-8", errors="replace")
+        leftovers = [marker for marker in JINJA_MARKERS if marker in text]
+        if leftovers:
+            problems.append(f"{path.relative_to(project_path)}: leftover {', '.join(leftovers)}")
+    return problems
+
+
+class TestFeatureMatrix:
+    """Generate every feature combination of the template in parallel."""
+
+    def test_matrix_covers_every_combination(self):
+        matrix = feature_matrix()
+
+        assert len(matrix) == 24
+        assert len({context["plugin_id"] for context in matrix}) == len(matrix)
+
+    def test_every_combination_renders_cleanly(self):
+        template = ProjectTemplate(get_template_dir())
+        with tempfile.TemporaryDirectory() as temp_dir:
+            contexts, errors = resolve_batch(template, load_config(), feature_matrix(), temp_dir)
+            assert errors == []
+
+            results = run_batch(template, contexts, temp_dir, jobs=max(os.cpu_count() or 1, 2))
+
+            failures = [f"{result.plugin_id}: {result.error}" for result in results if not result.ok]
+            assert failures == []
+            problems = [
+                f"{result.plugin_id}/{problem}"
+                for result in results
+                for problem in check_project(Path(result.project_path))
+            ]
+            assert problems == [], "\n".join(problems)
+
+    def test_check_project_reports_leftovers(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            (project_path / "package.json").write_text('{"name": "{{cookiecutter.plugin_id}}"}')
+            (project_path / "manifest.json").write_text("{")
+            (project_path / "versions.json").write_text("{}")
+
+            problems = check_project(project_path)
+
+        assert problems[0].startswith("manifest.json: ")
+        assert problems[1] == "package.json: leftover {{, }}"
@@ -3,10 +3,7 @@ from helpers import (
     assert_file_contains,
     assert_file_exists,
     assert_file_not_exists,
-    cleanup_project,
     get_default_context,
-    get_template_dir,
-    run_cookiecutter,
 )
 
 
@@ -43,32 +40,20 @@ class TestLicenseOptions:
             ),
         ],
     )
-    def test_license_generation(self, license_type, license_text, version_text):
-        template_dir = get_template_dir()
-        context = get_default_context()
-        context["license"] = license_type
-        project_path = run_cookiecutter(template_dir, context)
+    def test_license_generation(self, generated_project, license_type, license_text, version_text):
+        project_path = generated_project({**get_default_context(), "license": license_type})
 
-        try:
-            assert_file_exists(project_path, "LICENSE")
+        assert_file_exists(project_path, "LICENSE")
 
-            assert_file_contains(project_path, "LICENSE", license_text)
-            assert_file_contains(project_path, "LICENSE", "Test Author")
-            assert_file_contains(project_path, "LICENSE", version_text)
+        assert_file_contains(project_path, "LICENSE", license_text)
+        assert_file_contains(project_path, "LICENSE", "Test Author")
+        assert_file_contains(project_path, "LICENSE", version_text)
 
-            assert_file_contains(project_path, "README.md", license_type)
-        finally:
-            cleanup_project(project_path)
+        assert_file_contains(project_path, "README.md", license_type)
 
-    def test_no_license(self):
-        template_dir = get_template_dir()
-        context = get_default_context()
-        context["license"] = "none"
-        project_path = run_cookiecutter(template_dir, context)
+    def test_no_license(self, generated_project):
+        project_path = generated_project({**get_default_context(), "license": "none"})
 
-        try:
-            assert_file_not_exists(project_path, "LICENSE")
+        assert_file_not_exists(project_path, "LICENSE")
 
-            assert_file_contains(project_path, "README.md", "No license.")
-        finally:
-            cleanup_project(project_path)
+        assert_file_contains(project_path, "README.md", "No license.")
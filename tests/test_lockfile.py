@@ -0,0 +1,323 @@
+import base64
+import hashlib
+import io
+import json
+import runpy
+import shutil
+import subprocess  # noqa: S404
+import tarfile
+import tempfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from helpers import get_template_dir, run_cookiecutter
+
+from cookiecutter_obsidian_plugin import lockfile
+from cookiecutter_obsidian_plugin.cli import main
+from cookiecutter_obsidian_plugin.generator import ProjectTemplate, generate_project, load_config, render_project
+from cookiecutter_obsidian_plugin.lockfile import (
+    build_lockfile,
+    fragment_name,
+    mirror_resolved,
+    tarball_name,
+    write_lockfile,
+)
+from cookiecutter_obsidian_plugin.pruning import prune_project
+
+
+def fake_fragment(package_json: bytes) -> dict:
+    """Return a fragment resolving exactly the pins of ``package_json``, as npm would."""
+    package = json.loads(package_json)
+    pins = {**package.get("dependencies", {}), **package.get("devDependencies", {})}
+    return {
+        "lockfileVersion": 3,
+        "packages": {
+            f"node_modules/{name}": {
+                "version": version,
+                "resolved": f"https://registry.npmjs.org/{name}/-/{name.split('/')[-1]}-{version}.tgz",
+                "integrity": "sha512-test",
+                "dev": name in package.get("devDependencies", {}),
+            }
+            for name, version in sorted(pins.items())
+        },
+    }
+
+
+@pytest.fixture
+def fragment_dir(monkeypatch):
+    """Store fragments for every vitest/i18n combination in a temporary directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.setattr(lockfile, "LOCKFILE_DIR", Path(temp_dir))
+        for vitest in ("no", "yes"):
+            for i18n in ("no", "yes"):
+                values = {"enable_vitest": vitest, "enable_i18n": i18n}
+                package_json = render_project(values)["package.json"]
+                (Path(temp_dir) / fragment_name(values)).write_text(json.dumps(fake_fragment(package_json)))
+        yield Path(temp_dir)
+
+
+class TestBuildLockfile:
+    """Test joining package.json with a lock fragment."""
+
+    def test_root_entry_comes_from_package_json(self):
+        package_json = render_project({"plugin_id": "tag-cleaner", "enable_i18n": "yes"})["package.json"]
+
+        lock = json.loads(build_lockfile(package_json, fake_fragment(package_json)))
+
+        assert lock["name"] == "tag-cleaner"
+        assert lock["lockfileVersion"] == 3
+        root = lock["packages"][""]
+        assert root["name"] == "tag-cleaner"
+        assert root["license"] == "MIT"
+        assert root["dependencies"] == {"i18next": json.loads(package_json)["dependencies"]["i18next"]}
+        assert "node_modules/i18next" in lock["packages"]
+
+    def test_stale_fragment_is_rejected(self):
+        package_json = render_project({"enable_i18n": "yes"})["package.json"]
+        fragment = fake_fragment(package_json)
+        fragment["packages"]["node_modules/i18next"]["version"] = "1.0.0"
+
+        with pytest.raises(ValueError, match="resolves i18next to 1.0.0"):
+            build_lockfile(package_json, fragment)
+
+    def test_fragment_name(self):
+        assert fragment_name({"enable_vitest": "yes", "enable_i18n": "no"}) == "vitest-yes-i18n-no.json"
+        assert fragment_name({"enable_vitest": "no", "enable_i18n": "yes"}) == "vitest-no-i18n-yes.json"
+
+    def test_minimal_i18n_engine_shares_the_fragment_without_i18n(self):
+        values = {"enable_vitest": "no", "enable_i18n": "yes", "i18n_engine": "minimal"}
+
+        assert fragment_name(values) == "vitest-no-i18n-no.json"
+
+
+class TestGeneratedLockfile:
+    """Test that projects get a package-lock.json when a fragment is stored."""
+
+    @pytest.mark.usefixtures("fragment_dir")
+    @pytest.mark.parametrize("vitest", ["no", "yes"])
+    @pytest.mark.parametrize("i18n", ["no", "yes"])
+    def test_lockfile_matches_package_json(self, vitest, i18n):
+        files = render_project({"enable_vitest": vitest, "enable_i18n": i18n})
+
+        lock = json.loads(files["package-lock.json"])
+        package = json.loads(files["package.json"])
+        assert lock["packages"][""]["devDependencies"] == package["devDependencies"]
+        assert ("node_modules/vitest" in lock["packages"]) == (vitest == "yes")
+        assert ("node_modules/i18next" in lock["packages"]) == (i18n == "yes")
+
+    @pytest.mark.usefixtures("fragment_dir")
+    def test_minimal_i18n_engine_locks_no_i18next(self):
+        files = render_project({"enable_i18n": "yes", "i18n_engine": "minimal"})
+
+        lock = json.loads(files["package-lock.json"])
+        assert "dependencies" not in lock["packages"][""]
+        assert "node_modules/i18next" not in lock["packages"]
+
+    def test_no_fragment_no_lockfile(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            monkeypatch.setattr(lockfile, "LOCKFILE_DIR", Path(temp_dir))
+
+            assert "package-lock.json" not in render_project()
+
+    @pytest.mark.usefixtures("fragment_dir")
+    def test_no_lockfile_when_package_json_is_kept(self):
+        template = ProjectTemplate(get_template_dir())
+        values = {"enable_vitest": "yes", "enable_i18n": "no"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(temp_dir) / "obsidian-plugin"
+            project.mkdir()
+            (project / "package.json").write_text("{}")
+            context = template.resolve_context(load_config(), extra_context=values, no_input=True)
+
+            template.generate(context, output_dir=temp_dir, overwrite_if_exists=True, skip_if_file_exists=True)
+
+            assert not (project / "package-lock.json").exists()
+            assert (project / "package.json").read_text() == "{}"
+            assert (project / "vitest.config.ts").exists()
+
+    def test_write_lockfile_for_hook(self, fragment_dir):
+        values = {"enable_vitest": "no", "enable_i18n": "no"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "package.json").write_bytes(render_project(values)["package.json"])
+
+            assert write_lockfile(temp_dir, values, fragment_dir)
+            assert json.loads((Path(temp_dir) / "package-lock.json").read_text())["lockfileVersion"] == 3
+            assert not write_lockfile(temp_dir, values, Path(temp_dir))
+
+
+def pack(tarball_dir: Path, name: str, version: str) -> str:
+    """Write a minimal ``npm pack`` tarball into ``tarball_dir`` and return its integrity."""
+    manifest = json.dumps({"name": name, "version": version, "main": "index.js"}).encode()
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for member, content in (("package/package.json", manifest), ("package/index.js", b"module.exports = 1;\n")):
+            info = tarfile.TarInfo(member)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    content = buffer.getvalue()
+    (tarball_dir / f"{name.lstrip('@').replace('/', '-')}-{version}.tgz").write_bytes(content)
+    return "sha512-" + base64.b64encode(hashlib.sha512(content).digest()).decode()
+
+
+class TestNpmMirror:
+    """Test projects generated for a registry mirror or a directory of tarballs."""
+
+    def test_tarball_name(self):
+        assert tarball_name("https://registry.npmjs.org/tslib/-/tslib-2.4.0.tgz") == "tslib-2.4.0.tgz"
+        assert tarball_name("https://registry.npmjs.org/@types/node/-/node-16.11.6.tgz") == "types-node-16.11.6.tgz"
+
+    def test_mirror_resolved(self):
+        resolved = "https://registry.npmjs.org/@types/node/-/node-16.11.6.tgz"
+
+        assert mirror_resolved(resolved, "") == resolved
+        assert (
+            mirror_resolved(resolved, "https://npm.example.com/repo")
+            == "https://npm.example.com/repo/@types/node/-/node-16.11.6.tgz"
+        )
+        assert mirror_resolved(resolved, "/srv/tarballs") == "file:/srv/tarballs/types-node-16.11.6.tgz"
+        assert mirror_resolved("https://example.com/x.tgz", "/srv/tarballs") == "https://example.com/x.tgz"
+
+    def test_no_npmrc_without_mirror(self):
+        assert ".npmrc" not in render_project()
+
+    @pytest.mark.usefixtures("fragment_dir")
+    def test_registry_mirror(self):
+        files = render_project({"_npm_mirror": "https://npm.example.com/repo/"})
+
+        assert "registry=https://npm.example.com/repo/\n" in files[".npmrc"].decode()
+        lock = json.loads(files["package-lock.json"])
+        resolved = [entry["resolved"] for key, entry in lock["packages"].items() if key]
+        assert resolved
+        assert all(url.startswith("https://npm.example.com/repo/") for url in resolved)
+
+    @pytest.mark.usefixtures("fragment_dir")
+    def test_tarball_directory(self):
+        with tempfile.TemporaryDirectory() as tarball_dir:
+            files = render_project({"_npm_mirror": tarball_dir})
+
+            assert "offline=true\n" in files[".npmrc"].decode()
+            lock = json.loads(files["package-lock.json"])
+            typescript = lock["packages"]["node_modules/typescript"]
+            assert (
+                typescript["resolved"] == f"file:{Path(tarball_dir).as_posix()}/typescript-{typescript['version']}.tgz"
+            )
+            assert typescript["integrity"] == "sha512-test"
+
+    def test_plain_cookiecutter_writes_npmrc(self):
+        mirror = "https://npm.example.com/"
+        with tempfile.TemporaryDirectory() as output_dir:
+            project_path = run_cookiecutter(get_template_dir(), {"_npm_mirror": mirror}, output_dir=output_dir)
+
+            files = render_project({"_npm_mirror": mirror})
+            assert (Path(project_path) / ".npmrc").read_bytes() == files[".npmrc"]
+
+    def test_user_npmrc_is_kept(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            project = Path(generate_project(get_template_dir(), output_dir=output_dir, no_input=True))
+            (project / ".npmrc").write_text("save-exact=true\n")
+
+            generate_project(get_template_dir(), output_dir=output_dir, no_input=True, overwrite_if_exists=True)
+            prune_project(project, {"_npm_mirror": ""})
+
+            assert (project / ".npmrc").read_text() == "save-exact=true\n"
+
+    def test_tarball_directory_without_fragment_is_rejected(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as fragment_dir, tempfile.TemporaryDirectory() as tarball_dir:
+            monkeypatch.setattr(lockfile, "LOCKFILE_DIR", Path(fragment_dir))
+
+            result = CliRunner().invoke(main, ["--no-input", "--output-dir", tarball_dir, "--npm-mirror", tarball_dir])
+
+        assert result.exit_code == 1
+        assert "npm mirror directories need a stored lock fragment (vitest-no-i18n-no.json)" in result.output
+
+    def test_hook_lockfile_uses_mirror(self, fragment_dir):
+        values = {"enable_vitest": "no", "enable_i18n": "no", "_npm_mirror": "https://npm.example.com/"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "package.json").write_bytes(render_project(values)["package.json"])
+
+            assert write_lockfile(temp_dir, values, fragment_dir)
+            lock = json.loads((Path(temp_dir) / "package-lock.json").read_text())
+            assert lock["packages"]["node_modules/typescript"]["resolved"].startswith("https://npm.example.com/")
+
+    def test_missing_directory_is_rejected(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = CliRunner().invoke(
+                main, ["--no-input", "--output-dir", temp_dir, "--npm-mirror", str(Path(temp_dir) / "missing")]
+            )
+
+        assert result.exit_code == 1
+        assert "npm mirror must be a registry URL" in result.output
+
+    @pytest.mark.usefixtures("fragment_dir")
+    def test_cli_makes_directory_absolute(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / "tarballs").mkdir()
+            monkeypatch.chdir(temp_dir)
+
+            result = CliRunner().invoke(main, ["--no-input", "--output-dir", temp_dir, "--npm-mirror", "tarballs"])
+
+            assert result.exit_code == 0, result.output
+            npmrc = (Path(temp_dir) / "obsidian-plugin" / ".npmrc").read_text()
+            assert f"tarball in {Path(temp_dir, 'tarballs').absolute()}" in npmrc
+
+    def test_replay_is_rejected(self):
+        result = CliRunner().invoke(main, ["--replay", "--npm-mirror", "https://npm.example.com/"])
+
+        assert result.exit_code == 2
+        assert "--npm-mirror cannot be combined with --replay" in result.output
+
+    @pytest.mark.skipif(shutil.which("npm") is None, reason="npm is not installed")
+    def test_generated_project_installs_from_tarball_directory(self, fragment_dir):
+        """``npm ci`` in a project generated with a tarball directory needs nothing but the tarballs."""
+        with tempfile.TemporaryDirectory() as tarball_dir, tempfile.TemporaryDirectory() as output_dir:
+            fragment_path = fragment_dir / fragment_name({"enable_vitest": "no", "enable_i18n": "no"})
+            fragment = json.loads(fragment_path.read_text())
+            for key, entry in fragment["packages"].items():
+                entry["integrity"] = pack(Path(tarball_dir), key.removeprefix("node_modules/"), entry["version"])
+            fragment_path.write_text(json.dumps(fragment))
+
+            result = CliRunner().invoke(main, ["--no-input", "--output-dir", output_dir, "--npm-mirror", tarball_dir])
+            assert result.exit_code == 0, result.output
+
+            project = Path(output_dir) / "obsidian-plugin"
+            subprocess.run(  # noqa: S603
+                ["npm", "ci", "--cache", str(Path(output_dir) / ".npm-cache")],  # noqa: S607
+                cwd=project,
+                check=True,
+                capture_output=True,
+                timeout=120,
+            )
+
+            installed = sorted(path.parent.name for path in (project / "node_modules").glob("**/package.json"))
+            assert installed == sorted(key.split("/")[-1] for key in fragment["packages"])
+
+
+class TestStoredFragments:
+    """Test the fragments shipped with the template."""
+
+    @pytest.mark.parametrize(
+        "fragment_path",
+        sorted(lockfile.LOCKFILE_DIR.glob("*.json"))
+        or [pytest.param(None, marks=pytest.mark.skip(reason="no lock fragments are stored"))],
+        ids=lambda path: path.stem if path else "none",
+    )
+    def test_stored_fragment_matches_the_template(self, fragment_path):
+        vitest, i18n = fragment_path.stem.split("-")[1::2]
+        package_json = render_project({"enable_vitest": vitest, "enable_i18n": i18n})["package.json"]
+
+        build_lockfile(package_json, json.loads(fragment_path.read_text(encoding="utf-8")))
+
+    def test_update_script_renders_package_json_with_stale_fragments(self, fragment_dir):
+        values = {"enable_vitest": "no", "enable_i18n": "yes"}
+        fragment_path = fragment_dir / fragment_name(values)
+        fragment = json.loads(fragment_path.read_text())
+        fragment["packages"]["node_modules/i18next"]["version"] = "1.0.0"
+        fragment_path.write_text(json.dumps(fragment))
+        script = runpy.run_path(str(Path(get_template_dir()) / "scripts" / "update_lockfiles.py"))
+
+        package_json = script["render_package_json"](values)
+
+        assert json.loads(package_json)["dependencies"]["i18next"] != "1.0.0"
+        with pytest.raises(ValueError, match="resolves i18next to 1.0.0"):
+            render_project(values)
@@ -0,0 +1,152 @@
+import json
+import tempfile
+from pathlib import Path
+
+from click.testing import CliRunner
+from helpers import get_template_dir
+
+from cookiecutter_obsidian_plugin.cli import main
+from cookiecutter_obsidian_plugin.generator import ProjectTemplate, generate_project, update_project
+from cookiecutter_obsidian_plugin.profiling import NULL_PROFILER, Profiler
+
+
+class TestProfiler:
+    """Test recording and reporting of spans."""
+
+    def test_span_records_duration(self):
+        profiler = Profiler()
+
+        with profiler.span("render", "README.md"):
+            pass
+
+        [span] = profiler.spans
+        assert (span.category, span.name) == ("render", "README.md")
+        assert span.start >= 0
+        assert span.duration >= 0
+
+    def test_span_is_recorded_on_error(self):
+        profiler = Profiler()
+
+        try:
+            with profiler.span("write", "main.ts"):
+                raise OSError("disk full")
+        except OSError:
+            pass
+
+        assert [span.name for span in profiler.spans] == ["main.ts"]
+
+    def test_totals_follow_phase_order(self):
+        profiler = Profiler()
+        for category in ("write", "render", "setup", "render"):
+            with profiler.span(category, "file"):
+                pass
+
+        totals = profiler.totals()
+
+        assert list(totals) == ["setup", "render", "write"]
+        assert totals["render"][0] == 2
+
+    def test_chrome_trace(self):
+        profiler = Profiler()
+        with profiler.span("hook", "pre_gen_project"):
+            pass
+
+        [event] = profiler.chrome_trace()["traceEvents"]
+
+        assert event["ph"] == "X"
+        assert event["cat"] == "hook"
+        assert event["name"] == "pre_gen_project"
+        assert event["dur"] >= 0
+
+    def test_null_profiler_records_nothing(self):
+        with NULL_PROFILER.span("render", "README.md"):
+            pass
+
+        assert NULL_PROFILER.spans == ()
+        assert ProjectTemplate(get_template_dir()).profiler is NULL_PROFILER
+
+
+class TestGenerationProfile:
+    """Test the spans recorded while generating a project."""
+
+    def test_every_file_is_rendered_and_written(self):
+        profiler = Profiler()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(generate_project(get_template_dir(), output_dir=temp_dir, no_input=True, profiler=profiler))
+            files = sorted(p.relative_to(project).as_posix() for p in project.rglob("*") if p.is_file())
+
+        written = sorted(span.name for span in profiler.spans if span.category == "write")
+        rendered = {span.name for span in profiler.spans if span.category == "render"}
+        assert written == files
+        assert rendered <= set(files)
+        assert {"setup", "context", "hook", "render", "write", "prune"} <= set(profiler.totals())
+
+    def test_pruned_paths(self):
+        profiler = Profiler()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generate_project(
+                get_template_dir(),
+                output_dir=temp_dir,
+                no_input=True,
+                extra_context={"enable_vitest": "no", "enable_i18n": "no", "license": "none"},
+                profiler=profiler,
+            )
+
+        pruned = [span.name for span in profiler.spans if span.category == "prune"]
+        assert pruned == [
+            "vitest.config.ts",
+            "tests",
+            "src/i18n",
+            "locales",
+            "tests/i18n.test.ts",
+            "compile-locales.mjs",
+            "src/startup.ts",
+            "tests/startup.test.ts",
+            "src/perf.ts",
+            "tests/perf.test.ts",
+            "LICENSE",
+            ".npmrc",
+        ]
+
+    def test_update_only_times_written_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(generate_project(get_template_dir(), output_dir=temp_dir, no_input=True))
+            (project / "README.md").write_text("Edited locally.\n")
+            profiler = Profiler()
+
+            update_project(get_template_dir(), output_dir=temp_dir, no_input=True, profiler=profiler)
+
+        assert [span.name for span in profiler.spans if span.category == "write"] == ["README.md"]
+
+
+class TestProfileOption:
+    """Test the --profile CLI flag."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    def test_profile_prints_summary_and_writes_trace(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_file = Path(temp_dir) / "trace.json"
+
+            result = self.runner.invoke(
+                main, ["-o", temp_dir, "--no-input", "--profile", "--profile-output", str(trace_file)]
+            )
+
+            assert result.exit_code == 0, result.output
+            assert "Phase" in result.output
+            assert "Slowest files:" in result.output
+            events = json.loads(trace_file.read_text())["traceEvents"]
+            assert {event["cat"] for event in events} >= {"render", "write", "hook"}
+
+    def test_profile_output_requires_profile(self):
+        result = self.runner.invoke(main, ["--no-input", "--profile-output", "trace.json"])
+
+        assert result.exit_code != 0
+        assert "--profile-output requires --profile" in result.output
+
+    def test_profile_rejects_archives(self):
+        result = self.runner.invoke(main, ["--no-input", "--profile", "--format", "zip"])
+
+        assert result.exit_code != 0
+        assert "--profile cannot be combined with" in result.output
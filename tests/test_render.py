@@ -0,0 +1,65 @@
+import tempfile
+import types
+from pathlib import Path
+
+import pytest
+from helpers import get_default_context, get_template_dir, run_cookiecutter
+
+from cookiecutter_obsidian_plugin.generator import ProjectTemplate, iter_project, render_project
+from cookiecutter_obsidian_plugin.validation import ContextValidationError
+
+
+def read_tree(project_path: str) -> dict:
+    root = Path(project_path)
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+
+class TestRenderProject:
+    """Test the in-memory render API."""
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {},
+            {"enable_vitest": "yes", "enable_i18n": "yes"},
+            {"license": "none", "enable_i18n": "yes"},
+        ],
+    )
+    def test_matches_cookiecutter_output(self, overrides):
+        context = get_default_context()
+        context.update(overrides)
+
+        files = render_project(context)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = run_cookiecutter(get_template_dir(), context, output_dir=temp_dir)
+            assert files == read_tree(project_path)
+
+    def test_applies_feature_pruning(self):
+        files = render_project({"license": "none"})
+
+        assert "src/main.ts" in files
+        assert "LICENSE" not in files
+        assert not any(path.startswith(("tests/", "locales/", "src/i18n/")) for path in files)
+        assert "vitest.config.ts" not in files
+
+    def test_uses_given_template(self):
+        template = ProjectTemplate(get_template_dir(), use_cache=False)
+
+        files = render_project({"plugin_id": "given-template"}, template=template)
+
+        assert b'"id": "given-template"' in files["manifest.json"]
+
+    def test_iter_project_is_lazy(self):
+        files = iter_project({"enable_vitest": "yes"})
+
+        assert isinstance(files, types.GeneratorType)
+        first = next(files)
+        assert first.path and first.content
+        assert "tests/smoke.test.ts" in {rendered.path for rendered in files}
+
+    def test_invalid_values(self):
+        with pytest.raises(ContextValidationError) as exc_info:
+            render_project({"plugin_id": "Bad Id", "node_version": "twenty"})
+
+        assert len(exc_info.value.errors) == 2
@@ -0,0 +1,53 @@
+import os
+import subprocess  # noqa: S404
+import sys
+from typing import Dict, List
+
+import pytest
+
+# Modules that are only needed once a project is actually generated.
+HEAVY_MODULES = ("cookiecutter", "jinja2", "requests", "binaryornot", "yaml", "rich")
+
+# Cumulative import time of the package and its CLI module, as reported by
+# ``python -X importtime``. Importing generation eagerly costs well above this.
+IMPORT_BUDGET_US = 80_000
+
+
+def run_with_importtime(args: List[str]) -> Dict[str, int]:
+    """Run the CLI with ``-X importtime`` and return cumulative import time per module."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", "from cookiecutter_obsidian_plugin.cli import main; main()", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Test that --help and --version stay on the fast path."""
+
+    @pytest.mark.parametrize("flag", ["--help", "--version"])
+    def test_no_heavy_imports(self, flag):
+        times = run_with_importtime([flag])
+
+        loaded = {name.split(".")[0] for name in times}
+        assert not loaded & set(HEAVY_MODULES), f"{flag} imported {sorted(loaded & set(HEAVY_MODULES))}"
+
+    @pytest.mark.skipif(
+        "PYTEST_XDIST_WORKER" in os.environ, reason="import time is not comparable while other workers use the CPU"
+    )
+    @pytest.mark.parametrize("flag", ["--help", "--version"])
+    def test_import_time_budget(self, flag):
+        times = run_with_importtime([flag])
+
+        package_time = times["cookiecutter_obsidian_plugin"] + times["cookiecutter_obsidian_plugin.cli"]
+        assert package_time < IMPORT_BUDGET_US, f"CLI import took {package_time}us, budget is {IMPORT_BUDGET_US}us"
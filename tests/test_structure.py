@@ -0,0 +1,123 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from helpers import get_template_dir, run_cookiecutter
+
+from cookiecutter_obsidian_plugin.generator import generate_project, update_project
+from cookiecutter_obsidian_plugin.structure import InvalidFileError, check_content, check_project
+
+# package.json without the comma the vitest scripts are appended after.
+BROKEN_COMMA = (
+    '    {% if cookiecutter.enable_vitest == "yes" -%}\n    ,\n    "test"',
+    '    {% if cookiecutter.enable_vitest == "yes" -%}\n    "test"',
+)
+
+
+def copy_template(temp_dir: str) -> Path:
+    template_dir = Path(temp_dir) / "template"
+    shutil.copytree(get_template_dir(), template_dir, ignore=shutil.ignore_patterns(".git", ".venv", "*.pyc"))
+    return template_dir
+
+
+def break_package_json(template_dir: Path) -> None:
+    package_json = template_dir / "{{cookiecutter.plugin_id}}" / "package.json"
+    source = package_json.read_text()
+    assert BROKEN_COMMA[0] in source
+    package_json.write_text(source.replace(*BROKEN_COMMA, 1))
+
+
+class TestCheckContent:
+    """Test parsing of single rendered files."""
+
+    def test_valid_files(self):
+        check_content("package.json", b'{"name": "plugin"}')
+        check_content(".github/workflows/ci.yml", b"on:\n  push:\n")
+        check_content("src/main.ts", b"{ not json")
+
+    def test_json_error_location(self):
+        with pytest.raises(InvalidFileError) as excinfo:
+            check_content("package.json", b'{\n  "a": 1\n  "b": 2\n}\n')
+
+        assert (excinfo.value.line, excinfo.value.column) == (3, 3)
+        assert str(excinfo.value) == "package.json:3:3: invalid JSON: Expecting ',' delimiter"
+
+    def test_yaml_error_location(self):
+        with pytest.raises(InvalidFileError) as excinfo:
+            check_content("dependabot.yml", b"version: 2\nupdates:\n  - a: [1\n  - b: 2\n")
+
+        assert excinfo.value.path == "dependabot.yml"
+        assert excinfo.value.line == 4
+        assert "invalid YAML" in str(excinfo.value)
+
+    def test_check_project_reports_every_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(temp_dir)
+            (project / "manifest.json").write_text("{}")
+            (project / "package.json").write_text("{,}")
+            (project / "locales").mkdir()
+            (project / "locales" / "en.json").write_text("[")
+
+            errors = check_project(project)
+
+        assert [error.split(":")[0] for error in errors] == ["locales/en.json", "package.json"]
+
+
+class TestGenerationChecks:
+    """Test that a broken template fails generation before npm sees it."""
+
+    def test_generate_fails_with_location(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_dir = copy_template(temp_dir)
+            break_package_json(template_dir)
+            output_dir = Path(temp_dir) / "out"
+            output_dir.mkdir()
+
+            with pytest.raises(InvalidFileError) as excinfo:
+                generate_project(
+                    str(template_dir),
+                    output_dir=str(output_dir),
+                    no_input=True,
+                    extra_context={"enable_vitest": "yes"},
+                    use_cache=False,
+                )
+
+            assert str(excinfo.value).startswith("package.json:17:5: invalid JSON")
+            assert list(output_dir.iterdir()) == []
+
+    def test_disabled_branch_still_generates(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_dir = copy_template(temp_dir)
+            break_package_json(template_dir)
+
+            project_path = generate_project(str(template_dir), output_dir=temp_dir, no_input=True, use_cache=False)
+
+            assert check_project(project_path) == []
+
+    def test_update_leaves_project_untouched(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_dir = copy_template(temp_dir)
+            project = Path(generate_project(str(template_dir), output_dir=temp_dir, no_input=True, use_cache=False))
+            before = (project / "package.json").read_bytes()
+            break_package_json(template_dir)
+
+            with pytest.raises(InvalidFileError):
+                update_project(
+                    str(template_dir),
+                    output_dir=temp_dir,
+                    no_input=True,
+                    extra_context={"enable_vitest": "yes"},
+                    use_cache=False,
+                )
+
+            assert (project / "package.json").read_bytes() == before
+            assert not (project / "vitest.config.ts").exists()
+
+    def test_post_gen_hook_checks_plain_cookiecutter_runs(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_dir = copy_template(temp_dir)
+            break_package_json(template_dir)
+
+            with pytest.raises(RuntimeError, match="Hook script failed"):
+                run_cookiecutter(str(template_dir), {"enable_vitest": "yes"}, output_dir=temp_dir)
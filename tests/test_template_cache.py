@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+from helpers import get_default_context, get_template_dir
+from jinja2 import Environment
+
+from cookiecutter_obsidian_plugin.cli import main
+from cookiecutter_obsidian_plugin.generator import STALE_CACHE_SECONDS, ProjectTemplate, get_cache_root
+
+
+@pytest.fixture
+def cache_home(monkeypatch):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.setenv("XDG_CACHE_HOME", temp_dir)
+        yield Path(temp_dir)
+
+
+def render_all(template: ProjectTemplate) -> None:
+    context = {"cookiecutter": get_default_context()}
+    for template_file in template.files:
+        if not template_file.binary:
+            template.env.get_template(template_file.path).render(**context)
+
+
+class TestTemplateCache:
+    """Test the on-disk compiled template cache."""
+
+    def test_cache_dir_is_under_user_cache(self, cache_home):
+        template = ProjectTemplate(get_template_dir())
+
+        assert get_cache_root() == cache_home / "cookiecutter-obsidian-plugin"
+        assert template.cache_dir.parent == get_cache_root()
+        assert template.cache_dir.exists()
+
+    @pytest.mark.usefixtures("cache_home")
+    def test_second_run_skips_parsing(self):
+        render_all(ProjectTemplate(get_template_dir()))
+        assert any(ProjectTemplate(get_template_dir()).cache_dir.iterdir())
+
+        parsed = []
+        original_parse = Environment._parse
+
+        def tracking_parse(env, source, name, filename):
+            parsed.append(name)
+            return original_parse(env, source, name, filename)
+
+        with patch.object(Environment, "_parse", tracking_parse):
+            render_all(ProjectTemplate(get_template_dir()))
+
+        assert parsed == []
+
+    @pytest.mark.usefixtures("cache_home")
+    def test_template_change_invalidates_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_dir = Path(temp_dir) / "template"
+            shutil.copytree(get_template_dir(), template_dir, ignore=shutil.ignore_patterns(".git", ".venv", "*.pyc"))
+            before = ProjectTemplate(str(template_dir))
+            render_all(before)
+
+            readme = template_dir / "{{cookiecutter.plugin_id}}" / "README.md"
+            readme.write_text(readme.read_text() + "\nChanged.\n")
+            after = ProjectTemplate(str(template_dir))
+
+            assert after.cache_dir != before.cache_dir
+            context = {"cookiecutter": get_default_context()}
+            assert after.env.get_template("README.md").render(**context).endswith("Changed.\n")
+
+    @pytest.mark.usefixtures("cache_home")
+    def test_unused_caches_are_removed(self):
+        stale = get_cache_root() / "0.0.1-0123456789abcdef"
+        recent = get_cache_root() / "0.0.2-0123456789abcdef"
+        for path in (stale, recent):
+            path.mkdir(parents=True)
+            (path / "__jinja2_x.cache").write_bytes(b"bytecode")
+        unused_since = time.time() - STALE_CACHE_SECONDS - 60
+        os.utime(stale, (unused_since, unused_since))
+
+        template = ProjectTemplate(get_template_dir())
+
+        assert sorted(get_cache_root().iterdir()) == [recent, template.cache_dir]
+
+    @pytest.mark.usefixtures("cache_home")
+    def test_removed_cache_only_costs_speed(self):
+        template = ProjectTemplate(get_template_dir())
+        # Another run removes the directory while this one is still rendering.
+        shutil.rmtree(template.cache_dir)
+
+        render_all(template)
+
+        assert not template.cache_dir.exists()
+
+    @pytest.mark.usefixtures("cache_home")
+    def test_no_cache(self):
+        template = ProjectTemplate(get_template_dir(), use_cache=False)
+
+        assert template.env.bytecode_cache is None
+        assert not get_cache_root().exists()
+
+
+class TestNoCacheOption:
+    """Test the --no-cache CLI flag."""
+
+    @patch("cookiecutter_obsidian_plugin.generator.generate_project")
+    def test_no_cache_flag(self, mock_generate_project):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mock_generate_project.return_value = str(Path(temp_dir) / "obsidian-plugin")
+
+            result = CliRunner().invoke(main, ["--output-dir", temp_dir, "--no-input", "--no-cache"])
+
+            assert result.exit_code == 0
+            assert mock_generate_project.call_args[1]["use_cache"] is False
+
+    @patch("cookiecutter_obsidian_plugin.generator.generate_project")
+    def test_cache_enabled_by_default(self, mock_generate_project):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mock_generate_project.return_value = str(Path(temp_dir) / "obsidian-plugin")
+
+            result = CliRunner().invoke(main, ["--output-dir", temp_dir, "--no-input"])
+
+            assert result.exit_code == 0
+            assert mock_generate_project.call_args[1]["use_cache"] is True
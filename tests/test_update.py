@@ -0,0 +1,150 @@
+import os
+import tempfile
+from pathlib import Path
+
+from click.testing import CliRunner
+from helpers import assert_file_exists, assert_file_not_exists, get_template_dir
+
+from cookiecutter_obsidian_plugin.cli import main
+from cookiecutter_obsidian_plugin.generator import generate_project, update_project
+
+OLD_MTIME = 1_000_000_000
+
+
+def _age_files(project: Path) -> None:
+    for path in project.rglob("*"):
+        if path.is_file():
+            os.utime(path, (OLD_MTIME, OLD_MTIME))
+
+
+class TestUpdateProject:
+    """Test regenerating an existing project in place."""
+
+    def test_unchanged_project_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(generate_project(get_template_dir(), output_dir=temp_dir, no_input=True))
+            _age_files(project)
+
+            report = update_project(get_template_dir(), output_dir=temp_dir, no_input=True)
+
+            assert report.added == report.changed == report.removed == []
+            assert report.unchanged > 0
+            assert all(p.stat().st_mtime == OLD_MTIME for p in project.rglob("*") if p.is_file())
+
+    def test_only_changed_files_are_rewritten(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(generate_project(get_template_dir(), output_dir=temp_dir, no_input=True))
+            readme = project / "README.md"
+            original = readme.read_bytes()
+            readme.write_text("Edited locally.\n")
+            (project / "manifest.json").unlink()
+            _age_files(project)
+
+            report = update_project(get_template_dir(), output_dir=temp_dir, no_input=True)
+
+            assert report.changed == ["README.md"]
+            assert report.added == ["manifest.json"]
+            assert readme.read_bytes() == original
+            assert (project / "package.json").stat().st_mtime == OLD_MTIME
+
+    def test_mode_change_is_restored(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(generate_project(get_template_dir(), output_dir=temp_dir, no_input=True))
+            readme = project / "README.md"
+            mode = readme.stat().st_mode
+            readme.chmod(0o600)
+
+            report = update_project(get_template_dir(), output_dir=temp_dir, no_input=True)
+
+            assert report.changed == ["README.md"]
+            assert readme.stat().st_mode == mode
+
+    def test_enabling_and_disabling_features(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(
+                generate_project(
+                    get_template_dir(), output_dir=temp_dir, no_input=True, extra_context={"enable_vitest": "yes"}
+                )
+            )
+
+            report = update_project(
+                get_template_dir(), output_dir=temp_dir, no_input=True, extra_context={"enable_i18n": "yes"}
+            )
+
+            assert "vitest.config.ts" in report.removed
+            assert "src/i18n/index.ts" in report.added
+            assert_file_not_exists(str(project), "vitest.config.ts")
+            assert_file_not_exists(str(project), "tests")
+            assert_file_exists(str(project), "src/i18n/index.ts")
+
+    def test_user_files_are_kept(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(generate_project(get_template_dir(), output_dir=temp_dir, no_input=True))
+            (project / "src" / "commands.ts").write_text("export {};\n")
+
+            report = update_project(get_template_dir(), output_dir=temp_dir, no_input=True)
+
+            assert report.removed == []
+            assert_file_exists(str(project), "src/commands.ts")
+
+    def test_only_generated_npmrc_is_removed(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mirror = {"_npm_mirror": "https://npm.example.com/"}
+            project = Path(
+                generate_project(get_template_dir(), output_dir=temp_dir, no_input=True, extra_context=mirror)
+            )
+
+            report = update_project(get_template_dir(), output_dir=temp_dir, no_input=True)
+
+            assert report.removed == [".npmrc"]
+            (project / ".npmrc").write_text("save-exact=true\n")
+
+            report = update_project(get_template_dir(), output_dir=temp_dir, no_input=True)
+
+            assert report.removed == []
+            assert (project / ".npmrc").read_text() == "save-exact=true\n"
+
+    def test_update_creates_missing_project(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report = update_project(get_template_dir(), output_dir=temp_dir, no_input=True)
+
+            assert report.changed == report.removed == []
+            assert "manifest.json" in report.added
+            assert_file_exists(report.project_path, "manifest.json")
+
+
+class TestUpdateCommand:
+    """Test the --update CLI flag."""
+
+    def setup_method(self):
+        self.runner = CliRunner()
+
+    def test_update_reports_changes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Path(generate_project(get_template_dir(), output_dir=temp_dir, no_input=True))
+            (project / "README.md").write_text("Edited locally.\n")
+
+            result = self.runner.invoke(main, ["--output-dir", temp_dir, "--no-input", "--update"])
+
+            assert result.exit_code == 0, result.output
+            assert "  changed  README.md" in result.output
+            assert "0 added, 1 changed, 0 removed" in result.output
+
+    def test_update_rejects_overwrite(self):
+        result = self.runner.invoke(main, ["--no-input", "--update", "--overwrite-if-exists"])
+
+        assert result.exit_code != 0
+        assert "--update cannot be combined with" in result.output
+
+    def test_batch_update(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = Path(temp_dir) / "batch.json"
+            batch_file.write_text('[{"plugin_id": "first-plugin"}, {"plugin_id": "second-plugin"}]')
+            self.runner.invoke(main, ["--output-dir", temp_dir, "--batch", str(batch_file)])
+
+            result = self.runner.invoke(main, ["--output-dir", temp_dir, "--batch", str(batch_file), "--update"])
+
+            assert result.exit_code == 0, result.output
+            assert "Updating 2 Obsidian plugins" in result.output
+            assert "0 added, 0 changed, 0 removed" in result.output
+            assert "2 of 2 projects updated" in result.output
@@ -1,8 +1,21 @@
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
-from helpers import get_template_dir, run_cookiecutter
+from helpers import assert_file_exists, assert_file_not_exists, get_default_context, get_template_dir, run_cookiecutter
+
+from cookiecutter_obsidian_plugin.generator import generate_project
+from cookiecutter_obsidian_plugin.pruning import prune_project
+from cookiecutter_obsidian_plugin.validation import (
+    ContextValidationError,
+    validate_context,
+    validate_es_target,
+    validate_max_bundle_kb,
+    validate_npm_mirror,
+    validate_plugin_id,
+    validate_repo_url,
+)
 
 
 class TestValidation:
@@ -180,3 +193,93 @@ class TestValidation:
                 assert Path(project_path).exists(), f"Failed for node_version: {valid_node_version}"
             except RuntimeError as e:
                 raise AssertionError(f"Unexpected error for node_version '{valid_node_version}': {e}") from e
+
+
+class TestInProcessValidation:
+    """Test the validators and pruning used by the CLI without hook scripts."""
+
+    def test_validators_return_messages(self):
+        assert validate_plugin_id("my-plugin") == (True, "")
+        assert validate_plugin_id("My_Plugin")[0] is False
+        assert validate_repo_url("https://gitlab.com/user/repo") == (
+            False,
+            "Repository URL must be a GitHub HTTPS URL (https://github.com/...)",
+        )
+
+    def test_validate_es_target(self):
+        assert validate_es_target("es2018") == (True, "")
+        assert validate_es_target("es2024") == (True, "")
+        assert validate_es_target("ES2020")[0] is False
+        assert validate_es_target("esnext")[0] is False
+        assert validate_es_target("chrome120")[0] is False
+
+    def test_validate_bundle_budget(self):
+        assert validate_max_bundle_kb("0") == (True, "")
+        assert validate_max_bundle_kb("256") == (True, "")
+        assert validate_max_bundle_kb("1.5") == (
+            False,
+            "Maximum main.js size must be a whole number of KB (0 for no limit)",
+        )
+        assert validate_max_bundle_kb("")[0] is False
+
+    def test_validate_npm_mirror(self):
+        assert validate_npm_mirror("") == (True, "")
+        assert validate_npm_mirror("https://npm.example.com/repo/") == (True, "")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert validate_npm_mirror(temp_dir) == (True, "")
+            assert validate_npm_mirror(str(Path(temp_dir) / "missing"))[0] is False
+        assert validate_npm_mirror("tarballs")[0] is False
+
+    def test_validate_context_collects_all_errors(self):
+        context = get_default_context()
+        context["plugin_id"] = "Bad Id"
+        context["node_version"] = "v20"
+
+        errors = validate_context(context)
+
+        assert len(errors) == 2
+        assert validate_context(get_default_context()) == []
+
+    def test_prune_project(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for path in ["vitest.config.ts", "tests/smoke.test.ts", "src/i18n/index.ts", "locales/en.json", "LICENSE"]:
+                (Path(temp_dir) / path).parent.mkdir(parents=True, exist_ok=True)
+                (Path(temp_dir) / path).write_text("")
+
+            prune_project(temp_dir, {"enable_vitest": "no", "enable_i18n": "yes", "license": "none"})
+
+            assert_file_not_exists(temp_dir, "vitest.config.ts")
+            assert_file_not_exists(temp_dir, "tests")
+            assert_file_exists(temp_dir, "src/i18n/index.ts")
+            assert_file_exists(temp_dir, "locales/en.json")
+            assert_file_not_exists(temp_dir, "LICENSE")
+
+    @patch("cookiecutter.hooks.run_script")
+    def test_generation_runs_no_hook_scripts(self, mock_run_script):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = generate_project(
+                get_template_dir(), output_dir=temp_dir, no_input=True, extra_context={"license": "none"}
+            )
+
+            mock_run_script.assert_not_called()
+            assert_file_not_exists(project_path, "LICENSE")
+            assert_file_not_exists(project_path, "tests")
+
+    def test_generation_rejects_invalid_context(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(ContextValidationError) as exc_info:
+                generate_project(
+                    get_template_dir(), output_dir=temp_dir, no_input=True, extra_context={"plugin_id": "123invalid"}
+                )
+
+            assert "Plugin id must start with a letter" in str(exc_info.value)
+            assert list(Path(temp_dir).iterdir()) == []
+
+    def test_generation_validates_once(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch(
+                "cookiecutter_obsidian_plugin.generator.validate_context", wraps=validate_context
+            ) as mock_validate:
+                generate_project(get_template_dir(), output_dir=temp_dir, no_input=True)
+
+            mock_validate.assert_called_once()
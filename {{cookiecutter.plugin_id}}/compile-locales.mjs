@@ -0,0 +1,215 @@
+import fs from "fs";
+import path from "path";
+import process from "process";
+import { fileURLToPath } from "url";
+
+// Compiles locales/*.json into src/i18n/messages.ts, a typed module with a
+// constant per key and a lazy loader per locale, reports keys that are
+// missing, unknown or unused, and fails on `t()` calls with a key en.json
+// lacks. esbuild.config.mjs runs it before every build.
+const LOCALES_DIR = "locales";
+const SOURCE_DIR = "src";
+const I18N_DIR = path.join(SOURCE_DIR, "i18n");
+const OUTPUT = path.join(I18N_DIR, "messages.ts");
+const FALLBACK_LOCALE = "en";
+// Split messages into text and parameter names for the built-in translator;
+// i18next parses its own placeholders, so its messages stay strings.
+const PREPARSE = {{ "true" if cookiecutter.i18n_engine == "minimal" else "false" }};
+{% raw -%}
+const PLACEHOLDER = /\{\{\s*(\w+)\s*\}\}/;
+const PLURAL_SUFFIX = /_(zero|one|two|few|many|other)$/;
+const IDENTIFIER = /^[A-Za-z_$][\w$]*$/;
+const TRANSLATE_CALL = /\bt\(\s*(["'`])([^"'`\\]*)\1/g;
+
+/** The key `t()` is called with: plural forms such as `file_one` share `file`. */
+function baseKey(key) {
+  return key.replace(PLURAL_SUFFIX, "");
+}
+
+function propertyName(key) {
+  return IDENTIFIER.test(key) ? key : JSON.stringify(key);
+}
+
+/** A message with placeholders becomes e.g. `["Hi, ", "name", "!"]`, so `t()` only joins it. */
+function compileMessage(text) {
+  const parts = PREPARSE ? text.split(PLACEHOLDER) : [text];
+  if (parts.length === 1) {
+    return JSON.stringify(text);
+  }
+  return `[${parts.map((part) => JSON.stringify(part)).join(", ")}]`;
+}
+
+export function readLocales() {
+  const locales = {};
+  const files = fs.readdirSync(LOCALES_DIR).filter((name) => name.endsWith(".json"));
+  for (const file of files.sort()) {
+    const filePath = path.join(LOCALES_DIR, file);
+    let messages;
+    try {
+      messages = JSON.parse(fs.readFileSync(filePath, "utf8"));
+    } catch (error) {
+      throw new Error(`${filePath}: ${error.message}`);
+    }
+    for (const [key, value] of Object.entries(messages)) {
+      if (typeof value !== "string") {
+        throw new Error(`${filePath}: the value of "${key}" must be a string`);
+      }
+    }
+    locales[path.basename(file, ".json")] = messages;
+  }
+  if (!(FALLBACK_LOCALE in locales)) {
+    throw new Error(`${LOCALES_DIR}/${FALLBACK_LOCALE}.json, the fallback locale, is missing`);
+  }
+  return locales;
+}
+
+/**
+ * Keys mentioned in the plugin's sources outside src/i18n, as string literals
+ * or `Keys.name`. Keys built at runtime (e.g. in template literals) are not found.
+ */
+export function usedKeys() {
+  const used = new Set();
+  for (const filePath of sourceFiles(SOURCE_DIR)) {
+    const source = fs.readFileSync(filePath, "utf8");
+    for (const match of source.matchAll(/Keys\.([\w$]+)|(["'`])([^"'`\s\\]+)\2/g)) {
+      used.add(match[1] ?? match[3]);
+    }
+  }
+  return used;
+}
+
+/**
+ * `t()` calls in the plugin's sources outside src/i18n whose key is a string
+ * literal, as `{ key, location }` with a `file:line` location.
+ */
+export function literalCalls() {
+  const calls = [];
+  for (const filePath of sourceFiles(SOURCE_DIR)) {
+    const source = fs.readFileSync(filePath, "utf8");
+    for (const match of source.matchAll(TRANSLATE_CALL)) {
+      if (!match[2].includes("${")) {
+        const line = source.slice(0, match.index).split("\n").length;
+        calls.push({ key: match[2], location: `${filePath}:${line}` });
+      }
+    }
+  }
+  return calls;
+}
+
+// Walked by hand: readdirSync's `recursive` option needs Node 20.1 or 18.17.
+function sourceFiles(dir) {
+  return fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+    const filePath = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      return filePath === I18N_DIR ? [] : sourceFiles(filePath);
+    }
+    return filePath.endsWith(".ts") ? [filePath] : [];
+  });
+}
+
+export function checkKeys(locales, used) {
+  const keysOf = (messages) => new Set(Object.keys(messages).map(baseKey));
+  const fallback = keysOf(locales[FALLBACK_LOCALE]);
+  const unused = [...fallback].filter((key) => !used.has(key));
+  const report = { missing: {}, unknown: {}, unused };
+  for (const [locale, messages] of Object.entries(locales)) {
+    const keys = keysOf(messages);
+    const missing = [...fallback].filter((key) => !keys.has(key));
+    const unknown = [...keys].filter((key) => !fallback.has(key));
+    if (missing.length > 0) {
+      report.missing[locale] = missing;
+    }
+    if (unknown.length > 0) {
+      report.unknown[locale] = unknown;
+    }
+  }
+  return report;
+}
+
+export function printReport(report) {
+  const count = (keys) => `${keys.length} ${keys.length === 1 ? "key" : "keys"}`;
+  for (const [locale, keys] of Object.entries(report.missing)) {
+    const list = keys.join(", ");
+    console.warn(`locales: ${locale} lacks ${count(keys)}, shown in ${FALLBACK_LOCALE}: ${list}`);
+  }
+  for (const [locale, keys] of Object.entries(report.unknown)) {
+    const list = keys.join(", ");
+    console.warn(`locales: ${locale} has ${count(keys)} that ${FALLBACK_LOCALE} lacks: ${list}`);
+  }
+  if (report.unused.length > 0) {
+    const list = report.unused.join(", ");
+    console.warn(`locales: ${count(report.unused)} not used in ${SOURCE_DIR}/: ${list}`);
+  }
+}
+
+export function generate(locales) {
+  const fallback = locales[FALLBACK_LOCALE];
+  const keys = [...new Set(Object.keys(fallback).map(baseKey))];
+  const known = new Set(keys);
+  const lines = [
+    "// Generated by compile-locales.mjs from locales/*.json; do not edit.",
+    "// Every build regenerates it, and so does `npm run locales`.",
+    "",
+    `export const FALLBACK_LOCALE = ${JSON.stringify(FALLBACK_LOCALE)};`,
+    "",
+    `/** Keys of ${LOCALES_DIR}/${FALLBACK_LOCALE}.json, plural forms without their suffix. */`,
+    "export const Keys = {",
+    ...keys.map((key) => `  ${propertyName(key)}: ${JSON.stringify(key)},`),
+    "} as const;",
+    "",
+    "export type MessageKey = (typeof Keys)[keyof typeof Keys];",
+    "",
+    PREPARSE
+      ? '/** Text, or text and parameter names taking turns: `["Hi, ", "name", "!"]`. */'
+      : "/** A message, interpolated by i18next. */",
+    `export type Message = ${PREPARSE ? "string | readonly string[]" : "string"};`,
+    "",
+    "export type Messages = Readonly<Record<string, Message>>;",
+    "",
+    "/**",
+    " * Messages by locale. A locale's object is only built the first time its",
+    " * loader is called, so only the fallback and the active locale are built",
+    " * at startup. Keys that the fallback does not have are left out.",
+    " */",
+    "export const loaders: Record<string, () => Messages> = {",
+  ];
+  for (const [locale, messages] of Object.entries(locales)) {
+    lines.push(`  ${propertyName(locale)}: () => ({`);
+    for (const [key, text] of Object.entries(messages)) {
+      if (known.has(baseKey(key))) {
+        lines.push(`    ${propertyName(key)}: ${compileMessage(text)},`);
+      }
+    }
+    lines.push("  }),");
+  }
+  lines.push("};", "");
+  return lines.join("\n");
+}
+
+/**
+ * Write src/i18n/messages.ts when the locales changed it and print the key
+ * report; throws if a `t()` call names a key that the fallback locale lacks.
+ */
+export function compileLocales() {
+  const locales = readLocales();
+  const code = generate(locales);
+  if (!fs.existsSync(OUTPUT) || fs.readFileSync(OUTPUT, "utf8") !== code) {
+    fs.writeFileSync(OUTPUT, code);
+  }
+  printReport(checkKeys(locales, usedKeys()));
+
+  const keys = new Set(Object.keys(locales[FALLBACK_LOCALE]).map(baseKey));
+  const undefinedCalls = literalCalls().filter(({ key }) => !keys.has(key));
+  if (undefinedCalls.length > 0) {
+    const file = `${LOCALES_DIR}/${FALLBACK_LOCALE}.json`;
+    const lines = undefinedCalls.map(
+      ({ key, location }) => `${location}: t("${key}") is not a key of ${file}`
+    );
+    throw new Error(lines.join("\n"));
+  }
+}
+
+if (process.argv[1] && path.resolve(process.argv[1]) === fileURLToPath(import.meta.url)) {
+  compileLocales();
+}
+{%- endraw %}
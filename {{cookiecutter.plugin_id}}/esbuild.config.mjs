@@ -1,15 +1,59 @@
 import esbuild from "esbuild";
+import fs from "fs";
 import process from "process";
+import zlib from "zlib";
 import { builtinModules } from "node:module";
-
+{% if cookiecutter.enable_i18n == "yes" -%}
+import { compileLocales } from "./compile-locales.mjs";
+{% endif %}
 const banner = `/*
 THIS IS A GENERATED/BUNDLED FILE BY ESBUILD
 if you want to view the source, please visit the github repository of this plugin
 */
 `;
 
-const prod = process.argv[2] === "production";
+// "production" builds once, "analyze" also writes meta.json and reports what
+// makes main.js big; anything else rebuilds incrementally on every change.
+const mode = process.argv[2];
+const analyze = mode === "analyze";
+const prod = mode === "production" || analyze;
+
+// Budget for main.js in KB; Obsidian loads it on every startup. 0 turns a limit off.
+const budget = { raw: {{ cookiecutter.max_bundle_kb }}, gzip: {{ cookiecutter.max_bundle_gzip_kb }} };
+
+function formatBytes(bytes) {
+	return bytes < 1024 ? `${bytes} B` : `${(bytes / 1024).toFixed(1)} KB`;
+}
+
+function reportModules(metafile, limit = 20) {
+	const output = metafile.outputs["main.js"];
+	const modules = Object.entries(output.inputs)
+		.map(([path, input]) => ({ path, bytes: input.bytesInOutput }))
+		.sort((a, b) => b.bytes - a.bytes);
+	console.log(`\nmain.js: ${formatBytes(output.bytes)} from ${modules.length} modules\n`);
+	for (const { path, bytes } of modules.slice(0, limit)) {
+		const share = ((bytes / output.bytes) * 100).toFixed(1);
+		console.log(`${formatBytes(bytes).padStart(10)}  ${share.padStart(5)}%  ${path}`);
+	}
+}
+
+function checkBudget() {
+	const code = fs.readFileSync("main.js");
+	const sizes = { raw: code.length, gzip: zlib.gzipSync(code, { level: 9 }).length };
+	const exceeded = Object.keys(budget).filter((kind) => budget[kind] > 0 && sizes[kind] > budget[kind] * 1024);
+	for (const kind of Object.keys(budget)) {
+		const limit = budget[kind] > 0 ? `${budget[kind]} KB` : "no limit";
+		const status = exceeded.includes(kind) ? "OVER BUDGET" : "ok";
+		console.log(`main.js ${kind}: ${formatBytes(sizes[kind])} (budget: ${limit}) ${status}`);
+	}
+	return exceeded.length === 0;
+}
 
+{% if cookiecutter.enable_i18n == "yes" -%}
+// Turn locales/*.json into src/i18n/messages.ts, which src/i18n imports.
+compileLocales();
+
+{% endif -%}
 const context = await esbuild.context({
 	banner: {
 		js: banner,
@@ -33,17 +77,45 @@ const context = await esbuild.context({
 		...builtinModules,
 	],
 	format: "cjs",
-	target: "es2018",
+	// Newest syntax every Obsidian {{ cookiecutter.min_obsidian_version }}+ runtime parses, so less is down-levelled.
+	target: "{{ cookiecutter.es_target }}",
 	logLevel: "info",
 	sourcemap: prod ? false : "inline",
 	treeShaking: true,
 	outfile: "main.js",
 	minify: prod,
+	metafile: prod,
+	{%- if cookiecutter.enable_perf == "yes" %}
+	define: {
+		// Load-time instrumentation (src/perf.ts): in dev builds, and in production builds with PERF=1.
+		__PERF__: JSON.stringify(!prod || process.env.PERF === "1"),
+	},
+	{%- endif %}
 });
 
 if (prod) {
-	await context.rebuild();
+	const result = await context.rebuild();
+	if (analyze) {
+		fs.writeFileSync("meta.json", JSON.stringify(result.metafile, null, 2));
+		reportModules(result.metafile);
+		console.log("\nFull metafile written to meta.json (https://esbuild.github.io/analyze/)\n");
+	}
+	if (!checkBudget() && !analyze) {
+		reportModules(result.metafile);
+		console.error("\nmain.js exceeds its size budget; see `make analyze` or raise the budget in esbuild.config.mjs");
+		process.exit(1);
+	}
 	process.exit(0);
 } else {
 	await context.watch();
+	{%- if cookiecutter.enable_i18n == "yes" %}
+	// esbuild rebuilds once the new messages.ts is written.
+	fs.watch("locales", () => {
+		try {
+			compileLocales();
+		} catch (error) {
+			console.error(error.message);
+		}
+	});
+	{%- endif %}
 }
@@ -38,6 +38,7 @@ export default tseslint.config(
       "vitest.config.ts",
       "eslint.config.js",
       "esbuild.config.mjs",
+      "compile-locales.mjs",
       "version-bump.mjs"
     ]
   }
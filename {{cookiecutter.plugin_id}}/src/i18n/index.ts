@@ -1,66 +1,181 @@
-import i18next from "i18next";
-import en from "../../locales/en.json";
+{% if cookiecutter.i18n_engine == "minimal" -%}
+{% raw -%}
+import { FALLBACK_LOCALE, loaders, type Message, type MessageKey, type Messages } from "./messages";
+
+type TranslationParams = Record<string, string | number>;
+
+interface Catalog {
+  messages: Messages;
+  plurals: Intl.PluralRules;
+}
+
+const catalogs = new Map<string, Catalog>();
+let currentLocale: string = FALLBACK_LOCALE;
+
+function loadCatalog(locale: string): Catalog {
+  let catalog = catalogs.get(locale);
+  if (!catalog) {
+    catalog = { messages: loaders[locale](), plurals: new Intl.PluralRules(locale) };
+    catalogs.set(locale, catalog);
+  }
+  return catalog;
+}
+
+/**
+ * Find a message, preferring the plural form of `count` (`key_one`,
+ * `key_other`, ... and `key_zero` for 0, as in i18next).
+ */
+function lookup(catalog: Catalog, key: string, count?: number): Message | undefined {
+  const { messages } = catalog;
+  if (count !== undefined) {
+    const plural =
+      (count === 0 ? messages[`${key}_zero`] : undefined) ??
+      messages[`${key}_${catalog.plurals.select(count)}`];
+    if (plural !== undefined) {
+      return plural;
+    }
+  }
+  return messages[key];
+}
+
+/**
+ * Join a message that compile-locales.mjs split at its `{{name}}` placeholders;
+ * a missing parameter keeps its placeholder.
+ */
+function format(message: readonly string[], params: TranslationParams): string {
+  let result = message[0];
+  for (let i = 1; i < message.length; i += 2) {
+    const value = params[message[i]];
+    result += (value === undefined ? `{{${message[i]}}}` : String(value)) + message[i + 1];
+  }
+  return result;
+}
+
+/**
+ * Initialize the i18n system
+ * @param locale - initial locale (defaults to 'en')
+ */
+export function initI18n(locale: string = FALLBACK_LOCALE): void {
+  loadCatalog(FALLBACK_LOCALE);
+  setLocale(locale);
+}
+
+/**
+ * Change the current language, loading its translations on first use
+ * @param locale - language code (e.g., 'en', 'ru')
+ */
+export function setLocale(locale: string): void {
+  if (Object.prototype.hasOwnProperty.call(loaders, locale)) {
+    loadCatalog(locale);
+    currentLocale = locale;
+  }
+}
+
+/**
+ * Get translation for a key
+ * @param key - translation key, checked against `locales/en.json` by the type checker
+ * @param params - interpolation parameters (optional)
+ *
+ * @example
+ * // Simple translation
+ * t("plugin_loaded")
+ *
+ * @example
+ * // With interpolation: "Hello, {{name}}!"
+ * t("greeting", { name: "John" })
+ *
+ * @example
+ * // With pluralization: "file_one" / "file_other"
+ * t("file", { count: 5 })
+ */
+export function t(key: MessageKey, params?: TranslationParams): string {
+  const count = typeof params?.count === "number" ? params.count : undefined;
+  const message =
+    lookup(loadCatalog(currentLocale), key, count) ?? lookup(loadCatalog(FALLBACK_LOCALE), key, count);
+  if (message === undefined) {
+    return key;
+  }
+  return typeof message === "string" ? message : format(message, params ?? {});
+}
 
-const locales = {
-  en
-};
+/**
+ * Get list of available locales
+ */
+export function getAvailableLocales(): string[] {
+  return Object.keys(loaders);
+}
+
+/**
+ * Get current locale
+ */
+export function getCurrentLocale(): string {
+  return currentLocale;
+}
+{%- endraw %}
+{%- else -%}
+import i18next from "i18next";
+import { FALLBACK_LOCALE, loaders, type MessageKey } from "./messages";
 
-type Locale = keyof typeof locales;
 type TranslationParams = Record<string, string | number>;
 
 /**
  * Initialize the i18n system
  * @param locale - initial locale (defaults to 'en')
  */
-export async function initI18n(locale: string = "en") {
+export async function initI18n(locale: string = FALLBACK_LOCALE) {
   await i18next.init({
-    lng: locale,
-    fallbackLng: "en",
+    lng: FALLBACK_LOCALE,
+    fallbackLng: FALLBACK_LOCALE,
     resources: {
-      en: { translation: en }
+      [FALLBACK_LOCALE]: { translation: loaders[FALLBACK_LOCALE]() },
     },
     interpolation: {
-      escapeValue: false
-    }
+      escapeValue: false,
+    },
   });
+  await setLocale(locale);
 }
 
 /**
- * Change the current language
+ * Change the current language, loading its translations on first use
  * @param locale - language code (e.g., 'en', 'ru')
  */
 export async function setLocale(locale: string): Promise<void> {
-  if (locale in locales) {
-    await i18next.changeLanguage(locale);
+  if (!Object.prototype.hasOwnProperty.call(loaders, locale)) {
+    return;
+  }
+  if (!i18next.hasResourceBundle(locale, "translation")) {
+    i18next.addResourceBundle(locale, "translation", loaders[locale]());
   }
+  await i18next.changeLanguage(locale);
 }
 
 /**
  * Get translation for a key
- * @param key - translation key
+ * @param key - translation key, checked against `locales/en.json` by the type checker
  * @param params - interpolation parameters (optional)
- * 
+ *
  * @example
  * // Simple translation
  * t("plugin_loaded")
- * 
+ *
  * @example
  * // With interpolation (see docs for details)
  * t("greeting", { name: "John" })
- * 
+ *
  * @example
  * // With pluralization (see docs for details)
  * t("file", { count: 5 })
  */
-export function t(key: string, params?: TranslationParams): string {
+export function t(key: MessageKey, params?: TranslationParams): string {
   return i18next.t(key, params);
 }
 
 /**
  * Get list of available locales
  */
-export function getAvailableLocales(): Locale[] {
-  return Object.keys(locales) as Locale[];
+export function getAvailableLocales(): string[] {
+  return Object.keys(loaders);
 }
 
 /**
@@ -69,3 +184,4 @@ export function getAvailableLocales(): Locale[] {
 export function getCurrentLocale(): string {
   return i18next.language;
 }
+{%- endif %}
@@ -0,0 +1,31 @@
+// Generated by compile-locales.mjs from locales/*.json; do not edit.
+// Every build regenerates it, and so does `npm run locales`.
+
+export const FALLBACK_LOCALE = "en";
+
+/** Keys of locales/en.json, plural forms without their suffix. */
+export const Keys = {
+  plugin_loaded: "plugin_loaded",
+} as const;
+
+export type MessageKey = (typeof Keys)[keyof typeof Keys];
+
+{% if cookiecutter.i18n_engine == "minimal" -%}
+/** Text, or text and parameter names taking turns: `["Hi, ", "name", "!"]`. */
+export type Message = string | readonly string[];
+{% else -%}
+/** A message, interpolated by i18next. */
+export type Message = string;
+{% endif %}
+export type Messages = Readonly<Record<string, Message>>;
+
+/**
+ * Messages by locale. A locale's object is only built the first time its
+ * loader is called, so only the fallback and the active locale are built
+ * at startup. Keys that the fallback does not have are left out.
+ */
+export const loaders: Record<string, () => Messages> = {
+  en: () => ({
+    plugin_loaded: "Plugin loaded",
+  }),
+};
@@ -1,22 +1,63 @@
+{%- set i18next = cookiecutter.enable_i18n == "yes" and cookiecutter.i18n_engine == "i18next" -%}
+{%- set perf = cookiecutter.enable_perf == "yes" -%}
+{%- macro init_i18n(locale) %}{% if perf %}phase("i18n", () => initI18n({{ locale }})){% else %}initI18n({{ locale }}){% endif %}{% endmacro -%}
 import { Plugin, moment } from "obsidian";
 {% if cookiecutter.enable_i18n == "yes" -%}
 import { t, initI18n } from "./i18n";
+{% endif -%}
+{% if perf -%}
+import { instrumentPlugin{% if cookiecutter.enable_i18n == "yes" %}, phase{% endif %} } from "./perf";
+{% endif -%}
+{% if cookiecutter.deferred_startup == "yes" -%}
+import { Startup } from "./startup";
 {% endif %}
 
 export default class PluginMain extends Plugin {
+  {%- if cookiecutter.deferred_startup == "yes" %}
+  /** Resolves once the work deferred by `onload` has run. */
+  ready: Promise<void> = Promise.resolve();
+
+  onload() {
+    // Obsidian waits for onload before it shows the vault: register commands,
+    // views and settings here, and hand anything slower to Startup.
+    {% if cookiecutter.enable_i18n == "yes" and not i18next -%}
+    // Cheap and synchronous, so t() can name commands and settings below.
+    {{ init_i18n("moment.locale()") }};
+    {% endif -%}
+    this.ready = new Startup(this)
+      .afterLayout({% if i18next %}async {% endif %}() => {
+        {% if i18next -%}
+        // Until i18next is initialized, t() returns the key itself.
+        await {{ init_i18n("moment.locale()") }};
+        {% endif -%}
+        // eslint-disable-next-line no-console
+        console.log({% if cookiecutter.enable_i18n == "yes" %}t("plugin_loaded"){% else %}"{{cookiecutter.plugin_name}} loaded"{% endif %});
+      })
+      .start();
+  }
+  {%- else %}
   async onload() {
     {% if cookiecutter.enable_i18n == "yes" -%}
     const userLocale = moment.locale();
-    await initI18n(userLocale);
+    {% if i18next %}await {% endif %}{{ init_i18n("userLocale") }};
     // eslint-disable-next-line no-console
-    console.log(t("plugin_loaded")); 
+    console.log(t("plugin_loaded"));
     {% else -%}
     console.log("{{cookiecutter.plugin_name}} loaded");
     {% endif %}
   }
+  {%- endif %}
 
   onunload() {
     // eslint-disable-next-line no-console
     console.log("{{cookiecutter.plugin_name}} unloaded");
   }
 }
+{%- if perf %}
+
+// Times onload, onunload and phase() calls, and adds a "Show load times"
+// command. Production builds leave this out unless built with PERF=1.
+if (__PERF__) {
+  instrumentPlugin(PluginMain);
+}
+{%- endif %}
@@ -0,0 +1,131 @@
+import { Notice, type Plugin } from "obsidian";
+
+declare global {
+  /**
+   * Set by esbuild.config.mjs: true in dev builds and in production builds
+   * made with `PERF=1`. Otherwise every use of this module is dropped from main.js.
+   */
+  const __PERF__: boolean;
+}
+
+export interface PerfRecord {
+  name: string;
+  /** Milliseconds since Obsidian's window opened. */
+  start: number;
+  duration: number;
+}
+
+/** Keeps the last `capacity` items, so phases that run again and again cannot grow it. */
+export class RingBuffer<T> {
+  private readonly items: T[] = [];
+  private next = 0;
+
+  constructor(private readonly capacity: number) {}
+
+  push(item: T): void {
+    if (this.items.length < this.capacity) {
+      this.items.push(item);
+    } else {
+      this.items[this.next] = item;
+    }
+    this.next = (this.next + 1) % this.capacity;
+  }
+
+  /** The items, oldest first. */
+  toArray(): T[] {
+    return [...this.items.slice(this.next), ...this.items.slice(0, this.next)];
+  }
+
+  clear(): void {
+    this.items.length = 0;
+    this.next = 0;
+  }
+}
+
+const PREFIX = "{{ cookiecutter.plugin_id }}";
+// Pure, so production builds without __PERF__ can drop it with the rest of the module.
+const records = /* @__PURE__ */ new RingBuffer<PerfRecord>(100);
+let marks = 0;
+
+/**
+ * Time a named phase with `performance.mark` and `performance.measure`, so it
+ * also shows in the Performance panel of the developer tools. Returns what
+ * `run` returns; a promise is timed until it settles.
+ *
+ * @example
+ * await phase("index", () => this.buildIndex());
+ */
+export function phase<T>(name: string, run: () => T): T {
+  if (!__PERF__) {
+    return run();
+  }
+  const label = `${PREFIX}:${name}`;
+  const mark = `${label}:${marks++}`;
+  const start = performance.now();
+  performance.mark(mark);
+  const finish = () => {
+    performance.measure(label, mark);
+    performance.clearMarks(mark);
+    records.push({ name, start, duration: performance.now() - start });
+  };
+  let result: T;
+  try {
+    result = run();
+  } catch (error) {
+    finish();
+    throw error;
+  }
+  if (result instanceof Promise) {
+    return result.finally(finish) as unknown as T;
+  }
+  finish();
+  return result;
+}
+
+/** The recorded phases, oldest first. */
+export function getRecords(): PerfRecord[] {
+  return records.toArray();
+}
+
+export function clearRecords(): void {
+  records.clear();
+}
+
+/** Print the recorded phases as a table in the developer console. */
+export function dumpRecords(): PerfRecord[] {
+  const list = getRecords();
+  // eslint-disable-next-line no-console
+  console.table(
+    list.map(({ name, start, duration }) => ({
+      name,
+      "start (ms)": Number(start.toFixed(1)),
+      "duration (ms)": Number(duration.toFixed(1)),
+    }))
+  );
+  return list;
+}
+
+/**
+ * Time `onload` and `onunload` of a plugin class, and add the "Show load
+ * times" command, which dumps the records to the console and shows them in
+ * a notice.
+ */
+export function instrumentPlugin(pluginClass: { prototype: Plugin }): void {
+  const { onload, onunload } = pluginClass.prototype;
+  pluginClass.prototype.onload = function (this: Plugin) {
+    const result = phase("onload", () => onload.call(this));
+    this.addCommand({
+      id: "show-load-times",
+      name: "Show load times",
+      callback: () => {
+        const list = dumpRecords();
+        const lines = list.map(({ name, duration }) => `${name}: ${duration.toFixed(1)} ms`);
+        new Notice(lines.length > 0 ? lines.join("\n") : "No load times recorded yet");
+      },
+    });
+    return result;
+  };
+  pluginClass.prototype.onunload = function (this: Plugin) {
+    phase("onunload", () => onunload.call(this));
+  };
+}
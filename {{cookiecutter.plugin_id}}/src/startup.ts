@@ -0,0 +1,99 @@
+import type { Plugin } from "obsidian";
+
+export type StartupTask = () => void | Promise<void>;
+
+/**
+ * Work that runs after `onload` has returned, so Obsidian can show the vault
+ * without waiting for it. Tasks run in two stages:
+ *
+ * 1. `afterLayout` tasks, in order, once the workspace is ready
+ *    (`app.workspace.onLayoutReady`, which fires right away when the plugin
+ *    is enabled later);
+ * 2. `whenIdle` tasks, one per idle period, so rendering and input can run in
+ *    between. Mobile has no `requestIdleCallback`; a timeout stands in for it.
+ *
+ * A failing task is logged and does not stop the others. Tasks that have not
+ * started when the plugin is unloaded are skipped.
+ *
+ * @example
+ * this.ready = new Startup(this)
+ *   .afterLayout(() => this.loadSettings())
+ *   .whenIdle(() => this.buildIndex())
+ *   .start();
+ */
+export class Startup {
+  private readonly layoutTasks: StartupTask[] = [];
+  private readonly idleTasks: StartupTask[] = [];
+  private unloaded = false;
+
+  constructor(private readonly plugin: Plugin) {}
+
+  afterLayout(task: StartupTask): this {
+    this.layoutTasks.push(task);
+    return this;
+  }
+
+  whenIdle(task: StartupTask): this {
+    this.idleTasks.push(task);
+    return this;
+  }
+
+  /**
+   * Schedule the tasks and return at once.
+   * @returns a promise that resolves when every task has run
+   */
+  start(): Promise<void> {
+    this.plugin.register(() => {
+      this.unloaded = true;
+    });
+    const layoutReady = new Promise<void>((resolve) => {
+      this.plugin.app.workspace.onLayoutReady(() => resolve());
+    });
+    return layoutReady.then(async () => {
+      for (const task of this.layoutTasks) {
+        await this.run(task);
+      }
+      for (const task of this.idleTasks) {
+        await idle();
+        await this.run(task);
+      }
+    });
+  }
+
+  private async run(task: StartupTask): Promise<void> {
+    if (this.unloaded) {
+      return;
+    }
+    try {
+      await task();
+    } catch (error) {
+      console.error("Startup task failed:", error);
+    }
+  }
+}
+
+function idle(): Promise<void> {
+  return new Promise((resolve) => {
+    if (typeof requestIdleCallback === "function") {
+      requestIdleCallback(() => resolve(), { timeout: 1000 });
+    } else {
+      setTimeout(resolve, 0);
+    }
+  });
+}
+
+/**
+ * Build a value the first time it is needed rather than in `onload`,
+ * e.g. a parser used by a command.
+ */
+export function lazy<T>(init: () => T): () => T {
+  let value: T | undefined;
+  let initialized = false;
+  return () => {
+    if (!initialized) {
+      value = init();
+      initialized = true;
+    }
+    return value as T;
+  };
+}
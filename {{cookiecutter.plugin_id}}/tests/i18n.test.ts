@@ -0,0 +1,28 @@
+{%- if cookiecutter.i18n_engine == "i18next" %}{% set async, await = "async ", "await " %}{% else %}{% set async, await = "", "" %}{% endif -%}
+import { beforeAll, describe, expect, it } from "vitest";
+import { getAvailableLocales, getCurrentLocale, initI18n, setLocale, t } from "../src/i18n";
+
+describe("i18n", () => {
+  beforeAll({{ async }}() => {
+    {{ await }}initI18n("en");
+  });
+
+  it("translates with the fallback locale", () => {
+    expect(getCurrentLocale()).toBe("en");
+    expect(t("plugin_loaded")).toBe("Plugin loaded");
+  });
+
+  it("loads every registered locale", {{ async }}() => {
+    for (const locale of getAvailableLocales()) {
+      {{ await }}setLocale(locale);
+      expect(getCurrentLocale()).toBe(locale);
+      expect(t("plugin_loaded")).not.toBe("plugin_loaded");
+    }
+    {{ await }}setLocale("en");
+  });
+
+  it("ignores unknown locales", {{ async }}() => {
+    {{ await }}setLocale("xx");
+    expect(getCurrentLocale()).toBe("en");
+  });
+});
@@ -0,0 +1,54 @@
+// Stands in for the "obsidian" package, which has type definitions but no
+// code, when tests import src/ (see the alias in vitest.config.ts). Add the
+// parts of the API that your tests reach.
+
+const layoutReadyCallbacks: Array<() => void> = [];
+
+/** Messages of the notices shown so far. */
+export const notices: string[] = [];
+
+export interface Command {
+  id: string;
+  name: string;
+  callback?: () => unknown;
+}
+
+export class Notice {
+  constructor(message: string) {
+    notices.push(message);
+  }
+}
+
+export class Plugin {
+  app = {
+    workspace: {
+      onLayoutReady(callback: () => void): void {
+        layoutReadyCallbacks.push(callback);
+      },
+    },
+  };
+  commands: Command[] = [];
+  private unloadCallbacks: Array<() => void> = [];
+
+  addCommand(command: Command): Command {
+    this.commands.push(command);
+    return command;
+  }
+
+  register(callback: () => void): void {
+    this.unloadCallbacks.push(callback);
+  }
+
+  unload(): void {
+    this.unloadCallbacks.splice(0).forEach((callback) => callback());
+  }
+}
+
+export const moment = {
+  locale: (): string => "en",
+};
+
+/** Run the `onLayoutReady` callbacks, as Obsidian does once the workspace is shown. */
+export function triggerLayoutReady(): void {
+  layoutReadyCallbacks.splice(0).forEach((callback) => callback());
+}
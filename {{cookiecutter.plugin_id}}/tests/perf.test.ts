@@ -0,0 +1,56 @@
+import { beforeEach, describe, expect, it, vi } from "vitest";
+import { Plugin, type App, type PluginManifest } from "obsidian";
+import { RingBuffer, clearRecords, getRecords, instrumentPlugin, phase } from "../src/perf";
+import { notices, type Plugin as PluginStub } from "./obsidian";
+
+describe("perf", () => {
+  beforeEach(() => {
+    clearRecords();
+    notices.length = 0;
+    vi.restoreAllMocks();
+  });
+
+  it("keeps the latest entries in the ring buffer", () => {
+    const buffer = new RingBuffer<number>(3);
+    [1, 2, 3, 4, 5].forEach((item) => buffer.push(item));
+
+    expect(buffer.toArray()).toEqual([3, 4, 5]);
+  });
+
+  it("records phases, timing promises until they settle", async () => {
+    expect(phase("sync", () => 42)).toBe(42);
+    await phase("async", () => new Promise((resolve) => setTimeout(resolve, 20)));
+    expect(() =>
+      phase("failing", () => {
+        throw new Error("broken");
+      })
+    ).toThrow("broken");
+
+    const records = getRecords();
+    expect(records.map(({ name }) => name)).toEqual(["sync", "async", "failing"]);
+    expect(records[1].duration).toBeGreaterThanOrEqual(15);
+  });
+
+  it("times onload and onunload and adds the command", async () => {
+    class TestPlugin extends Plugin {
+      async onload() {
+        await phase("settings", () => Promise.resolve());
+      }
+
+      onunload() {}
+    }
+    instrumentPlugin(TestPlugin);
+    const plugin = new TestPlugin({} as App, { id: "{{ cookiecutter.plugin_id }}" } as PluginManifest);
+
+    await plugin.onload();
+    plugin.onunload();
+
+    expect(getRecords().map(({ name }) => name)).toEqual(["settings", "onload", "onunload"]);
+    const table = vi.spyOn(console, "table").mockImplementation(() => {});
+    const [command] = (plugin as unknown as PluginStub).commands;
+    expect(command.id).toBe("show-load-times");
+    command.callback?.();
+    expect(table).toHaveBeenCalledOnce();
+    expect(notices[0]).toMatch(/^settings: \d+\.\d ms\nonload: /);
+  });
+});
@@ -0,0 +1,86 @@
+import { beforeEach, describe, expect, it, vi } from "vitest";
+import type { App, PluginManifest } from "obsidian";
+import PluginMain from "../src/main";
+import { Startup, lazy } from "../src/startup";
+import { triggerLayoutReady } from "./obsidian";
+
+// Obsidian shows the vault only after every plugin's onload has returned.
+const ONLOAD_BUDGET_MS = 10;
+
+function createPlugin(): PluginMain {
+  return new PluginMain({} as App, { id: "{{ cookiecutter.plugin_id }}" } as PluginManifest);
+}
+
+describe("startup", () => {
+  beforeEach(() => {
+    triggerLayoutReady();
+    vi.restoreAllMocks();
+  });
+
+  it("returns from onload within its time budget", () => {
+    const plugin = createPlugin();
+
+    const start = performance.now();
+    plugin.onload();
+    const elapsed = performance.now() - start;
+
+    expect(elapsed).toBeLessThan(ONLOAD_BUDGET_MS);
+  });
+
+  it("runs the deferred work once the layout is ready", async () => {
+    const log = vi.spyOn(console, "log").mockImplementation(() => {});
+    const plugin = createPlugin();
+    plugin.onload();
+    expect(log).not.toHaveBeenCalled();
+
+    triggerLayoutReady();
+    await plugin.ready;
+
+    expect(log).toHaveBeenCalledWith({% if cookiecutter.enable_i18n == "yes" %}"Plugin loaded"{% else %}"{{ cookiecutter.plugin_name }} loaded"{% endif %});
+  });
+
+  it("runs idle tasks after layout tasks and keeps going after a failure", async () => {
+    vi.spyOn(console, "error").mockImplementation(() => {});
+    const order: string[] = [];
+    const done = new Startup(createPlugin())
+      .whenIdle(() => {
+        order.push("idle");
+      })
+      .afterLayout(() => {
+        throw new Error("broken");
+      })
+      .afterLayout(async () => {
+        await Promise.resolve();
+        order.push("layout");
+      })
+      .start();
+    expect(order).toEqual([]);
+
+    triggerLayoutReady();
+    await done;
+
+    expect(order).toEqual(["layout", "idle"]);
+    expect(console.error).toHaveBeenCalledOnce();
+  });
+
+  it("skips the tasks left when the plugin is unloaded", async () => {
+    const plugin = createPlugin();
+    const task = vi.fn();
+    const done = new Startup(plugin).afterLayout(task).start();
+
+    plugin.unload();
+    triggerLayoutReady();
+    await done;
+
+    expect(task).not.toHaveBeenCalled();
+  });
+
+  it("builds lazy values once, on first use", () => {
+    const init = vi.fn(() => ({ ready: true }));
+    const value = lazy(init);
+    expect(init).not.toHaveBeenCalled();
+
+    expect(value()).toBe(value());
+    expect(init).toHaveBeenCalledOnce();
+  });
+});
@@ -1,6 +1,18 @@
+import { fileURLToPath } from "node:url";
 import { defineConfig } from "vitest/config";
 
 export default defineConfig({
+  {%- if cookiecutter.enable_perf == "yes" %}
+  define: {
+    __PERF__: "true"
+  },
+  {%- endif %}
+  resolve: {
+    // The obsidian package only has type definitions; tests get a stand-in.
+    alias: {
+      obsidian: fileURLToPath(new URL("./tests/obsidian.ts", import.meta.url))
+    }
+  },
   test: {
     environment: "node"
   }